@@ -6,23 +6,31 @@ from flask_babel import Babel
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 import routes
-from auth.entitlements import load_current_user
+from core.assets import init_assets
+from core.compression import init_compression
 from core.config import Config
 from core.context import init_context_processors
 from core.extensions import init_extensions, oauth
+from core.freeze import init_freeze_cli
 from core.hooks import register_hooks
+from core.log import get_logger, init_logging
+from core.templates import init_templates
 from security.headers import init_security_headers
+from services.page_cache import init_page_cache
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    init_logging(app)
 
     init_extensions(app)
     oauth.init_app(app)
     init_security_headers(app)
     init_context_processors(app)
-    socket.setdefaulttimeout(5)
+    init_page_cache(app)
+    sock_timeout = app.config.get("SOCKET_DEFAULT_TIMEOUT") or 0
+    socket.setdefaulttimeout(sock_timeout if sock_timeout > 0 else None)
 
     app.secret_key = app.config.get("SECRET_KEY")
     assert app.secret_key and app.secret_key != "dev-secret-change-me", \
@@ -47,12 +55,10 @@ def create_app():
         app.config["SESSION_COOKIE_SAMESITE"] = "None"
         app.config["SESSION_COOKIE_SECURE"] = True
 
+    # 압축은 ProxyFix 안쪽 (ProxyFix 가 가장 바깥에서 X-Forwarded-* 를 먼저 반영)
+    init_compression(app)
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1)
 
-    @app.before_request
-    def _load_user_global():
-        load_current_user()
-
     def select_locale():
         q = request.args.get("lang")
         if q in ("ko", "en"):
@@ -70,25 +76,28 @@ def create_app():
 
     routes.register_routes(app)
     register_hooks(app)
+    init_freeze_cli(app)
+    init_assets(app)
+    init_templates(app)
 
     from flask import request
 
+    _http_log = get_logger("http")
+
     @app.after_request
     def _log_bad_requests(resp):
         if resp.status_code == 400:
-            try:
-                print("\n=== [400 DEBUG] ===")
-                print("PATH:", request.path)
-                print("METHOD:", request.method)
-                print("Content-Type:", request.content_type)
-                print("Headers:", dict(request.headers))
-                print("Args:", request.args.to_dict())
-                # JSON 파싱 실패해도 원문을 찍기 위해 raw data를 출력
-                print("Raw body:", request.get_data(as_text=True))
-                print("Resp data:", resp.get_data(as_text=True))
-                print("=== [/400 DEBUG] ===\n")
-            except Exception as e:
-                print("[400 DEBUG] logging failed:", e)
+            # 헤더/본문 원문은 남기지 않는다 (쿠키·토큰·사용자 입력 노출 방지) — 길이만
+            _http_log.warning(
+                "bad_request",
+                extra={
+                    "path": request.path,
+                    "method": request.method,
+                    "content_type": request.content_type,
+                    "content_length": request.content_length,
+                    "query_keys": sorted(request.args.keys()),
+                },
+            )
         return resp
 
     @app.get("/health")
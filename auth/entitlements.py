@@ -1,9 +1,18 @@
+import json
+import threading
+import time
 from typing import Optional
-from flask import g, request
-from domain.models import User, Subscription
+from flask import g, request, current_app, has_app_context, has_request_context
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import InvalidRequestError
+from core.extensions import get_redis
+from core.log import get_logger
+from domain.models import db, User, Subscription
 from services.extension_oauth import find_user_id_by_bearer_token
 from flask import session
-from datetime import datetime
+from datetime import timezone
+
+log = get_logger("auth")
 
 # 현재 사용자를 db에서 가져와 g(flask 전역 공간) 에 저장하는 훅
 # 실제 사용할 때 에는 load_current_user를 계속 불러오면 성능저하가 일어나니
@@ -26,15 +35,49 @@ def _get_bearer_token() -> str | None:
     return auth.split(" ", 1)[1].strip() or None
 
 
+def _load_identity(uid: str) -> Optional[User]:
+    """
+    User row + 활성 구독(next_billing_at) + 관리자 플래그를 쿼리 1회로 로드
+    - 구독은 상관 서브쿼리(최신 active/past_due 1건)로 붙여서 가져온다
+    - 결과로 요청 memo(g._entitlement)를 채워 resolve_tier() 가 구독을 다시 조회하지 않게 한다
+    """
+    sub_until = (
+        select(Subscription.next_billing_at)
+        .where(
+            Subscription.user_id == User.user_id,
+            Subscription.status.in_(("active", "past_due")),  # 재시도 중 포함
+        )
+        .order_by(Subscription.created_at.desc())
+        .limit(1)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    row = db.session.execute(select(User, sub_until).where(User.user_id == uid)).first()
+    if not row:
+        return None
+    user, next_billing_at = row
+    g._entitlement = _build_entitlement(user, next_billing_at)
+    return user
+
+
 def load_current_user():
+    """
+    요청당 1회 identity 확정 (이후 호출은 g 에 올려둔 identity 재사용)
+    - 웹 세션에 유효한 claims 가 있으면 User row 는 읽지 않는다 (get_current_user() 가 필요할 때 lazy 로드)
+    - claims 가 없거나 만료/무효화 됐으면 identity 쿼리 1회 후 claims 재발급
+    """
+    if g.get("_identity_loaded"):
+        return get_current_user()
+    g._identity_loaded = True
+
     # 1) 확장 토큰(Bearer) 우선
     raw = _get_bearer_token()
     if raw:
         uid = find_user_id_by_bearer_token(raw)
         if uid:
-            user = User.query.filter_by(user_id=uid).first()
+            user = _load_identity(uid)
             g.current_user = user
-            print("[AUTH][load_current_user] bearer uid=", uid, "found=", bool(user))
+            log.debug("bearer_auth", extra={"uid": uid, "found": bool(user)})
             return user
 
     # 2) 기존 세션 기반(웹)
@@ -45,8 +88,18 @@ def load_current_user():
         g.current_user = None
         return None
 
-    user = User.query.filter_by(user_id=uid).first()
+    claims = _fresh_claims(uid)
+    if claims is not None:
+        g._claims = claims
+        g._identity_uid = uid
+        return None
+
+    user = _load_identity(uid)
     g.current_user = user
+    if user is not None:
+        g._claims = _issue_claims(g._entitlement)
+    else:
+        session.pop(CLAIMS_KEY, None)
 
     return user
 
@@ -55,33 +108,231 @@ def load_current_user():
 # 조회 할 때 사용
 def get_current_user() -> Optional[User]:
     # 실제 로그인 연동에서 g.current_user를 세팅했다고 가정
-    return getattr(g, "current_user", None)
+    # claims 로 identity 만 확정된 요청은 여기서 처음 User row 를 로드
+    if "current_user" not in g:
+        uid = g.get("_identity_uid")
+        g.current_user = _load_identity(uid) if uid else None
+    elif g.current_user is not None and inspect(g.current_user).detached:
+        # release_db_connection() 이후 → 새 세션에 다시 붙인다 (load=False: SELECT 없음)
+        # 이후 lazy load / 수정은 새 세션(커넥션은 그때 checkout)에서 정상 동작
+        try:
+            g.current_user = db.session.merge(g.current_user, load=False)
+        except InvalidRequestError:
+            uid = g.current_user.user_id
+            g.current_user = _load_identity(uid)
+    return g.current_user
 
 
-def has_active_subscription(user: User) -> bool:
-    if not user:
-        return False
+# -------------------- 세션 claims --------------------
+# 로그인 세션의 권한 요약을 session["claims"] 에 보관 (Flask 세션 쿠키 자체가 SECRET_KEY 로 서명됨)
+#   {user_id, is_admin, sub_until, iat, exp}
+# - resolve_tier / load_current_user_role / inject_ads_flags 는 claims 만으로 판정 → GET 페이지 DB 0회
+# - exp(SESSION_CLAIMS_TTL) 가 지나거나 invalidate_entitlement() 이후(iat < 무효화 시각)면 재발급
+# - features 는 tier 에서 FEATURES_BY_TIER 로 파생 (쿠키에 목록을 싣지 않음)
+CLAIMS_KEY = "claims"
+_invalidated_at: dict = {}  # user_id -> 무효화 시각(epoch). 그 이전에 발급된 claims 는 재발급
+
+
+def _issue_claims(ent: dict) -> dict:
+    now = time.time()
+    claims = dict(ent, iat=now, exp=now + current_app.config.get("SESSION_CLAIMS_TTL", 300))
+    session[CLAIMS_KEY] = claims
+    return claims
+
+
+def _fresh_claims(uid: str):
+    claims = session.get(CLAIMS_KEY)
+    if not claims or claims.get("user_id") != uid:
+        return None
+    _ensure_listener()
+    if claims.get("exp", 0) <= time.time():
+        return None
+    if claims.get("iat", 0) < _invalidated_at.get(uid, 0):
+        return None
+    return claims
+
+
+def current_claims():
+    """이번 요청에서 유효한 세션 claims (없으면 None — bearer 요청/비로그인/구버전 세션)"""
+    return g.get("_claims")
+
+
+def _mark_invalidated(user_id: str) -> None:
+    now = time.time()
+    if len(_invalidated_at) > 10_000:
+        ttl = current_app.config.get("SESSION_CLAIMS_TTL", 300) if has_app_context() else 300
+        for k, t in list(_invalidated_at.items()):
+            if now - t > ttl:
+                _invalidated_at.pop(k, None)
+    _invalidated_at[user_id] = now
+
+
+def get_user_by_id(uid: str) -> Optional[User]:
+    """uid 가 요청 identity 와 같으면 추가 조회 없이 재사용 (다르면 DB 조회)"""
+    if not uid:
+        return None
+    user = get_current_user()
+    if user is not None and user.user_id == uid:
+        return user
+    return User.query.filter_by(user_id=uid).first()
+
 
-    now = datetime.utcnow()  # naive UTC
+# -------------------- 엔타이틀먼트 캐시 --------------------
+# resolve_tier() 는 한 요청에서 require_feature / enforce_quota / view / outputs_for_tier / 컨텍스트 프로세서가
+# 반복 호출한다. 구독 조회를 매번 하지 않도록 사용자별 엔타이틀먼트를 캐시한다.
+#   1) 요청 내   : g._entitlement (memo)
+#   2) 요청 간   : 프로세스 로컬 TTL 캐시 → Redis(ent:{user_id}) → DB
+#   3) 무효화    : invalidate_entitlement(user_id) — 구독 변경 지점에서 명시 호출
+#                 로컬/Redis 삭제 + Redis pub/sub 로 다른 워커 로컬 캐시까지 제거
+# 구독 만료는 시간에 따라 바뀌므로 tier 대신 sub_until(epoch) 을 캐시하고 읽을 때 판정한다.
+ENT_CHANNEL = "ent:invalidate"
+_local_ents: dict = {}
+_local_lock = threading.Lock()
+_listener_started = False
 
-    sub = (
-        Subscription.query
+
+def _query_sub_until(user_id: str):
+    return (
+        db.session.query(Subscription.next_billing_at)
         .filter(
-            Subscription.user_id == user.user_id,
+            Subscription.user_id == user_id,
             Subscription.status.in_(("active", "past_due")),  # 재시도 중 포함
         )
         .order_by(Subscription.created_at.desc())
-        .first()
+        .limit(1)
+        .scalar()
     )
-    if not sub:
-        return False
 
-    # next_billing_at 없는 구독은 불완전 상태로 보고 False(보수적)
-    if not sub.next_billing_at:
-        return False
 
-    # 다음 결제일이 지났으면, 현재 기간이 끝난 것으로 보고 False
-    if sub.next_billing_at <= now:
-        return False
+def _build_entitlement(user: User, next_billing_at) -> dict:
+    # next_billing_at 없는 구독은 불완전 상태로 보고 만료 취급(보수적)
+    until = None
+    if next_billing_at:
+        until = next_billing_at.replace(tzinfo=timezone.utc).timestamp()
+    return {
+        "user_id": user.user_id,
+        "is_admin": bool(getattr(user, "is_admin", False)),
+        "sub_until": until,
+    }
+
+
+def _on_invalidate(message):
+    uid = message.get("data")
+    if isinstance(uid, bytes):
+        uid = uid.decode()
+    _local_ents.pop(uid, None)
+    _mark_invalidated(uid)
+
+
+def _ensure_listener():
+    """워커당 1회: 다른 프로세스의 무효화 이벤트 구독 (fork 이후 첫 요청에서 시작)"""
+    global _listener_started
+    if _listener_started:
+        return
+    url = current_app.config.get("REDIS_URL")
+    if not url:
+        return
+    with _local_lock:
+        if _listener_started:
+            return
+        _listener_started = True
+    try:
+        import redis
+        ps = redis.Redis.from_url(url, health_check_interval=30).pubsub(ignore_subscribe_messages=True)
+        ps.subscribe(**{ENT_CHANNEL: _on_invalidate})
+        ps.run_in_thread(sleep_time=1.0, daemon=True)
+    except Exception as e:
+        log.error("ent_listener_failed", extra={"error": repr(e)})
+
+
+def _cached_entitlement(user_id: str):
+    now = time.monotonic()
+    hit = _local_ents.get(user_id)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    r = get_redis()
+    if r is None:
+        return None
+    _ensure_listener()
+    try:
+        raw = r.get(f"ent:{user_id}")
+    except Exception:
+        return None
+    if not raw:
+        return None
+    ent = json.loads(raw)
+    _local_ents[user_id] = (now + current_app.config.get("ENTITLEMENT_LOCAL_TTL", 30), ent)
+    return ent
+
 
-    return True
\ No newline at end of file
+def _store_entitlement(ent: dict) -> None:
+    cfg = current_app.config
+    _local_ents[ent["user_id"]] = (time.monotonic() + cfg.get("ENTITLEMENT_LOCAL_TTL", 30), ent)
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.set(f"ent:{ent['user_id']}", json.dumps(ent), ex=cfg.get("ENTITLEMENT_REDIS_TTL", 600))
+    except Exception:
+        pass
+
+
+def get_entitlement(user: User):
+    """사용자 엔타이틀먼트 {user_id, is_admin, sub_until} (없으면 None)"""
+    if not user:
+        return None
+    memo = g.get("_entitlement")
+    if memo is not None and memo["user_id"] == user.user_id:
+        return memo
+
+    ent = _cached_entitlement(user.user_id)
+    if ent is None:
+        ent = _build_entitlement(user, _query_sub_until(user.user_id))
+        _store_entitlement(ent)
+    g._entitlement = ent
+    return ent
+
+
+def entitlement_tier(ent) -> str:
+    if not ent:
+        return "guest"
+    if ent.get("is_admin"):
+        return "pro"
+    until = ent.get("sub_until")
+    return "pro" if until and until > time.time() else "free"
+
+
+def invalidate_entitlement(user_id: str) -> None:
+    """구독/결제/탈퇴 등으로 권한이 바뀐 직후(commit 후) 호출"""
+    if not user_id:
+        return
+    _local_ents.pop(user_id, None)
+    _mark_invalidated(user_id)
+    if has_app_context():
+        memo = g.get("_entitlement")
+        if memo is not None and memo.get("user_id") == user_id:
+            g.pop("_entitlement", None)
+        claims = g.get("_claims")
+        if claims is not None and claims.get("user_id") == user_id:
+            g.pop("_claims", None)
+    if has_request_context() and (session.get(CLAIMS_KEY) or {}).get("user_id") == user_id:
+        session.pop(CLAIMS_KEY, None)
+    r = get_redis() if has_app_context() else None
+    if r is None:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(f"ent:{user_id}")
+        pipe.publish(ENT_CHANNEL, user_id)
+        pipe.execute()
+    except Exception as e:
+        log.warning("ent_invalidate_failed", extra={"uid": user_id, "error": repr(e)})
+
+
+def has_active_subscription(user: User) -> bool:
+    if not user:
+        return False
+    until = get_entitlement(user).get("sub_until")
+    # 다음 결제일이 지났으면, 현재 기간이 끝난 것으로 보고 False
+    return bool(until and until > time.time())
@@ -1,9 +1,14 @@
+from datetime import datetime, timezone
 from functools import wraps
 
 from flask import request, jsonify, make_response
-from sqlalchemy import and_
+from sqlalchemy import and_, case, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from auth.entitlements import get_current_user
+from auth.quota_backend import EXPIRE_GRACE, quota_key, quota_redis, redis_release, redis_reserve
+from core.extensions import release_db_connection
+from core.log import get_logger
 from domain.models import db, Usage, GuestUsage as GuestUsage
 from auth.guards import resolve_tier
 from cookie.cookie import ensure_guest_cookie, set_guest_cookie
@@ -11,6 +16,161 @@ from domain.policies import LIMITS
 from domain.schema import USAGE_SCOPES
 from utils.time_utils import _utcnow, _day_window, _month_window
 
+log = get_logger("quota")
+
+# 사용량 게이트(단일 엔진) — /api/polish, /api/summarize, /api/rewrite/* 공용
+# reserve → (view) → confirm/release 3단계
+#   reserve : 조건부 UPSERT 1문장(또는 Redis Lua 1회)으로 한도 확인 + 1 선점 후 즉시 commit
+#   confirm : 선점이 곧 확정이라 할 일 없음
+#   release : view 에서 예외가 나면 보상 차감 (성공시에만 +1 정책 유지)
+# LLM 호출(view) 동안에는 트랜잭션/row lock/풀 커넥션을 하나도 잡고 있지 않는다.
+
+
+def _seed_pg(model, filters) -> int:
+    """
+    Redis 키 seed 용 현재 count. 동시에 pg_delta 를 0 으로 — fallback 증감분이 이제 Redis 값에 포함되므로
+    (flush 때 count = redis + pg_delta 로 두 번 더해지지 않게)
+    """
+    table = model.__table__
+    try:
+        counts = db.session.execute(
+            update(table).where(and_(*filters)).values(pg_delta=0).returning(table.c.count)
+        ).scalars().all()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return sum(counts)
+
+
+def _reserve_pg(model, constraint, values, limit, fallback=False):
+    """
+    Postgres reserve: 조건부 UPSERT 한 문장으로 check-and-increment 후 즉시 commit
+
+        INSERT ... VALUES (..., count=1)
+        ON CONFLICT (<unique>) DO UPDATE SET count = count + 1 WHERE count < :limit
+        RETURNING count
+
+    - row 가 없으면 1 로 생성, 있으면 한도 미만일 때만 +1 (RETURNING 이 비면 한도 초과)
+    - SELECT/FOR UPDATE/IntegrityError 재시도 없음 — 동시 요청은 unique index 에서 직렬화된다
+    - 요청 앞단(load_user/resolve_tier)에서 열린 트랜잭션도 여기서 끝내고 커넥션을 반납한다
+    - fallback=True (Redis 모드인데 Redis 장애): pg_delta 도 +1 — Redis 가 가진 count 에는 없는 증가분
+    반환: (allowed, count)
+    """
+    table = model.__table__
+    inc = 1 if fallback else 0
+    release_db_connection()
+    try:
+        stmt = pg_insert(table).values(**values, count=1, pg_delta=inc)
+        stmt = stmt.on_conflict_do_update(
+            constraint=constraint,
+            set_={"count": table.c.count + 1, "pg_delta": table.c.pg_delta + inc},
+            where=(table.c.count < limit),
+        ).returning(table.c.count)
+        count = db.session.execute(stmt).scalar()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        release_db_connection()
+
+    if count is None:
+        return False, limit
+    return True, int(count)
+
+
+def _release_pg(model, filters, fallback=False):
+    """보상 차감(view 실패 시): 짧은 UPDATE 1회 (0 미만으로 내려가지 않음)"""
+    values = {model.count: model.count - 1}
+    if fallback:
+        values[model.pg_delta] = case((model.pg_delta > 0, model.pg_delta - 1), else_=0)
+    try:
+        (
+            db.session.query(model)
+            .filter(and_(*filters), model.count > 0)
+            .update(values, synchronize_session=False)
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        log.error("quota_release_error", extra={"error": repr(e)})
+
+
+def _reserve_guest(scope, guest_key, day_start, day_end, limit):
+    """반환: (allowed, release_fn)"""
+    filters = [
+        GuestUsage.guest_key == guest_key,
+        GuestUsage.scope == scope,
+        GuestUsage.window_start == day_start,
+    ]
+    r = quota_redis()
+    if r is not None:
+        key = quota_key("g", "guest", scope, day_start, guest_key)
+        reserved = redis_reserve(
+            r, key, limit,
+            expire_at=day_end + EXPIRE_GRACE,
+            ip=request.remote_addr,
+            seed=lambda: _seed_pg(GuestUsage, filters),
+        )
+        if reserved is not None:
+            release_db_connection()
+            return reserved[0], (lambda: redis_release(r, key))
+
+    fallback = r is not None
+    allowed, _count = _reserve_pg(
+        GuestUsage,
+        "uq_guest_key_scope_window",
+        {"guest_key": guest_key, "ip": request.remote_addr, "scope": scope, "window_start": day_start},
+        limit,
+        fallback=fallback,
+    )
+    return allowed, (lambda: _release_pg(GuestUsage, filters, fallback))
+
+
+def _reserve_user(scope, user_id, tier_key, month_start, month_end, limit):
+    """반환: (allowed, release_fn)"""
+    filters = [
+        Usage.user_id == user_id,
+        Usage.tier == tier_key,
+        Usage.scope == scope,
+        Usage.window_start == month_start,
+    ]
+    r = quota_redis()
+    if r is not None:
+        key = quota_key("u", tier_key, scope, month_start, user_id)
+        reserved = redis_reserve(
+            r, key, limit,
+            expire_at=datetime.combine(month_end, datetime.min.time(), tzinfo=timezone.utc) + EXPIRE_GRACE,
+            seed=lambda: _seed_pg(Usage, filters),
+        )
+        if reserved is not None:
+            release_db_connection()
+            return reserved[0], (lambda: redis_release(r, key))
+
+    fallback = r is not None
+    allowed, _count = _reserve_pg(
+        Usage,
+        "uq_usage_user_tier_scope_window",
+        {"user_id": user_id, "tier": tier_key, "scope": scope, "window_start": month_start},
+        limit,
+        fallback=fallback,
+    )
+    return allowed, (lambda: _release_pg(Usage, filters, fallback))
+
+
+def _call_reserved(release, view, args, kwargs):
+    """
+    선점(+1) 후 view 실행 — 예외 시 release (confirm 은 선점 시 이미 반영)
+    view 는 커넥션 반납(release_db_connection) 이후 실행되므로 앞서 로드된 ORM 객체는 detach 상태
+    → 사용자는 get_current_user() 로 다시 받아 쓴다
+    """
+    try:
+        return view(*args, **kwargs)
+    except Exception:
+        release()
+        raise
+
 
 def enforce_quota(scope: str, methods=("POST",)):
     """
@@ -33,96 +193,15 @@ def enforce_quota(scope: str, methods=("POST",)):
 
             if tier == "guest":
                 guest_key, need_set = ensure_guest_cookie()
-                day_start, _ = _day_window(now)
-
-                from psycopg2._psycopg import IntegrityError
-                try:
-                    with db.session.begin_nested():
-                        row = (
-                            GuestUsage.query.filter(
-                                and_(
-                                    GuestUsage.guest_key == guest_key,
-                                    GuestUsage.scope == scope,
-                                    GuestUsage.window_start == day_start,
-                                )
-                            )
-                            .with_for_update(nowait=False)
-                            .first()
-                        )
-
-                        # 아직 row 없으면 새로 만들기 (여기서 race가 날 수 있음)
-                        if not row:
-                            row = GuestUsage(
-                                guest_key=guest_key,
-                                ip=request.remote_addr,
-                                scope=scope,
-                                window_start=day_start,
-                                count=0,
-                            )
-                            db.session.add(row)
-                            db.session.flush()
-
-                        limit = LIMITS["guest"]["daily"]
-                        if row.count >= limit:
-                            resp = jsonify(
-                                {
-                                    "error": "daily_limit_reached",
-                                    "limit": limit,
-                                    "scope": scope,
-                                }
-                            )
-                            resp.status_code = 429
-                            if need_set:
-                                resp = set_guest_cookie(make_response(resp), guest_key)
-                            return resp
-
-                except IntegrityError:
-                    # 여기로 온다는 건, 방금 INSERT 경쟁에서 졌다는 뜻
-                    db.session.rollback()
-                    # 이미 다른 트랜잭션이 row를 만든 상태이므로 그냥 다시 가져오기만
-                    with db.session.begin_nested():
-                        row = (
-                            GuestUsage.query.filter(
-                                and_(
-                                    GuestUsage.guest_key == guest_key,
-                                    GuestUsage.scope == scope,
-                                    GuestUsage.window_start == day_start,
-                                )
-                            )
-                            .with_for_update(nowait=False)
-                            .one()
-                        )
-                        limit = LIMITS["guest"]["daily"]
-                        if row.count >= limit:
-                            resp = jsonify(
-                                {
-                                    "error": "daily_limit_reached",
-                                    "limit": limit,
-                                    "scope": scope,
-                                }
-                            )
-                            resp.status_code = 429
-                            if need_set:
-                                resp = set_guest_cookie(make_response(resp), guest_key)
-                            return resp
-                # 여기까지가 "limit 확인" 단계
-
-                resp = view(*args, **kwargs)
-
-                with db.session.begin_nested():
-                    row = (
-                        GuestUsage.query.filter(
-                            and_(
-                                GuestUsage.guest_key == guest_key,
-                                GuestUsage.scope == scope,
-                                GuestUsage.window_start == day_start,
-                            )
-                        )
-                        .with_for_update(nowait=False)
-                        .one()
-                    )
-                    row.count += 1
-                db.session.commit()
+                day_start, day_end = _day_window(now)
+                limit = LIMITS["guest"]["daily"]
+
+                allowed, release = _reserve_guest(scope, guest_key, day_start, day_end, limit)
+                if not allowed:
+                    resp = jsonify({"error": "daily_limit_reached", "limit": limit, "scope": scope})
+                    resp.status_code = 429
+                else:
+                    resp = _call_reserved(release, view, args, kwargs)
 
                 if need_set:
                     if not hasattr(resp, "set_cookie"):
@@ -131,60 +210,19 @@ def enforce_quota(scope: str, methods=("POST",)):
                 return resp
 
             # ===== free / pro (월간 집계 — Date window) =====
-            month_start, _ = _month_window(now)
+            month_start, month_end = _month_window(now)
             user = get_current_user()
             if not user:
                 return jsonify({"error": "auth_required"}), 401
 
             tier_key = "pro" if tier == "pro" else "free"
+            limit = LIMITS[tier]["monthly"]
 
-            with db.session.begin_nested():
-                row = (
-                    Usage.query.filter(
-                        and_(
-                            Usage.user_id == user.user_id,
-                            Usage.tier == tier_key,
-                            Usage.scope == scope,  # scope 포함
-                            Usage.window_start == month_start,
-                        )
-                    )
-                    .with_for_update(nowait=False)
-                    .first()
-                )
-                if not row:
-                    row = Usage(
-                        user_id=user.user_id,
-                        tier=tier_key,
-                        scope=scope,  # 신규 row에 scope 저장
-                        window_start=month_start,
-                        count=0,
-                    )
-                    db.session.add(row)
-                    db.session.flush()
-
-                limit = LIMITS[tier]["monthly"]
-                if row.count >= limit:
-                    return jsonify({"error": "monthly_limit_reached", "limit": limit, "scope": scope}), 429
-
-            resp = view(*args, **kwargs)
-
-            with db.session.begin_nested():
-                row = (
-                    Usage.query.filter(
-                        and_(
-                            Usage.user_id == user.user_id,
-                            Usage.tier == tier_key,
-                            Usage.scope == scope,  # scope 포함
-                            Usage.window_start == month_start,
-                        )
-                    )
-                    .with_for_update(nowait=False)
-                    .one()
-                )
-                row.count += 1
-            db.session.commit()
-            return resp
+            allowed, release = _reserve_user(scope, user.user_id, tier_key, month_start, month_end, limit)
+            if not allowed:
+                return jsonify({"error": "monthly_limit_reached", "limit": limit, "scope": scope}), 429
+            return _call_reserved(release, view, args, kwargs)
 
         return wrapper
 
-    return decorator
\ No newline at end of file
+    return decorator
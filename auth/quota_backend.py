@@ -0,0 +1,225 @@
+"""
+quota_backend.py — 사용량 카운터 Redis 저장소
+
+- check-and-increment 를 Lua 스크립트 1회 호출로 원자 처리 (row lock / IntegrityError 재시도 없음)
+- 키: quota:{kind}:{tier}:{scope}:{window}:{ident}
+    kind=g(게스트, ident=guest_key, 일간) / kind=u(로그인, ident=user_id, 월간)
+- 키가 없으면 Postgres 의 현재 count 로 seed 후 진행 (Redis 재시작/도입 시점에도 한도 유지)
+- 키는 window 종료 + 유예기간 뒤 자동 만료
+- 변경된 키는 dirty set 에 모아두고 flush_quota_counters() 가 usage / guest_usage 로 write-behind
+    Redis 가 가진 키의 count 는 Redis 값이 기준 (보상 차감도 반영) + Redis 장애 중 Postgres 로 직접 들어간 증감분(pg_delta)
+    flush 는 pg_delta 를 Redis count 에 되돌려 넣고 0 으로 만든다 → 복구 후 한도 판정에도 장애 중 사용량이 포함됨
+    (키를 다시 seed 할 때도 count 에 포함되면서 0 으로 돌아간다, auth/quota._seed_pg)
+- QUOTA_BACKEND != "redis" 이거나 Redis 장애 시 None 을 반환 → 호출부(auth/quota)는 Postgres 경로로 fallback
+"""
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.extensions import get_redis
+from core.log import get_logger
+from domain.models import db, Usage, GuestUsage
+
+log = get_logger("quota")
+
+DIRTY_SET = "quota:dirty"
+EXPIRE_GRACE = timedelta(days=3)
+
+# KEYS[1]=counter hash, KEYS[2]=dirty set / ARGV[1]=limit
+# return {-1, 0}: 키 없음(seed 필요) / {0, count}: 한도 초과 / {1, count}: 증가 성공
+_RESERVE_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return {-1, 0}
+end
+local c = tonumber(redis.call('HGET', KEYS[1], 'count') or '0')
+if c >= tonumber(ARGV[1]) then
+  return {0, c}
+end
+c = redis.call('HINCRBY', KEYS[1], 'count', 1)
+redis.call('SADD', KEYS[2], KEYS[1])
+return {1, c}
+"""
+
+# view 실패 시 보상 차감
+_RELEASE_LUA = """
+local c = tonumber(redis.call('HGET', KEYS[1], 'count') or '0')
+if c > 0 then
+  c = redis.call('HINCRBY', KEYS[1], 'count', -1)
+  redis.call('SADD', KEYS[2], KEYS[1])
+end
+return c
+"""
+
+# flush: fallback 기간 증가분(pg_delta)을 Redis count 에 합산. 그 사이 만료된 키는 건드리지 않음 (다음 seed 가 DB 값 사용)
+_FOLD_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  return redis.call('HINCRBY', KEYS[1], 'count', ARGV[1])
+end
+return -1
+"""
+
+_scripts = {}
+
+
+def _script(r, name, src):
+    s = _scripts.get(name)
+    if s is None:
+        s = _scripts[name] = r.register_script(src)
+    return s
+
+
+def quota_redis():
+    """QUOTA_BACKEND=redis 이고 REDIS_URL 이 있으면 redis 클라이언트, 아니면 None"""
+    if (current_app.config.get("QUOTA_BACKEND") or "postgres") != "redis":
+        return None
+    return get_redis()
+
+
+def quota_key(kind: str, tier: str, scope: str, window_start, ident: str) -> str:
+    return f"quota:{kind}:{tier}:{scope}:{window_start.strftime('%Y%m%d')}:{ident}"
+
+
+def _parse_key(key: str):
+    # ident(guest_key/user_id)는 마지막 필드 — ':' 가 섞여도 안전하도록 maxsplit
+    _, kind, tier, scope, window, ident = key.split(":", 5)
+    day = datetime.strptime(window, "%Y%m%d")
+    return kind, tier, scope, day, ident
+
+
+def redis_reserve(r, key: str, limit: int, *, expire_at: datetime, seed, ip=None):
+    """
+    원자적 check-and-increment.
+    반환: (allowed, count) / Redis 오류 시 None (호출부가 Postgres 로 fallback)
+    - seed: 키가 없을 때 Postgres 현재 count 를 돌려주는 callable
+    """
+    import redis as _redis_lib
+
+    try:
+        reserve = _script(r, "reserve", _RESERVE_LUA)
+        status, count = reserve(keys=[key, DIRTY_SET], args=[int(limit)])
+        if int(status) == -1:
+            pipe = r.pipeline(transaction=True)
+            pipe.hsetnx(key, "count", int(seed() or 0))
+            if ip:
+                pipe.hsetnx(key, "ip", ip)
+            pipe.expireat(key, int(expire_at.timestamp()))
+            pipe.execute()
+            status, count = reserve(keys=[key, DIRTY_SET], args=[int(limit)])
+        return int(status) == 1, int(count)
+    except _redis_lib.RedisError as e:
+        log.warning("quota_redis_reserve_failed", extra={"error": repr(e), "fallback": "postgres"})
+        return None
+
+
+def redis_release(r, key: str) -> None:
+    import redis as _redis_lib
+
+    try:
+        _script(r, "release", _RELEASE_LUA)(keys=[key, DIRTY_SET])
+    except _redis_lib.RedisError as e:
+        log.warning("quota_redis_release_failed", extra={"error": repr(e)})
+
+
+def redis_used(r, key: str):
+    """현재 count (키 없으면 None → 호출부가 Postgres 조회)"""
+    import redis as _redis_lib
+
+    try:
+        v = r.hget(key, "count")
+    except _redis_lib.RedisError:
+        return None
+    return int(v) if v is not None else None
+
+
+def flush_quota_counters(batch: int = 500) -> dict:
+    """
+    dirty 키의 count 를 usage / guest_usage 로 write-behind (리포팅/결제 분쟁 대비).
+    - count = redis + pg_delta — Redis 값이 기준(release 로 줄어든 것도 반영),
+      fallback 기간에 Postgres 로 직접 반영된 증감분만 따로 더한다
+    - 같은 트랜잭션에서 pg_delta = 0 으로 만들고, 그 증가분은 Redis count 에 HINCRBY 로 옮긴다 (commit 전)
+      commit 이 실패하면 다음 주기에 한 번 더 더해질 수 있다 (한도 쪽으로 보수적인 방향)
+    - DB/Redis 실패 시 키를 dirty set 으로 되돌린다 (다음 주기 재시도)
+    """
+    r = get_redis()
+    if r is None:
+        return {"ok": False, "error": "redis_not_configured"}
+
+    keys = [k.decode() if isinstance(k, bytes) else k for k in (r.spop(DIRTY_SET, batch) or [])]
+    if not keys:
+        return {"ok": True, "flushed": 0}
+
+    pipe = r.pipeline(transaction=False)
+    for k in keys:
+        pipe.hgetall(k)
+    snapshots = pipe.execute()
+
+    guest_rows, user_rows = [], []
+    sent = {}  # redis key -> flush 에 쓴 Redis count
+    for k, h in zip(keys, snapshots):
+        if not h:
+            continue  # 이미 만료
+        h = {(a.decode() if isinstance(a, bytes) else a): (b.decode() if isinstance(b, bytes) else b)
+             for a, b in h.items()}
+        kind, tier, scope, day, ident = _parse_key(k)
+        count = int(h.get("count") or 0)
+        sent[k] = count
+        if kind == "g":
+            guest_rows.append({
+                "guest_key": ident,
+                "ip": h.get("ip"),
+                "scope": scope,
+                "window_start": day.replace(tzinfo=timezone.utc),
+                "count": count,
+            })
+        else:
+            user_rows.append({
+                "user_id": ident,
+                "tier": tier,
+                "scope": scope,
+                "window_start": day.date(),
+                "count": count,
+            })
+
+    try:
+        folded = []  # (redis key, pg_delta)
+        if guest_rows:
+            t = GuestUsage.__table__
+            stmt = pg_insert(t).values(guest_rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["guest_key", "scope", "window_start"],  # uq_guest_key_scope_window
+                set_={"count": stmt.excluded.count + t.c.pg_delta, "pg_delta": 0},
+            ).returning(t.c.guest_key, t.c.scope, t.c.window_start, t.c.count)
+            for ident, scope, ws, count in db.session.execute(stmt):
+                # timestamptz 는 세션 timezone 으로 돌아오므로 UTC 로 맞춘 뒤 키의 날짜를 만든다
+                k = quota_key("g", "guest", scope, ws.astimezone(timezone.utc) if ws.tzinfo else ws, ident)
+                folded.append((k, count - sent.get(k, count)))
+        if user_rows:
+            t = Usage.__table__
+            stmt = pg_insert(t).values(user_rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "tier", "scope", "window_start"],  # uq_usage_user_tier_scope_window
+                set_={"count": stmt.excluded.count + t.c.pg_delta, "pg_delta": 0},
+            ).returning(t.c.user_id, t.c.tier, t.c.scope, t.c.window_start, t.c.count)
+            for ident, tier, scope, ws, count in db.session.execute(stmt):
+                k = quota_key("u", tier, scope, ws, ident)
+                folded.append((k, count - sent.get(k, count)))
+
+        folded = [(k, d) for k, d in folded if d]
+        if folded:
+            fold = _script(r, "fold", _FOLD_LUA)
+            pipe = r.pipeline(transaction=False)
+            for k, d in folded:
+                fold(keys=[k], args=[d], client=pipe)
+            pipe.execute()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        try:
+            r.sadd(DIRTY_SET, *keys)
+        except Exception:
+            pass
+        log.error("quota_flush_error", extra={"error": repr(e), "requeued": len(keys)})
+        return {"ok": False, "error": "db_error", "requeued": len(keys)}
+
+    return {"ok": True, "flushed": len(guest_rows) + len(user_rows), "folded": len(folded)}
@@ -0,0 +1,156 @@
+"""
+assets.py — 정적 파일 fingerprint 빌드 + manifest 기반 url_for('static')
+
+빌드: `flask assets-build`  (배포 시 1회)
+- static/ 아래 원본(js/css 등)을 내용 해시가 붙은 이름으로 static/dist/ 에 복사
+    js/mainpage.js → dist/js/mainpage.3f9a1c2b.js  (+ .gz, brotli 설치 시 .br)
+- rjsmin / rcssmin 이 설치돼 있으면 minify (선택 의존성, 없으면 원본 그대로)
+- static/dist/manifest.json: {"js/mainpage.js": "dist/js/mainpage.3f9a1c2b.js", ...}
+
+런타임 (init_assets):
+- manifest 가 있으면 url_for('static', filename=원본) 이 fingerprint 경로로 바뀐다 (템플릿 수정 없음)
+- dist/ 응답은 내용이 바뀌면 이름이 바뀌므로 Cache-Control: public, max-age=31536000, immutable
+- Accept-Encoding 이 허용하는(q=0 은 거부, core.compression 과 같은 협상) .br/.gz 가 있으면 사전 압축본을 그대로 전송
+- manifest 가 없으면(개발 환경) 아무것도 바꾸지 않는다
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+import click
+from flask import request, send_from_directory
+
+from core.compression import accepted_encodings
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE = "public, max-age=31536000, immutable"
+_TEXT_EXTS = {".js", ".css", ".svg", ".json", ".txt", ".map"}
+
+_manifest = {}
+
+
+def _minify(rel_path: str, data: bytes) -> bytes:
+    ext = os.path.splitext(rel_path)[1]
+    try:
+        if ext == ".js":
+            import rjsmin
+            return rjsmin.jsmin(data.decode("utf-8")).encode("utf-8")
+        if ext == ".css":
+            import rcssmin
+            return rcssmin.cssmin(data.decode("utf-8")).encode("utf-8")
+    except ImportError:
+        pass
+    return data
+
+
+def _iter_sources(static_dir: str):
+    for base, dirs, files in os.walk(static_dir):
+        rel_base = os.path.relpath(base, static_dir)
+        if rel_base == DIST_DIR or rel_base.startswith(DIST_DIR + os.sep):
+            dirs[:] = []
+            continue
+        for name in sorted(files):
+            if name.startswith("."):
+                continue
+            rel = os.path.normpath(os.path.join(rel_base, name)).replace(os.sep, "/")
+            yield rel, os.path.join(base, name)
+
+
+def build_assets(static_dir: str, *, minify: bool = True) -> dict:
+    """static/ → static/dist/ fingerprint 빌드. manifest(dict) 반환"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    dist = os.path.join(static_dir, DIST_DIR)
+    tmp = dist + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    manifest = {}
+    for rel, src in _iter_sources(static_dir):
+        with open(src, "rb") as f:
+            data = f.read()
+        if minify:
+            data = _minify(rel, data)
+
+        digest = hashlib.sha256(data).hexdigest()[:8]
+        stem, ext = os.path.splitext(rel)
+        out_rel = f"{stem}.{digest}{ext}"
+        out_path = os.path.join(tmp, out_rel)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, "wb") as f:
+            f.write(data)
+
+        if ext in _TEXT_EXTS:
+            with open(out_path + ".gz", "wb") as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(out_path + ".br", "wb") as f:
+                    f.write(brotli.compress(data, quality=11))
+
+        manifest[rel] = f"{DIST_DIR}/{out_rel}"
+
+    with open(os.path.join(tmp, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    # 통째로 교체 (빌드 중간 상태를 서빙하지 않도록)
+    shutil.rmtree(dist, ignore_errors=True)
+    os.replace(tmp, dist)
+    return manifest
+
+
+def load_manifest(static_dir: str) -> dict:
+    path = os.path.join(static_dir, DIST_DIR, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def init_assets(app):
+    global _manifest
+    _manifest = load_manifest(app.static_folder)
+
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint == "static" and _manifest:
+            hashed = _manifest.get(values.get("filename"))
+            if hashed:
+                values["filename"] = hashed
+
+    static_view = app.view_functions["static"]
+
+    def static_with_precompressed(filename):
+        if not filename.startswith(DIST_DIR + "/"):
+            return static_view(filename=filename)
+
+        accept = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        for enc, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if enc in accept and os.path.isfile(os.path.join(app.static_folder, filename + suffix)):
+                resp = send_from_directory(app.static_folder, filename + suffix, mimetype=_mimetype(filename))
+                resp.headers["Content-Encoding"] = enc
+                break
+        else:
+            resp = static_view(filename=filename)
+        resp.vary.add("Accept-Encoding")
+        resp.headers["Cache-Control"] = IMMUTABLE
+        return resp
+
+    app.view_functions["static"] = static_with_precompressed
+
+    @app.cli.command("assets-build")
+    @click.option("--no-minify", is_flag=True, help="minify 생략")
+    def assets_build_command(no_minify):
+        """static/ 을 fingerprint 이름 + .gz/.br 로 static/dist/ 에 빌드하고 manifest 생성"""
+        manifest = build_assets(app.static_folder, minify=not no_minify)
+        click.echo(f"built {len(manifest)} assets -> {os.path.join(app.static_folder, DIST_DIR)}")
+
+
+def _mimetype(filename: str):
+    import mimetypes
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
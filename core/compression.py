@@ -0,0 +1,230 @@
+"""
+compression.py — 응답 압축 WSGI 미들웨어 (gzip / brotli)
+
+- Accept-Encoding 협상: br(brotli 설치 시) > gzip, q=0 은 거부로 취급
+- 대상: COMPRESS_MIMETYPES (html/json/css/js/xml/svg/text) 이고 COMPRESS_MIN_SIZE 이상인 응답
+    제외: HEAD, 1xx/204/206/304, 이미 Content-Encoding 이 있는 응답(사전 압축 static/sitemap),
+          text/event-stream(SSE), Cache-Control: no-transform
+- Content-Length 가 있는 응답은 한 번에 압축하고 길이를 다시 계산
+  길이가 없는 스트리밍(generator) 응답은 chunk 마다 압축 + flush 해서 그대로 흘려보낸다
+- ETag: 압축본은 다른 표현이므로 "<etag>-gzip" / "<etag>-br" 로 바꿔 내보내고,
+  요청의 If-None-Match 에서는 이 접미사를 떼고 앱에 넘긴다 → 앱의 make_conditional(304) 가 그대로 동작
+- 보안 헤더(security/headers)는 앱 안에서 이미 붙은 상태라 건드리지 않는다
+- 감싸는 순서(app.py): ProxyFix(CompressionMiddleware(Flask)) — ProxyFix 가 가장 바깥
+"""
+import re
+import zlib
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/xml",
+    "application/json",
+    "application/javascript",
+    "text/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+_SKIP_STATUS = {204, 206, 304}
+_ETAG_SUFFIX_RE = re.compile(r'-(?:gzip|br)(")')
+
+
+def accepted_encodings(header: str) -> set:
+    """Accept-Encoding → 허용된 코딩 이름 집합 (소문자, q=0 은 제외). 사전 압축본을 고르는 곳도 이 함수로 협상"""
+    out = set()
+    for part in (header or "").lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            out.add(token.strip())
+    return out
+
+
+class _Encoder:
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=level)
+        else:
+            self._c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """스트리밍용: 압축 + flush (클라이언트가 chunk 단위로 바로 풀 수 있게)"""
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def whole(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.finish()
+        return self._c.compress(data) + self._c.flush()
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._c.finish()
+        return self._c.flush()
+
+
+class CompressionMiddleware:
+    def __init__(self, app, *, min_size=1024, gzip_level=6, brotli_quality=5, mimetypes=DEFAULT_MIMETYPES):
+        self.app = app
+        self.min_size = int(min_size)
+        self.gzip_level = int(gzip_level)
+        self.brotli_quality = int(brotli_quality)
+        self.mimetypes = frozenset(mimetypes)
+
+    def _negotiate(self, environ):
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            return None
+        accepted = accepted_encodings(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _eligible(self, status: str, headers: list) -> bool:
+        code = int(status.split(" ", 1)[0])
+        if code < 200 or code in _SKIP_STATUS:
+            return False
+        h = {k.lower(): v for k, v in headers}
+        if "content-encoding" in h or "content-range" in h:
+            return False
+        if "no-transform" in h.get("cache-control", "").lower():
+            return False
+        mimetype = h.get("content-type", "").split(";", 1)[0].strip().lower()
+        if mimetype not in self.mimetypes:
+            return False
+        length = h.get("content-length")
+        if length is not None and length.isdigit() and int(length) < self.min_size:
+            return False
+        return True
+
+    def __call__(self, environ, start_response):
+        encoding = self._negotiate(environ)
+        if encoding is None:
+            # 압축하지 않아도 압축 대상 응답이면 Vary 를 붙여 공유 캐시가 표현을 섞지 않게 한다
+            def _start_vary(status, headers, exc_info=None):
+                if self._eligible(status, headers):
+                    headers = _add_vary(headers)
+                return start_response(status, headers, exc_info)
+
+            return self.app(environ, _start_vary)
+
+        inm = environ.get("HTTP_IF_NONE_MATCH")
+        if inm:
+            environ["HTTP_IF_NONE_MATCH"] = _ETAG_SUFFIX_RE.sub(r"\1", inm)
+
+        state = {}
+
+        def _start(status, headers, exc_info=None):
+            state["status"], state["headers"], state["exc_info"] = status, headers, exc_info
+            # 실제 start_response 는 압축 여부를 정한 뒤 호출 (write() 콜백 방식은 Flask 가 쓰지 않음)
+            return lambda data: None
+
+        app_iter = self.app(environ, _start)
+        status, headers = state["status"], state["headers"]
+        code = int(status.split(" ", 1)[0])
+
+        if code == 304:
+            # 클라이언트가 압축본의 ETag 로 물어봤으면 같은 표현의 ETag 로 돌려준다
+            if inm and f'-{encoding}"' in inm:
+                headers = _tag_headers(headers, encoding)
+            start_response(status, _add_vary(headers), state["exc_info"])
+            return app_iter
+
+        if not self._eligible(status, headers):
+            if any(k.lower() == "content-type" for k, _ in headers):
+                headers = _add_vary(headers)
+            start_response(status, headers, state["exc_info"])
+            return app_iter
+
+        level = self.brotli_quality if encoding == "br" else self.gzip_level
+        has_length = any(k.lower() == "content-length" for k, _ in headers)
+        new_headers = [
+            (k, v) for k, v in _tag_headers(headers, encoding)
+            if k.lower() != "content-length"
+        ]
+        new_headers.append(("Content-Encoding", encoding))
+
+        if has_length:
+            try:
+                body = b"".join(app_iter)
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+            if len(body) < self.min_size:
+                start_response(status, _add_vary(headers), state["exc_info"])
+                return [body]
+            data = _Encoder(encoding, level).whole(body)
+            new_headers.append(("Content-Length", str(len(data))))
+            start_response(status, new_headers, state["exc_info"])
+            return [data]
+
+        start_response(status, new_headers, state["exc_info"])
+        return _stream(app_iter, _Encoder(encoding, level))
+
+
+def _stream(app_iter, encoder):
+    try:
+        for chunk in app_iter:
+            if chunk:
+                out = encoder.chunk(chunk)
+                if out:
+                    yield out
+        tail = encoder.finish()
+        if tail:
+            yield tail
+    finally:
+        if hasattr(app_iter, "close"):
+            app_iter.close()
+
+
+def _add_vary(headers: list) -> list:
+    out = []
+    found = False
+    for k, v in headers:
+        if k.lower() == "vary":
+            found = True
+            if "accept-encoding" not in v.lower():
+                v = f"{v}, Accept-Encoding"
+        out.append((k, v))
+    if not found:
+        out.append(("Vary", "Accept-Encoding"))
+    return out
+
+
+def _tag_headers(headers: list, encoding: str) -> list:
+    out = []
+    for k, v in _add_vary(headers):
+        if k.lower() == "etag" and v.endswith('"'):
+            v = f'{v[:-1]}-{encoding}"'
+        out.append((k, v))
+    return out
+
+
+def init_compression(app):
+    cfg = app.config
+    if not cfg.get("COMPRESS_ENABLED", True):
+        return
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=cfg.get("COMPRESS_MIN_SIZE", 1024),
+        gzip_level=cfg.get("COMPRESS_GZIP_LEVEL", 6),
+        brotli_quality=cfg.get("COMPRESS_BROTLI_QUALITY", 5),
+        mimetypes=cfg.get("COMPRESS_MIMETYPES") or DEFAULT_MIMETYPES,
+    )
@@ -46,6 +46,13 @@ class Config:
     VERIFY_SALT = "email-verify-v1"
     VERIFY_TTL_SECONDS = 60 * 30
 
+    # 확장 프로그램 access token (서명 토큰)
+    EXT_TOKEN_SALT = "ext-access-v1"
+    EXT_TOKEN_DAYS = int(os.getenv("EXT_TOKEN_DAYS", "90"))
+    EXT_REVOCATION_REFRESH = int(os.getenv("EXT_REVOCATION_REFRESH", "30"))  # 폐기 집합 재적재 주기(초)
+    EXT_LAST_USED_INTERVAL = int(os.getenv("EXT_LAST_USED_INTERVAL", "300"))  # 토큰별 last_used_at 기록 간격(초)
+    EXT_LAST_USED_FLUSH = int(os.getenv("EXT_LAST_USED_FLUSH", "60"))  # 배치 flush 주기(초)
+
     # reCAPTCHA
     RECAPTCHA_SECRET = os.getenv("RECAPTCHA_SECRET_KEY")
     RECAPTCHA_SITE_KEY = os.getenv("RECAPTCHA_SITE_KEY")
@@ -54,6 +61,11 @@ class Config:
     MIN_RESP_MS = 450
     JITTER_MS = 200
 
+    # 소켓 기본 타임아웃(초) — timeout 을 직접 지정하지 않은 소켓에만 적용
+    # requests/anthropic(httpx) 는 호출마다 timeout 을 넘기고, psycopg2 는 libpq 소켓이라 영향 없음
+    # gevent 모드(core/wsgi_gevent.py)에서도 동일하게 green socket 에 적용된다 (0 이하 = 무제한)
+    SOCKET_DEFAULT_TIMEOUT = float(os.getenv("SOCKET_DEFAULT_TIMEOUT", "5"))
+
     # -------------------------
     # CORS / Origin allowlist
     # -------------------------
@@ -73,9 +85,22 @@ class Config:
     # Rate limiting (Flask-Limiter 표준 키)
     # -------------------------
     REDIS_URL = os.getenv("REDIS_URL", "")
-    RATELIMIT_STORAGE_URI = REDIS_URL if REDIS_URL else "memory://"
+    # Redis 가 있으면 로컬 lease + Redis 동기화 저장소(core/rate_limit.LeasedRedisStorage)
+    RATELIMIT_STORAGE_URI = f"leased+{REDIS_URL}" if REDIS_URL else "memory://"
+    RATELIMIT_STORAGE_OPTIONS = {
+        "lease_divisor": int(os.getenv("RATELIMIT_LEASE_DIVISOR", "10")),  # chunk = limit // divisor
+        "lease_max": int(os.getenv("RATELIMIT_LEASE_MAX", "20")),
+        "lease_idle_return": float(os.getenv("RATELIMIT_LEASE_IDLE_RETURN", "2")),  # idle lease 반납(초)
+    }
     RATELIMIT_DEFAULT = os.getenv("RATELIMIT_DEFAULT", "200 per hour")
 
+    # -------------------------
+    # 사용량(quota) 카운터 저장소
+    # -------------------------
+    # "postgres"(기본) | "redis" — redis 는 REDIS_URL 필요, Redis 장애 시 요청 단위로 postgres fallback
+    # redis 사용 시 /internal/cron/flush-quota 를 주기적으로 호출해 usage 테이블로 write-behind
+    QUOTA_BACKEND = os.getenv("QUOTA_BACKEND", "postgres").strip().lower()
+
     # -------------------------
     # Nicepay
     # -------------------------
@@ -137,6 +162,51 @@ class Config:
         "pro": {"monthly": 1000}, # 월 1000회 (scope별)
     }
 
+    # 엔타이틀먼트(구독/티어) 캐시 TTL(초) — 구독 변경 시에는 invalidate_entitlement 로 즉시 무효화
+    ENTITLEMENT_LOCAL_TTL = int(os.getenv("ENTITLEMENT_LOCAL_TTL", "30"))
+    ENTITLEMENT_REDIS_TTL = int(os.getenv("ENTITLEMENT_REDIS_TTL", "600"))
+    # 방문 로그 파이프라인 (services/visit_pipeline)
+    VISIT_SAMPLE_EVERY = int(os.getenv("VISIT_SAMPLE_EVERY", "1"))  # 비로그인 방문 N건 중 1건 기록(weight=N)
+    VISIT_QUEUE_MAX = int(os.getenv("VISIT_QUEUE_MAX", "10000"))  # 초과분은 drop
+    VISIT_BATCH_MAX = int(os.getenv("VISIT_BATCH_MAX", "500"))
+    VISIT_FLUSH_SECONDS = float(os.getenv("VISIT_FLUSH_SECONDS", "2"))
+    # raw visits 행 적재 여부 (끄면 일간 집계만 남음 — 마이페이지 최근 방문/관리자 user 필터는 raw 필요)
+    VISIT_RAW_ENABLED = _env_bool("VISIT_RAW_ENABLED", True)
+
+    # 세션 claims(tier/admin/구독 만료) 재발급 주기(초)
+    SESSION_CLAIMS_TTL = int(os.getenv("SESSION_CLAIMS_TTL", "300"))
+
+    # 블로그/Learn 페이지 비로그인 응답 Cache-Control max-age(초) — services/page_cache
+    CONTENT_CACHE_MAX_AGE = int(os.getenv("CONTENT_CACHE_MAX_AGE", "3600"))
+    # 메인/구독/요약 비로그인 GET 전체 페이지 캐시 TTL(초, 0 이면 끔) / Redis(REDIS_URL) 공유 여부 — services/page_cache
+    PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", "60"))
+    PAGE_CACHE_REDIS = _env_bool("PAGE_CACHE_REDIS", True)
+    # Jinja 컴파일 결과 파일 캐시(워커 간 공유, 디렉터리 미설정 시 Jinja 기본 사용자별 디렉터리, 설정 시 소유자/0700 필수) / 부팅 시 전체 템플릿 미리 로드 — core/templates
+    JINJA_BYTECODE_CACHE = _env_bool("JINJA_BYTECODE_CACHE", True)
+    JINJA_BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR", "")
+    TEMPLATE_WARMUP = _env_bool("TEMPLATE_WARMUP", True)
+    # /history 한 번에 보여줄(스크롤마다 더 불러올) 기록 수 — services/history keyset 페이지
+    HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "30"))
+    # /api/history fields=*_preview 로 요청 시 잘라 보낼 글자 수 (전체는 /api/history/<id>)
+    HISTORY_PREVIEW_CHARS = int(os.getenv("HISTORY_PREVIEW_CHARS", "120"))
+    # sitemap 파일당 최대 URL 수 (초과 시 sitemap index + sitemap-<n>.xml 로 분할, 프로토콜 상한 50000)
+    SITEMAP_MAX_URLS = int(os.getenv("SITEMAP_MAX_URLS", "5000"))
+
+    # 응답 압축 미들웨어 (core/compression) — 앞단 nginx 가 이미 압축하면 끄기
+    COMPRESS_ENABLED = _env_bool("COMPRESS_ENABLED", True)
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # bytes 미만은 원본 그대로
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))  # 동적 응답용 (11 은 너무 느림)
+
+    # 로깅 (core/log) — stdout JSON, 큐 + listener 스레드로 비동기 출력
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    # 로거별 샘플링(INFO 이하에만 적용) 예: "lexinoa.polish=0.1,lexinoa.origin=0.01"
+    LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+    # 같은 로그 위치에서 window(초) 동안 burst 건 초과분은 억제 (다음 window 첫 레코드에 suppressed 수 첨부)
+    LOG_RATE_WINDOW = float(os.getenv("LOG_RATE_WINDOW", "60"))
+    LOG_RATE_BURST = int(os.getenv("LOG_RATE_BURST", "20"))
+    LOG_QUEUE_MAX = int(os.getenv("LOG_QUEUE_MAX", "10000"))  # 초과분은 drop (요청 스레드 블록 없음)
+
     # 허용 스코프(서비스 키) — 여기 추가하면 확장 가능 (summarize 없앨지 고민중)
     USAGE_SCOPES = {"rewrite", "summarize"}
 
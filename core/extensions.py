@@ -1,4 +1,5 @@
 # extensions.py
+from flask import current_app
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -7,6 +8,7 @@ from flask_wtf.csrf import CSRFProtect
 from domain.models import db
 from flask_babel import Babel
 from core.i18n import select_locale
+from core.rate_limit import rate_limit_key  # noqa: F401 — leased+redis 저장소 등록
 
 from authlib.integrations.flask_client import OAuth
 
@@ -21,6 +23,32 @@ cors = CORS()
 oauth = OAuth()
 babel = Babel()
 
+# redis 클라이언트는 REDIS_URL 이 있을 때만 lazy 생성 (fork 이후 워커마다 1개 풀)
+_redis_client = None
+
+
+def get_redis():
+    """REDIS_URL 이 설정돼 있으면 공용 redis 클라이언트, 없으면 None"""
+    global _redis_client
+    url = current_app.config.get("REDIS_URL")
+    if not url:
+        return None
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    return _redis_client
+
+def release_db_connection():
+    """
+    열린 트랜잭션을 끝내고 커넥션을 풀에 반납 (upstream LLM/API 호출 직전에 사용).
+    - 이미 로드된 ORM 객체는 detach 된다: 로드된 컬럼 값은 읽히지만 lazy 관계 로드/수정 후 commit 은
+      DetachedInstanceError 또는 무시됨 → 호출 이후에는 객체를 다시 조회하거나 get_current_user() 로 받아 쓴다
+      (get_current_user() 는 detach 된 g.current_user 를 새 세션에 merge 해서 돌려준다)
+    - 이후 DB 접근은 새 트랜잭션으로 자동 시작
+    """
+    db.session.close()
+
+
 #TODO:: extensions.py 에는 db, migrate, csrf, limiter, cors 등 init
 
 def init_extensions(app):
@@ -0,0 +1,115 @@
+"""
+freeze.py — 정적 콘텐츠(블로그/Learn/약관) 사전 렌더링: `flask --app app freeze`
+
+- 비로그인 방문자가 보는 그대로 (locale × 경로) 를 HTML 로 렌더해 파일로 쓴다
+    out/<locale>/<path>/index.html  (+ index.html.gz, brotli 설치 시 index.html.br)
+- nginx/CDN 이 비로그인 요청을 이 파일로 바로 응답 → Flask(hook/DB/Jinja)는 fallback 으로만 사용
+- 로그인 사용자는 헤더에 계정 정보가 들어가므로 반드시 Flask 로 보낸다 (세션 쿠키 유무로 분기)
+- 인라인 스크립트에 CSP nonce 가 들어간 페이지는 정적으로 서빙할 수 없으므로 건너뛴다
+
+nginx 예시 (gzip_static / brotli_static 모듈):
+    map $cookie_lang $lx_lang { default ""; ko ko; en en; }
+    map $http_accept_language $lx_accept { default ko; ~*^en en; }
+    location ~ ^/(blog|en/blog|learn|terms|privacy|disclaimer) {
+        set $lx_locale $lx_lang;
+        if ($lx_locale = "") { set $lx_locale $lx_accept; }
+        if ($cookie_session != "") { proxy_pass http://app; }
+        if ($args != "") { proxy_pass http://app; }
+        gzip_static on; brotli_static on;
+        try_files /frozen/$lx_locale$uri/index.html @app;
+    }
+"""
+import contextvars
+import gzip
+import os
+
+import click
+
+from core.extensions import limiter
+
+FREEZE_LOCALES = ("ko", "en")
+LEGAL_PATHS = ("/terms", "/privacy", "/disclaimer")
+
+
+def frozen_paths(locale: str) -> list:
+    """locale 별로 얼릴 경로 목록 (해당 locale 에 없는 블로그 글은 404 라서 제외)"""
+    from routes.web.blog import POST_INDEX
+    from routes.web.learn import LEARN_SLUGS
+
+    slugs = sorted(POST_INDEX.get(locale, {}))
+    paths = ["/blog", "/en/blog"]
+    paths += [f"/blog/{s}" for s in slugs]
+    paths += [f"/en/blog/{s}" for s in slugs]
+    paths += ["/learn"] + [f"/learn/{s}" for s in LEARN_SLUGS]
+    paths += list(LEGAL_PATHS)
+    return paths
+
+
+def _write(path: str, data: bytes, mtime: float) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    os.utime(path, (mtime, mtime))
+
+
+def freeze_site(app, out_dir: str, base_url: str) -> dict:
+    """모든 (locale, 경로) 를 렌더해 out_dir 에 기록. {"pages", "skipped", "brotli"} 반환"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    from services.page_cache import content_last_modified
+
+    stats = {"pages": 0, "skipped": [], "brotli": brotli is not None}
+    client = app.test_client(use_cookies=False)
+
+    # 빌드 프로세스에서만: 수십~수백 페이지를 한 IP 로 요청하므로 레이트리밋 해제
+    limiter.enabled = False
+    try:
+        with app.app_context():
+            mtime = content_last_modified().timestamp()
+        for locale in FREEZE_LOCALES:
+            for path in frozen_paths(locale):
+                resp = client.get(
+                    path,
+                    base_url=base_url,
+                    headers={"Cookie": f"lang={locale}", "Accept-Language": locale},
+                )
+                if resp.status_code != 200:
+                    stats["skipped"].append((locale, path, resp.status_code))
+                    continue
+                html = resp.get_data()
+                if b'nonce="' in html:
+                    stats["skipped"].append((locale, path, "csp_nonce"))
+                    continue
+
+                target = os.path.join(out_dir, locale, path.lstrip("/"), "index.html")
+                _write(target, html, mtime)
+                _write(target + ".gz", gzip.compress(html, compresslevel=9, mtime=0), mtime)
+                if brotli is not None:
+                    _write(target + ".br", brotli.compress(html, quality=11), mtime)
+                stats["pages"] += 1
+    finally:
+        limiter.enabled = True
+    return stats
+
+
+def init_freeze_cli(app):
+    @app.cli.command("freeze")
+    @click.option("--out", "out_dir", default="frozen", show_default=True, help="출력 디렉터리")
+    @click.option(
+        "--base-url",
+        default=lambda: os.getenv("APP_BASE_URL") or "http://localhost",
+        help="canonical URL 등에 쓰일 공개 주소 (기본: APP_BASE_URL)",
+    )
+    def freeze_command(out_dir, base_url):
+        """블로그/Learn/약관 페이지를 정적 HTML(.gz/.br)로 사전 렌더링"""
+        # flask CLI 는 app context 를 하나 push 한 채로 명령을 실행하고, 그 안의 test 요청들은 이 context(g)를 공유한다
+        # (locale/identity 캐시가 첫 요청 값으로 고정됨) → 빈 contextvars 컨텍스트에서 실행해 요청마다 새 app context
+        stats = contextvars.Context().run(freeze_site, app, out_dir, base_url.rstrip("/"))
+        click.echo(f"frozen {stats['pages']} pages -> {out_dir} (brotli={'on' if stats['brotli'] else 'off'})")
+        for locale, path, reason in stats["skipped"]:
+            click.echo(f"  skipped {locale} {path}: {reason}", err=True)
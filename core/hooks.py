@@ -1,8 +1,12 @@
-from auth.entitlements import load_current_user
+from auth.entitlements import current_claims, load_current_user
 
 from flask import request, g, session, abort, current_app
 
-from domain.models import db, User, Visit
+from core.log import get_logger
+from services.visit_pipeline import enqueue_visit
+
+log = get_logger("hooks")
+origin_log = get_logger("origin")
 
 
 def load_user():
@@ -27,10 +31,17 @@ def load_current_user_role():
     cfg = current_app.config
     g.is_admin = False
 
-    user = getattr(g, "current_user", None)
     admin_id = cfg.get("ADMIN_ID")
 
-    if user and getattr(user, "is_admin", False):
+    # 세션 claims 가 있으면 User row 를 읽지 않고 판정
+    claims = current_claims()
+    if claims is not None:
+        is_admin = claims.get("is_admin", False)
+    else:
+        user = getattr(g, "current_user", None)
+        is_admin = bool(user and getattr(user, "is_admin", False))
+
+    if is_admin:
         g.is_admin = True
         return
 
@@ -55,11 +66,10 @@ def log_visit():
         user_id = sess.get("user_id")
         ip = request.remote_addr
         ua = (request.headers.get("User-Agent") or "")[:500]
-        v = Visit(user_id=user_id, ip=ip, user_agent=ua, path=path)
-        db.session.add(v)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
+        # 큐에 넣기만 하고 적재는 writer 스레드가 배치로 (services/visit_pipeline)
+        enqueue_visit(user_id=user_id, ip=ip, user_agent=ua, path=path)
+    except Exception as e:
+        log.warning("visit_enqueue_error", extra={"error": repr(e)})
 
 
 # -------------------- API Origin 검사 --------------------
@@ -80,14 +90,10 @@ def origin_allowed():
     ext_origins = cfg.get("EXT_ORIGINS") or []
     ext_ids = cfg.get("EXTENSION_IDS") or []
 
-    # ---- debug (필요하면 잠깐 켜고 나중에 제거) ----
-    # print("[ORIGIN] origin=", origin, "ref=", ref, "this=", this)
-
     # Chrome extension
     if origin.startswith("chrome-extension://"):
         ok = origin in {f"chrome-extension://{i}" for i in ext_ids}
-        print("[ORIGIN] origin=", origin, "ext_ids=", ext_ids, "type=", type(ext_ids))
-        # print("[ORIGIN] chrome ok=", ok)
+        origin_log.debug("extension_origin", extra={"origin": origin, "ok": ok})
         return ok
 
     allowed = set(o.rstrip("/") for o in api_allowed_origins if o)
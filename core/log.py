@@ -0,0 +1,230 @@
+"""
+log.py — 구조화(JSON) 비동기 로깅
+
+- get_logger("quota") → "lexinoa.quota" 로거. 모듈에서는 print 대신 이것만 사용
+- 요청 스레드는 QueueHandler 로 큐에 넣기만 하고, 포맷/출력(stdout)은 QueueListener 스레드가 처리
+- 필터(큐에 넣기 전에 적용 → 버릴 레코드는 포맷 비용도 없음)
+    SamplingFilter   : 로거별 샘플링 (LOG_SAMPLING="lexinoa.origin=0.01,lexinoa.usage=0.1"), WARNING 이상은 항상 통과
+    RateLimitFilter  : 같은 (로거, 메시지 위치) 가 window 내 burst 를 넘으면 억제, 다음 통과 시 suppressed 개수 첨부
+                       WARNING 이상은 억제하지 않음
+    RedactFilter     : extra 필드 중 민감 키(authorization/cookie/password/본문 등)를 마스킹
+- 레코드에 extra={"k": v} 로 준 값은 JSON 최상위 필드로 출력, 예외 traceback 은 "exc" 필드
+- listener 스레드는 프로세스(pid)마다 첫 로그 시점에 시작 → gunicorn --preload 로 마스터에서 create_app 해도
+  fork 된 워커가 각자 자기 listener 를 갖는다 (스레드는 fork 로 복제되지 않음)
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+ROOT = "lexinoa"
+
+# LogRecord 기본 속성 (extra 로 준 필드만 골라내기 위해)
+_STD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+REDACT_KEYS = {
+    "authorization", "cookie", "set-cookie", "password", "token", "access_token",
+    "code_verifier", "body", "raw_body", "input_text", "output_text", "text",
+}
+
+_handler = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+def redact(value, limit: int = 0):
+    """요청 본문 등 자유 텍스트는 길이만 남긴다 (limit>0 이면 앞부분 limit 자만 허용)"""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8", "replace")
+    s = str(value)
+    if limit and len(s) <= limit:
+        return s
+    return f"[redacted len={len(s)}]"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for k, v in vars(record).items():
+            if k not in _STD_ATTRS and not k.startswith("_"):
+                out[k] = v
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            out["exc"] = record.exc_text  # QueueHandler.prepare 에서 미리 문자열로 만든 traceback
+        if record.stack_info:
+            out["stack"] = record.stack_info
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: dict):
+        super().__init__()
+        # 긴 이름 우선 매칭 (lexinoa.auth.bearer → lexinoa.auth 순)
+        self.rates = sorted(rates.items(), key=lambda kv: -len(kv[0]))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return random.random() < rate
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, window: float = 60.0, burst: int = 20):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets = {}  # (logger, path, lineno) -> [window_start, count, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            b = self._buckets.get(key)
+            if b is None or now - b[0] >= self.window:
+                suppressed = b[2] if b else 0
+                if len(self._buckets) > 10_000:
+                    self._buckets.clear()
+                self._buckets[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            b[1] += 1
+            if b[1] > self.burst:
+                b[2] += 1
+                return False
+            return True
+
+
+class RedactFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        for k in list(vars(record)):
+            if k.lower() in REDACT_KEYS:
+                setattr(record, k, redact(getattr(record, k)))
+        return True
+
+
+def _parse_rates(spec: str) -> dict:
+    rates = {}
+    for part in (spec or "").split(","):
+        name, _, rate = part.strip().partition("=")
+        if name and rate:
+            try:
+                rates[name.strip()] = max(0.0, min(1.0, float(rate)))
+            except ValueError:
+                continue
+    return rates
+
+
+def init_logging(app) -> None:
+    """
+    lexinoa.* 로거 → QueueHandler → (listener 스레드) → stdout JSON
+    설정만 여기서 하고 listener 스레드는 _DroppingQueueHandler 가 프로세스마다 처음 enqueue 할 때 시작한다.
+    """
+    global _handler
+    if _handler is not None:
+        return
+
+    cfg = app.config
+    out = logging.StreamHandler(sys.stdout)
+    out.setFormatter(JsonFormatter())
+
+    qh = _DroppingQueueHandler(out, maxsize=int(cfg.get("LOG_QUEUE_MAX", 10000)))
+    qh.addFilter(SamplingFilter(_parse_rates(cfg.get("LOG_SAMPLING", ""))))
+    qh.addFilter(RateLimitFilter(
+        window=float(cfg.get("LOG_RATE_WINDOW", 60)),
+        burst=int(cfg.get("LOG_RATE_BURST", 20)),
+    ))
+    qh.addFilter(RedactFilter())
+
+    root = logging.getLogger(ROOT)
+    root.setLevel(str(cfg.get("LOG_LEVEL", "INFO")).upper())
+    root.handlers[:] = [qh]
+    root.propagate = False
+    _handler = qh
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    큐가 가득 차면 요청 스레드를 막지 않고 버린다
+    - pid 가 바뀌면(fork 된 워커) 새 큐 + listener 스레드를 만든다 (부모의 큐/스레드는 자식에서 쓸 수 없음)
+    """
+
+    dropped = 0
+
+    def __init__(self, target: logging.Handler, maxsize: int):
+        self.target = target
+        self.maxsize = maxsize
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._listener = None
+        super().__init__(queue.Queue(maxsize=maxsize))
+
+    def _ensure_listener(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            self.queue = queue.Queue(maxsize=self.maxsize)
+            self._listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self._listener.stop)
+            self._pid = pid
+
+    def _after_fork_in_child(self):
+        # fork 시점에 다른 스레드가 잡고 있던 lock 이 복제돼 영원히 잠기는 것 방지
+        self._start_lock = threading.Lock()
+
+    def prepare(self, record):
+        """
+        기본 prepare 는 traceback 을 msg 에 합쳐 버리고 exc_info 를 지운다
+        → 메시지/traceback 을 따로 문자열로 만들어 두고(listener 스레드로 넘길 수 있게) exc 필드로 출력되게 한다
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+def _reinit_after_fork():
+    if _handler is not None:
+        _handler._after_fork_in_child()
+
+
+os.register_at_fork(after_in_child=_reinit_after_fork)
@@ -0,0 +1,205 @@
+"""
+rate_limit.py — Flask-Limiter 저장소 / 키 함수
+
+LeasedRedisStorage ("leased+redis://...")
+- 워커마다 키별 lease(=Redis 카운터에서 미리 잘라온 번호 구간)를 메모리에 들고 있다가
+  lease 안에서는 네트워크 없이 카운트한다. lease 가 떨어졌을 때만 Redis INCRBY chunk 1회
+- 반환하는 카운트는 "클러스터 전체에서 예약된 순번" 이므로 한도 비교가 워커 간에도 근사적으로 맞다
+    (다른 워커가 쥔 미사용 lease 만큼 일찍 막힐 수 있음 → idle lease 는 백그라운드에서 DECRBY 로 반납)
+- chunk 는 한도에 비례(limit // lease_divisor, 최대 lease_max) — 작은 한도(< divisor)는 매번 Redis
+  옵션은 RATELIMIT_STORAGE_OPTIONS (core/config.py)
+- 고정 윈도우(첫 hit 기준 expiry)는 기본 redis 저장소와 같은 방식
+"""
+import hashlib
+import os
+import threading
+import time
+
+from flask import current_app, request, session
+from limits.storage import Storage
+
+from core.log import get_logger
+
+log = get_logger("ratelimit")
+
+# KEYS[1]=counter / ARGV[1]=lease 크기, ARGV[2]=window(초)
+# return {예약 후 total, 남은 ttl(ms)}
+_LEASE_LUA = """
+local total = redis.call('INCRBY', KEYS[1], ARGV[1])
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+  redis.call('EXPIRE', KEYS[1], ARGV[2])
+  ttl = tonumber(ARGV[2]) * 1000
+end
+return {total, ttl}
+"""
+
+# 미사용 lease 반납 (윈도우가 이미 끝났으면 무시)
+_RETURN_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  local v = redis.call('DECRBY', KEYS[1], ARGV[1])
+  if v < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+  end
+end
+return 1
+"""
+
+
+class _Lease:
+    __slots__ = ("next", "end", "expires_at", "last_used")
+
+    def __init__(self, start, end, expires_at, now):
+        self.next = start
+        self.end = end
+        self.expires_at = expires_at
+        self.last_used = now
+
+
+class LeasedRedisStorage(Storage):
+    STORAGE_SCHEME = ["leased+redis", "leased+rediss"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        import redis
+
+        self._redis_mod = redis
+        self.redis = redis.Redis.from_url(
+            uri.replace("leased+", "", 1),
+            socket_timeout=float(options.get("socket_timeout", 0.5)),
+            socket_connect_timeout=float(options.get("socket_timeout", 0.5)),
+        )
+        self.divisor = int(options.get("lease_divisor", 10))
+        self.max_chunk = int(options.get("lease_max", 20))
+        self.idle_return = float(options.get("lease_idle_return", 2.0))
+        self._lease_script = self.redis.register_script(_LEASE_LUA)
+        self._return_script = self.redis.register_script(_RETURN_LUA)
+        self._leases: dict = {}
+        self._lock = threading.Lock()
+        self._reconciler_pid = None
+
+    @property
+    def base_exceptions(self):
+        return self._redis_mod.RedisError
+
+    def _chunk(self, key: str, amount: int) -> int:
+        # key = "{prefix}/.../{amount}/{multiples}/{granularity}" (limits RateLimitItem.key_for)
+        try:
+            limit = int(key.rsplit("/", 3)[1])
+        except (IndexError, ValueError):
+            limit = 0
+        return max(amount, min(self.max_chunk, limit // self.divisor) or 1)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease.expires_at > now and lease.next + amount - 1 <= lease.end:
+                count = lease.next + amount - 1
+                lease.next += amount
+                lease.last_used = now
+                return count
+
+        self._ensure_reconciler()
+        size = self._chunk(key, amount)
+        total, ttl_ms = self._lease_script(keys=[key], args=[size, int(expiry)])
+        start = int(total) - size + 1
+        count = start + amount - 1
+        with self._lock:
+            self._leases[key] = _Lease(start + amount, int(total), now + int(ttl_ms) / 1000.0, now)
+        return count
+
+    def get(self, key: str) -> int:
+        # 로컬 lease 가 있으면 그 위치(네트워크 없음), 없으면 Redis 값
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease.expires_at > time.time():
+                return lease.next - 1
+        return int(self.redis.get(key) or 0)
+
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease.expires_at > time.time():
+                return lease.expires_at
+        return time.time() + max(0, self.redis.pttl(key)) / 1000.0
+
+    def check(self) -> bool:
+        try:
+            return bool(self.redis.ping())
+        except Exception:
+            return False
+
+    def reset(self):
+        with self._lock:
+            self._leases.clear()
+        return None
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._leases.pop(key, None)
+        self.redis.delete(key)
+
+    # -------------------- 비동기 정산 --------------------
+    def _ensure_reconciler(self) -> None:
+        pid = os.getpid()
+        if self._reconciler_pid == pid:
+            return
+        with self._lock:
+            if self._reconciler_pid == pid:
+                return
+            # fork 이전 부모의 lease 는 이 워커 것이 아니다
+            self._leases.clear()
+            self._reconciler_pid = pid
+        threading.Thread(target=self._reconcile_loop, name="ratelimit-reconcile", daemon=True).start()
+
+    def _reconcile_loop(self) -> None:
+        while True:
+            time.sleep(self.idle_return / 2)
+            try:
+                self.reconcile()
+            except Exception as e:
+                log.warning("reconcile_error", extra={"error": repr(e)})
+
+    def reconcile(self) -> int:
+        """idle lease 의 남은 구간을 Redis 에 반납하고 만료된 lease 정리. 반납 건수 반환"""
+        now = time.time()
+        returns = []
+        with self._lock:
+            for key, lease in list(self._leases.items()):
+                if lease.expires_at <= now:
+                    del self._leases[key]
+                elif now - lease.last_used >= self.idle_return:
+                    del self._leases[key]
+                    remaining = lease.end - lease.next + 1
+                    if remaining > 0:
+                        returns.append((key, remaining))
+        if not returns:
+            return 0
+        pipe = self.redis.pipeline(transaction=False)
+        for key, remaining in returns:
+            self._return_script(keys=[key], args=[remaining], client=pipe)
+        pipe.execute()
+        return len(returns)
+
+
+def rate_limit_key() -> str:
+    """
+    사용자 단위 레이트리밋 키
+    - 로그인 세션: user_id / 확장 Bearer: 토큰 해시 / 게스트: 게스트 쿠키 / 그 외: IP
+    limiter 훅은 load_user 보다 먼저 돌기 때문에 DB 없이 요청에서 바로 얻을 수 있는 값만 쓴다.
+    게스트 쿠키는 새로 발급받아 우회할 수 있으므로 라우트에는 IP 한도도 함께 건다.
+    """
+    auth = request.headers.get("Authorization") or ""
+    if auth.lower().startswith("bearer "):
+        return "t:" + hashlib.sha256(auth[7:].strip().encode("utf-8")).hexdigest()[:24]
+
+    uid = (session.get("user") or {}).get("user_id")
+    if uid:
+        return f"u:{uid}"
+
+    aid = request.cookies.get(current_app.config["AID_COOKIE"])
+    if aid:
+        return "g:" + hashlib.sha256(aid.encode("utf-8")).hexdigest()[:24]
+
+    return f"ip:{request.remote_addr}"
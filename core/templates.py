@@ -0,0 +1,84 @@
+"""
+templates.py — Jinja 템플릿 bytecode 캐시 + 부팅 시 warm-up
+
+- 파일 bytecode 캐시(FileSystemBytecodeCache): 컴파일된 템플릿 코드를 디스크에 저장
+    같은 호스트의 gunicorn 워커들이 공유 → 두 번째 워커부터, 재배포/워커 재시작 후에도 파싱·컴파일 생략
+    (원본이 바뀌면 checksum 이 달라져 자동으로 다시 컴파일)
+    bytecode 는 marshal 된 코드 객체라 그대로 실행되므로 디렉터리는 앱 실행 사용자 전용이어야 한다
+      JINJA_BYTECODE_CACHE_DIR 미설정: Jinja 기본값(<tmp>/_jinja2-cache-<uid>, 소유자/0700 검사)
+      설정: 없으면 0700 으로 만들고, 있으면 소유자 = 현재 사용자 + group/other 권한 없음 을 확인 (아니면 캐시 끔)
+- warm-up (TEMPLATE_WARMUP): create_app 끝에서 모든 템플릿을 미리 로드해 환경 캐시에 올려 둔다
+    → 첫 요청이 컴파일 비용을 떠안지 않음. gunicorn --preload 면 마스터에서 한 번만 하고 fork 로 공유
+- 배포 시 `flask templates-compile` 로 bytecode 캐시를 미리 채울 수 있다 (이미지 빌드 단계 등)
+"""
+import os
+import stat
+import time
+
+import click
+from jinja2 import FileSystemBytecodeCache, TemplateSyntaxError
+
+from core.log import get_logger
+
+log = get_logger("templates")
+
+
+def _bytecode_cache(app) -> FileSystemBytecodeCache:
+    path = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+    if not path:
+        return FileSystemBytecodeCache()
+
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise OSError(f"JINJA_BYTECODE_CACHE_DIR must be a directory owned by uid {os.getuid()} with mode 0700: {path}")
+    return FileSystemBytecodeCache(path)
+
+
+def warm_templates(app) -> int:
+    """로드 가능한 모든 템플릿을 컴파일해 환경 캐시(+bytecode 캐시)에 올린다. 로드한 개수 반환"""
+    env = app.jinja_env
+    names = [n for n in env.list_templates() if n.endswith((".html", ".xml", ".txt"))]
+    # 기본 cache_size(400)보다 템플릿이 많으면 warm-up 한 것이 밀려나므로 여유를 둔다
+    if env.cache is not None and getattr(env.cache, "capacity", 0) < len(names) * 2:
+        env.cache.capacity = len(names) * 2
+
+    loaded = 0
+    for name in names:
+        try:
+            env.get_template(name)
+            loaded += 1
+        except TemplateSyntaxError as e:
+            log.warning("template_compile_failed", extra={"template": name, "error": str(e)})
+    return loaded
+
+
+def init_templates(app):
+    cfg = app.config
+    if cfg.get("JINJA_BYTECODE_CACHE", True):
+        try:
+            app.jinja_env.bytecode_cache = _bytecode_cache(app)
+        except OSError as e:
+            # 캐시 디렉터리를 못 만들거나(읽기 전용 FS 등) 안전하지 않으면 캐시 없이 동작
+            log.warning("jinja_bytecode_cache_disabled", extra={"error": str(e)})
+
+    @app.cli.command("templates-compile")
+    def templates_compile_command():
+        """bytecode 캐시를 비우고 모든 템플릿을 다시 컴파일해 채운다"""
+        cache = app.jinja_env.bytecode_cache
+        if cache is not None:
+            cache.clear()
+        if app.jinja_env.cache is not None:
+            app.jinja_env.cache.clear()  # 부팅 warm-up 으로 이미 올라간 것도 다시 컴파일
+        started = time.perf_counter()
+        n = warm_templates(app)
+        where = cache.directory if isinstance(cache, FileSystemBytecodeCache) else "memory only"
+        click.echo(f"compiled {n} templates in {(time.perf_counter() - started) * 1000:.0f}ms -> {where}")
+
+    if cfg.get("TEMPLATE_WARMUP", True):
+        started = time.perf_counter()
+        n = warm_templates(app)
+        log.info("templates_warmed", extra={"count": n, "ms": round((time.perf_counter() - started) * 1000, 1)})
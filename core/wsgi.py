@@ -2,7 +2,3 @@
 from app import create_app
 
 app = create_app()
-
-@app.get("/health")
-def health():
-    return "ok", 200
\ No newline at end of file
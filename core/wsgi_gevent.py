@@ -0,0 +1,22 @@
+# wsgi_gevent.py
+# gevent(협력형 I/O) 워커 전용 진입점
+#
+# 실행 예:
+#   gunicorn -k gevent -w 2 --worker-connections 200 core.wsgi_gevent:app
+#
+# 주의
+# - monkey patch 는 반드시 app / anthropic / requests / psycopg2 import 보다 먼저 실행되어야 한다.
+#   (먼저 import 된 모듈은 패치 전 socket/ssl/threading 을 잡고 있어 블로킹 호출이 된다)
+# - psycopg2 는 C 확장이라 monkey patch 로 green 이 되지 않는다 → psycogreen 으로 wait callback 등록
+# - services/mail 의 Thread 는 threading 패치로 greenlet 으로 실행된다 (별도 수정 불필요)
+from gevent import monkey
+
+monkey.patch_all()
+
+from psycogreen.gevent import patch_psycopg  # noqa: E402
+
+patch_psycopg()
+
+from app import create_app  # noqa: E402
+
+app = create_app()
@@ -176,6 +176,8 @@ class Visit(db.Model):
     user_agent = db.Column(db.Text, nullable=True)
     path = db.Column(db.String(255), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=utcnow, nullable=False, index=True)
+    # 샘플링 보정 가중치: 이 행이 대표하는 방문 수 (집계는 sum(weight))
+    weight = db.Column(db.Integer, nullable=False, default=1, server_default="1")
 
     __table_args__ = (
         Index("idx_visits_path_created", "path", "created_at"),
@@ -183,6 +185,28 @@ class Visit(db.Model):
     )
 
 
+class VisitDailyStat(db.Model):
+    """
+    방문 일간 집계 (KST 일자 × 경로)
+    - hits: sum(weight) — 샘플링 보정된 방문 수
+    - users_hll / ips_hll: 고유 user_id / ip HyperLogLog 레지스터 (utils/hll.py)
+    관리자 대시보드는 raw visits 대신 이 테이블을 읽는다 (기간 고유 수는 스케치 합집합)
+    """
+    __tablename__ = "visit_daily_stats"
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    day = db.Column(db.Date, nullable=False)  # KST 기준
+    path = db.Column(db.String(255), nullable=False)
+    hits = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    users_hll = db.Column(db.LargeBinary, nullable=True)
+    ips_hll = db.Column(db.LargeBinary, nullable=True)
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("day", "path", name="uq_visit_daily_stats_day_path"),
+    )
+
+
 # =========================
 #   Payment Methods (NICEPAY 빌키=BID)
 # =========================
@@ -397,6 +421,8 @@ class Usage(db.Model):
     scope = db.Column(db.String(32), nullable=False, default="rewrite", index=True)
     window_start = db.Column(db.Date, nullable=False, index=True)
     count = db.Column(db.Integer, nullable=False, default=0)
+    # QUOTA_BACKEND=redis 에서 Redis 장애로 Postgres 에 직접 반영된 증감분 (다음 seed/flush 때 합산) — auth/quota_backend
+    pg_delta = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     __table_args__ = (
         UniqueConstraint("user_id", "tier", "scope", "window_start",
@@ -418,6 +444,7 @@ class GuestUsage(db.Model):
     scope = db.Column(db.String(32), nullable=False, default="rewrite", index=True)
     window_start = db.Column(db.DateTime, nullable=False, index=True)
     count = db.Column(db.Integer, nullable=False, default=0)
+    pg_delta = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # Usage.pg_delta 참고
 
     __table_args__ = (
         UniqueConstraint("guest_key", "scope", "window_start",
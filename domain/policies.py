@@ -2,8 +2,8 @@
 TIERS = ("guest", "free", "pro")
 
 FEATURES_BY_TIER = {
-    "guest": {"rewrite.single"},
-    "free": {"rewrite.single", "rewrite.multi", "preview.compare3", "chrome.ext", "tone.autodetect"},
+    "guest": {"rewrite.single", "summarize"},
+    "free": {"rewrite.single", "rewrite.multi", "preview.compare3", "chrome.ext", "tone.autodetect", "summarize"},
     "pro":  {"*"},  # 모든 기능 허용
 }
 
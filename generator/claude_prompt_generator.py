@@ -6,6 +6,10 @@ from typing import Tuple, Dict, Any
 load_dotenv()
 
 import anthropic
+
+from core.log import get_logger
+
+log = get_logger("ai.claude")
 #빠른 모델
 #claude-haiku-4-5-20251001
 #깊게 생각하는 모델
@@ -40,7 +44,7 @@ def call_claude(system_prompt, final_user_prompt) -> Tuple[str, Dict[str, Any]]:
         api_key=os.environ.get("ANTHROPIC_API_KEY")
     )
     if not client:
-        print("[Claude][Error] ANTIHROPIC_API_KEY is empty")
+        log.error("anthropic_api_key_empty")
         return "", {"provider": "claude", "model": None}
 
     model = "claude-sonnet-4-5-20250929"  # 최신 안정 모델로 변경 권장
@@ -48,7 +52,6 @@ def call_claude(system_prompt, final_user_prompt) -> Tuple[str, Dict[str, Any]]:
     usage_data = None
     error_message = ""  # output_text에 저장할 에러 메시지 초기화
     try:
-        print(f"[Claude] model={model}")
         # 2. messages.create의 인자 위치 수정 (max_tokens를 최상위로)
         message = client.messages.create(
             model=model,
@@ -69,8 +72,7 @@ def call_claude(system_prompt, final_user_prompt) -> Tuple[str, Dict[str, Any]]:
         # 4. usage 정보는 message 객체에서 직접 접근 후 추출
         usage_data = _extract_usage(message)
 
-        print(f"[Claude] 1st call OK")
-        print(text)
+        log.info("claude_call_ok", extra={"model": model, "text_len": len(text), **usage_data})
         return text, {
             "provider": "claude",
             "model": model,
@@ -81,7 +83,7 @@ def call_claude(system_prompt, final_user_prompt) -> Tuple[str, Dict[str, Any]]:
     except Exception as e:
         # 5. 에러 발생 시, 에러 메시지를 문자열로 저장
         error_message = str(e)
-        print(f"[Claude][Error] 1st call failed: {error_message}")
+        log.error("claude_call_failed", extra={"model": model, "error": error_message})
 
     # 6. 실패 시, 오류 메시지와 초기화된 usage_data를 반환
     return error_message, {  # 텍스트 대신 오류 메시지를 output_text에 저장하도록 반환 (DB 에러 방지)
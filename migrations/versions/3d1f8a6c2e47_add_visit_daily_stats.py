@@ -0,0 +1,34 @@
+"""add visit_daily_stats (daily counters + HLL sketches)
+
+Revision ID: 3d1f8a6c2e47
+Revises: b7e2c41d9a05
+Create Date: 2026-10-19 13:40:05.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d1f8a6c2e47'
+down_revision = 'b7e2c41d9a05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('visit_daily_stats',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('path', sa.String(length=255), nullable=False),
+    sa.Column('hits', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('users_hll', sa.LargeBinary(), nullable=True),
+    sa.Column('ips_hll', sa.LargeBinary(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'path', name='uq_visit_daily_stats_day_path')
+    )
+
+
+def downgrade():
+    op.drop_table('visit_daily_stats')
@@ -0,0 +1,38 @@
+"""add pg_trgm search index on rewrite_logs (user_id, input_text || output_text)
+
+Revision ID: 5b2e9f4c7a13
+Revises: 3d1f8a6c2e47
+Create Date: 2026-10-19 17:52:31.418204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e9f4c7a13'
+down_revision = '3d1f8a6c2e47'
+branch_labels = None
+depends_on = None
+
+# services/history.SEARCH_DOC 와 같은 식이어야 한다
+SEARCH_DOC = "((coalesce(input_text, '') || ' ') || coalesce(output_text, ''))"
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # btree_gin: user_id(varchar) 를 같은 GIN 인덱스에 넣기 위해 필요
+    #   → user_id = :uid AND doc ILIKE/<% :q 가 한 인덱스 스캔으로 처리 (다른 사용자 행의 trigram 매칭을 읽지 않음)
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    # CONCURRENTLY 는 트랜잭션 밖에서만 가능 — 쓰기를 막지 않고 인덱스 생성 (대용량 rewrite_logs 운영 중 적용)
+    with op.get_context().autocommit_block():
+        # 중단된 이전 시도가 INVALID 인덱스를 남겼을 수 있음
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_rewritelog_search_trgm")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY idx_rewritelog_search_trgm "
+            f"ON rewrite_logs USING gin (user_id, {SEARCH_DOC} gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_rewritelog_search_trgm")
@@ -0,0 +1,30 @@
+"""add usage.pg_delta / guest_usage.pg_delta (postgres fallback increments while redis owns the counter)
+
+Revision ID: 9a4d6c1e2f58
+Revises: 5b2e9f4c7a13
+Create Date: 2026-10-19 18:44:09.571032
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d6c1e2f58'
+down_revision = '5b2e9f4c7a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('usage', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pg_delta', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('guest_usage', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pg_delta', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('guest_usage', schema=None) as batch_op:
+        batch_op.drop_column('pg_delta')
+    with op.batch_alter_table('usage', schema=None) as batch_op:
+        batch_op.drop_column('pg_delta')
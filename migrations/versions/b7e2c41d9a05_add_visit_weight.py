@@ -0,0 +1,27 @@
+"""add visits.weight (sampling weight)
+
+Revision ID: b7e2c41d9a05
+Revises: 6930145329b6
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c41d9a05'
+down_revision = '6930145329b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 기존 행은 모두 전수 기록이므로 weight=1
+    with op.batch_alter_table('visits', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('weight', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('visits', schema=None) as batch_op:
+        batch_op.drop_column('weight')
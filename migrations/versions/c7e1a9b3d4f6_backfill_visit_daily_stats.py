@@ -0,0 +1,95 @@
+"""backfill visit_daily_stats from raw visits (days before the stats writer was enabled)
+
+Revision ID: c7e1a9b3d4f6
+Revises: 9a4d6c1e2f58
+Create Date: 2026-10-19 19:21:47.280615
+
+"""
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.hll import HyperLogLog
+from utils.time_utils import KST
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e1a9b3d4f6'
+down_revision = '9a4d6c1e2f58'
+branch_labels = None
+depends_on = None
+
+_stats = sa.table(
+    'visit_daily_stats',
+    sa.column('day', sa.Date),
+    sa.column('path', sa.String),
+    sa.column('hits', sa.BigInteger),
+    sa.column('users_hll', sa.LargeBinary),
+    sa.column('ips_hll', sa.LargeBinary),
+    sa.column('updated_at', sa.DateTime),
+)
+
+
+def _kst_day(created_at):
+    return created_at.replace(tzinfo=timezone.utc).astimezone(KST).date()
+
+
+def _flush(bind, day, groups):
+    """groups: {path: [hits, users_hll, ips_hll]} — 하루치"""
+    if not groups:
+        return
+    now = datetime.utcnow()
+    bind.execute(_stats.insert(), [
+        {"day": day, "path": path, "hits": hits, "users_hll": users.to_bytes(),
+         "ips_hll": ips.to_bytes(), "updated_at": now}
+        for path, (hits, users, ips) in groups.items()
+    ])
+
+
+def upgrade():
+    """
+    3d1f8a6c2e47 이후 관리자 방문 통계는 visit_daily_stats 만 읽는다 → 그 이전 일자를 raw visits 로 채운다
+    - 대상: visit_daily_stats 에 가장 먼저 나오는 일자(writer 가 켜진 날) 이전 일자 전부
+      (비어 있으면 오늘 KST 이전 전부). writer 가 켜진 당일은 부분 집계일 수 있음
+      → 필요하면 /internal/cron/rebuild-visit-stats 로 그날만 다시 만든다
+    - created_at 순으로 스트리밍하며 하루치씩 집계해 insert (메모리 = 하루치 경로 수 × HLL 2개)
+    """
+    bind = op.get_bind()
+    first_day = bind.execute(sa.text("SELECT min(day) FROM visit_daily_stats")).scalar()
+    if first_day is None:
+        first_day = datetime.now(KST).date()
+    elif isinstance(first_day, str):
+        first_day = datetime.strptime(first_day, "%Y-%m-%d").date()
+    cutoff = (
+        datetime(first_day.year, first_day.month, first_day.day, tzinfo=KST)
+        .astimezone(timezone.utc).replace(tzinfo=None)
+    )
+
+    rows = bind.execution_options(stream_results=True, yield_per=5000).execute(
+        sa.text(
+            "SELECT user_id, ip, path, created_at, weight FROM visits "
+            "WHERE created_at < :cutoff ORDER BY created_at"
+        ),
+        {"cutoff": cutoff},
+    )
+    current_day, groups = None, {}
+    for user_id, ip, path, created_at, weight in rows:
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        day = _kst_day(created_at)
+        if day != current_day:
+            _flush(bind, current_day, groups)
+            current_day, groups = day, {}
+        g = groups.get(path)
+        if g is None:
+            g = groups[path] = [0, HyperLogLog(), HyperLogLog()]
+        g[0] += int(weight or 1)
+        g[1].add(user_id)
+        g[2].add(ip)
+    _flush(bind, current_day, groups)
+
+
+def downgrade():
+    # 집계 행은 raw visits 로 언제든 다시 만들 수 있고, writer 가 쓴 행과 구분할 수 없으므로 지우지 않는다
+    pass
@@ -6,6 +6,8 @@ from domain.models import Feedback, db
 from domain.schema import admin_visits_query_schema, admin_data_query_schema
 from routes.web.admin import admin_required
 from security.security import _safe_args
+from services.visit_pipeline import visit_pipeline_stats
+from services.visit_stats import daily_hits, summarize
 from utils.time_utils import _utcnow, KST
 from sqlalchemy import func, and_
 
@@ -55,6 +57,18 @@ def admin_analytics_data_visits():
     if pt_kst < pf_kst:
         pf_kst, pt_kst = pt_kst, pf_kst
 
+    days_span = (pt_kst.date() - pf_kst.date()).days + 1
+
+    # 사용자 필터가 없으면 일간 집계(visit_daily_stats)만 읽는다 — KST 일자 기준
+    if not ukey:
+        hits_by_day = daily_hits(pf_kst.date(), pt_kst.date(), path)
+        series = []
+        for i in range(days_span):
+            d_kst = (pf_kst + timedelta(days=i)).date()
+            series.append({"date": d_kst.strftime("%Y-%m-%d"), "count": hits_by_day.get(d_kst, 0)})
+        return jsonify({"series": series}), 200
+
+    # 사용자 필터: 집계에는 사용자별 분해가 없으므로 raw visits 로 fallback
     upper_kst = (pt_kst + timedelta(days=1)).replace(
         hour=0, minute=0, second=0, microsecond=0
     )
@@ -79,7 +93,7 @@ def admin_analytics_data_visits():
     rows = (
         db.session.query(
             func.date_trunc("day", Visit.created_at).label("d"),
-            func.count(Visit.id),
+            func.sum(Visit.weight),
         )
         .filter(and_(*v_filters))
         .group_by("d")
@@ -89,7 +103,6 @@ def admin_analytics_data_visits():
 
     utc_map = {r[0].date(): int(r[1]) for r in rows}
 
-    days_span = (pt_kst.date() - pf_kst.date()).days + 1
     series = []
     for i in range(days_span):
         d_kst = pf_kst + timedelta(days=i)
@@ -199,7 +212,7 @@ def admin_analytics_data_usage():
 @admin_required
 @nocache
 def admin_analytics_data():
-    from domain.models import RewriteLog, Visit, Feedback
+    from domain.models import RewriteLog, Feedback
     from sqlalchemy import and_, desc
 
     qsafe = _safe_args(admin_data_query_schema)
@@ -233,9 +246,8 @@ def admin_analytics_data():
     if q_user_id:
         rl_filters.append(RewriteLog.user_id == q_user_id)
 
-    v_filters = [Visit.created_at >= date_from_utc, Visit.created_at < date_to_utc]
-    if q_path:
-        v_filters.append(Visit.path == q_path)
+    # 방문 지표는 일간 집계(visit_daily_stats)에서: 기간 × 경로 행만 읽음
+    visit_summary = summarize(date_from_kst.date(), date_to_kst.date(), q_path)
 
     total_calls = (
             db.session.query(func.count(RewriteLog.id)).filter(*rl_filters).scalar() or 0
@@ -246,9 +258,7 @@ def admin_analytics_data():
             .scalar()
             or 0
     )
-    total_visits = (
-            db.session.query(func.count(Visit.id)).filter(*v_filters).scalar() or 0
-    )
+    total_visits = visit_summary["hits"]
 
     success_calls = (
             db.session.query(func.count(RewriteLog.id))
@@ -281,16 +291,10 @@ def admin_analytics_data():
     week_start_kst = today_start_kst - timedelta(days=6)
     month_start_kst = today_start_kst.replace(day=1)
 
+    kpi_hits = daily_hits(min(week_start_kst, month_start_kst).date(), today_start_kst.date())
+
     def count_visits(kst_start, kst_end_exclusive):
-        return (
-                db.session.query(func.count(Visit.id))
-                .filter(
-                    Visit.created_at >= kst_start.astimezone(timezone.utc),
-                    Visit.created_at < kst_end_exclusive.astimezone(timezone.utc),
-                )
-                .scalar()
-                or 0
-        )
+        return sum(c for d, c in kpi_hits.items() if kst_start.date() <= d < kst_end_exclusive.date())
 
     kpi_today = count_visits(today_start_kst, tomorrow_start_kst)
     kpi_this_week = count_visits(week_start_kst, tomorrow_start_kst)
@@ -313,15 +317,8 @@ def admin_analytics_data():
         d_kst = (date_from_kst + timedelta(days=i)).date()
         trends.append({"date": d_kst.strftime("%Y-%m-%d"), "count": by_day_map.get(d_kst, 0)})
 
-    top_paths_rows = (
-        db.session.query(Visit.path, func.count(Visit.id))
-        .filter(*v_filters)
-        .group_by(Visit.path)
-        .order_by(func.count(Visit.id).desc())
-        .limit(10)
-        .all()
-    )
-    top_paths = [{"path": p, "count": int(c)} for (p, c) in (top_paths_rows or [])]
+    top_paths_rows = sorted(visit_summary["by_path"].items(), key=lambda x: -x[1])[:10]
+    top_paths = [{"path": p, "count": int(c)} for (p, c) in top_paths_rows]
 
     top_users_rows = (
         db.session.query(RewriteLog.user_id, func.count(RewriteLog.id))
@@ -363,15 +360,9 @@ def admin_analytics_data():
         [{"name": k, "count": v} for k, v in tone_count.items()], key=lambda x: -x["count"]
     )[:10]
 
-    all_paths_rows = (
-        db.session.query(Visit.path, func.count(Visit.id))
-        .filter(Visit.created_at >= date_from_utc, Visit.created_at < date_to_utc)
-        .group_by(Visit.path)
-        .order_by(func.count(Visit.id).desc())
-        .limit(50)
-        .all()
-    )
-    paths_all = [p for (p, _c) in (all_paths_rows or [])]
+    all_paths = visit_summary if not q_path else summarize(date_from_kst.date(), date_to_kst.date())
+    all_paths_rows = sorted(all_paths["by_path"].items(), key=lambda x: -x[1])[:50]
+    paths_all = [p for (p, _c) in all_paths_rows]
 
     users_sample_rows = (
         db.session.query(RewriteLog.user_id, func.count(RewriteLog.id))
@@ -398,6 +389,8 @@ def admin_analytics_data():
                 "total_calls": int(total_calls),
                 "unique_users": int(unique_users),
                 "total_visits": int(total_visits),
+                "unique_visitors": visit_summary["unique_users"],
+                "unique_ips": visit_summary["unique_ips"],
                 "success_rate": round(success_rate, 2),
                 "error_rate": round(error_rate, 2),
                 "feedback_count": int(feedback_count),
@@ -406,6 +399,7 @@ def admin_analytics_data():
             "trends": trends,
             "top_paths": top_paths,
             "top_users": top_users,
+            "visit_pipeline": visit_pipeline_stats(),
             "distros": {"length": length_dist, "categories": top_categories, "tones": top_tones},
             "filters": {"paths": paths_all, "users": users_all},
         }
@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 from utils.time_utils import KST, _compute_anchor_day
 from utils.billing_dates import next_billing_kst, to_utc_naive
 
-from auth.entitlements import get_current_user
+from auth.entitlements import get_current_user, invalidate_entitlement
 from utils.idempo import _new_idempo
 
 from services.nicepay import (
@@ -146,6 +146,7 @@ def nicepay_subscribe_complete():
                 sub_row.next_billing_at = next_utc
 
             db.session.commit()
+            invalidate_entitlement(user.user_id)
 
             return jsonify({"ok": True, "status": "subscribed_no_charge", "orderId": order_id}), 200
         except Exception as e:
@@ -209,6 +210,7 @@ def nicepay_subscribe_complete():
         sub_row.last_failed_at = None
 
         db.session.commit()
+        invalidate_entitlement(user.user_id)
 
         return jsonify({"ok": True, "status": "subscribed", "orderId": order_id}), 200
 
@@ -236,6 +238,7 @@ def nicepay_subscribe_complete():
                         pm_row.status = "inactive"
 
             db.session.commit()
+            invalidate_entitlement(user.user_id)
         except Exception as e2:
             db.session.rollback()
             return jsonify({"ok": False, "error": "first_payment_failed_and_db_failed", "message": f"{e} / {e2}"}), 500
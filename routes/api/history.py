@@ -1,16 +1,75 @@
-from flask import jsonify, Blueprint, request
+import hashlib
+
+from flask import jsonify, Blueprint, request, current_app, make_response
+from sqlalchemy import func
 
 from auth.entitlements import get_current_user
 from auth.guards import resolve_tier
 from core.extensions import csrf
 from domain.models import RewriteLog
+from services.history import (
+    decode_cursor,
+    encode_cursor,
+    head_cursor,
+    history_query,
+    history_since_query,
+)
 
 api_history_bp = Blueprint("api_history", __name__)
 
+# fields= 로 고를 수 있는 항목 → 컬럼. *_preview 는 DB 에서 앞부분만 잘라 읽는다(본문 전체를 가져오지 않음)
+_FIELD_COLUMNS = {
+    "id": lambda n: RewriteLog.id,
+    "created_at": lambda n: RewriteLog.created_at,
+    "input_text": lambda n: RewriteLog.input_text,
+    "output_text": lambda n: RewriteLog.output_text,
+    "input_preview": lambda n: func.substr(RewriteLog.input_text, 1, n + 1),
+    "output_preview": lambda n: func.substr(RewriteLog.output_text, 1, n + 1),
+    "categories": lambda n: RewriteLog.categories,
+    "tones": lambda n: RewriteLog.tones,
+    "model": lambda n: RewriteLog.model_name,
+}
+# fields 미지정 시 기존 응답 형태 그대로 (구버전 확장 호환)
+_DEFAULT_FIELDS = ("id", "created_at", "input_text", "output_text", "categories", "tones", "model")
+
+
+def _parse_fields(raw):
+    if not raw:
+        return _DEFAULT_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    if not fields or any(f not in _FIELD_COLUMNS for f in fields):
+        return None
+    # cursor 계산에 필요
+    return fields if "id" in fields and "created_at" in fields else tuple(dict.fromkeys(("id", "created_at") + fields))
+
+
+def _item(row, fields, preview_chars):
+    item = {}
+    for f in fields:
+        v = getattr(row, f)
+        if f == "created_at":
+            v = v.isoformat() if v else None
+        elif f.endswith("_preview"):
+            v = v or ""
+            item[f"{f}_truncated"] = len(v) > preview_chars
+            v = v[:preview_chars]
+        item[f] = v
+    return item
+
+
 # 크롬 확장 팝업에서 사용
 @csrf.exempt
 @api_history_bp.route("/api/history", methods=["GET"])
 def api_history():
+    """
+    최근 기록 목록
+    - limit: 1~100 (기본 20)
+    - before=<cursor>: 그보다 오래된 기록 (다음 페이지) / since=<cursor>: 그 이후 새 기록만 (증분 동기화)
+    - fields=id,created_at,output_preview,...: 필요한 항목만 (미지정 시 전체 본문 포함 기존 형태)
+    - 응답: items, cursor(가장 최근 기록 → 다음 since 에 사용), next_cursor(더 오래된 기록이 있으면)
+      since 결과가 limit 를 넘으면 has_more=true → 클라이언트는 since 없이 다시 받는다
+    - ETag: 최신 기록 + 요청 파라미터 기준. 바뀐 게 없으면 본문 없이 304
+    """
     user = get_current_user()
     if not user:
         return jsonify({"error": "login_required"}), 401
@@ -21,18 +80,73 @@ def api_history():
         limit = max(1, min(int(request.args.get("limit", 20)), 100))
     except Exception:
         limit = 20
-    rows = (
-        RewriteLog.query.filter_by(user_id=user.user_id)
-        .order_by(RewriteLog.created_at.desc())
-        .limit(limit).all()
-    )
-    items = [{
+
+    fields = _parse_fields(request.args.get("fields"))
+    if fields is None:
+        return jsonify({"error": "invalid_fields", "allowed": sorted(_FIELD_COLUMNS)}), 400
+
+    before = since = None
+    if request.args.get("before"):
+        before = decode_cursor(request.args["before"])
+        if before is None:
+            return jsonify({"error": "invalid_cursor"}), 400
+    if request.args.get("since"):
+        since = decode_cursor(request.args["since"])
+        if since is None:
+            return jsonify({"error": "invalid_cursor"}), 400
+
+    # 기록은 추가만 되므로 최신 행이 같으면 같은 요청의 응답도 같다 → 본문 컬럼을 읽기 전에 304 판정
+    head = head_cursor(user.user_id)
+    etag_src = "|".join((user.user_id, head or "", str(limit), ",".join(fields), request.args.get("before", ""),
+                         request.args.get("since", "")))
+    etag = hashlib.sha1(etag_src.encode("utf-8")).hexdigest()
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp
+
+    preview_chars = int(current_app.config.get("HISTORY_PREVIEW_CHARS", 120))
+    q = history_since_query(user.user_id, since) if since else history_query(user.user_id, before)
+    q = q.with_entities(*(_FIELD_COLUMNS[f](preview_chars).label(f) for f in fields))
+    rows = q.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    payload = {"items": [_item(r, fields, preview_chars) for r in rows], "cursor": head}
+    if since:
+        payload["has_more"] = has_more
+    else:
+        last = rows[-1] if rows else None
+        payload["next_cursor"] = encode_cursor(last.created_at, last.id) if has_more else None
+
+    resp = jsonify(payload)
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+@csrf.exempt
+@api_history_bp.route("/api/history/<int:log_id>", methods=["GET"])
+def api_history_detail(log_id):
+    """목록의 미리보기에서 펼칠 때 한 건의 전체 본문"""
+    user = get_current_user()
+    if not user:
+        return jsonify({"error": "login_required"}), 401
+    if resolve_tier() != "pro":
+        return jsonify({"error": "pro_required"}), 403
+    r = RewriteLog.query.filter_by(id=log_id, user_id=user.user_id).first()
+    if r is None:
+        return jsonify({"error": "not_found"}), 404
+    resp = jsonify({
         "id": r.id,
         "created_at": r.created_at.isoformat() if r.created_at else None,
         "input_text": r.input_text,
         "output_text": r.output_text,
         "categories": r.categories,
         "tones": r.tones,
-        "model": r.model_name
-    } for r in rows]
-    return jsonify({"items": items}), 200
\ No newline at end of file
+        "model": r.model_name,
+    })
+    # 기록은 수정되지 않으므로 브라우저 캐시에 둬도 된다
+    resp.headers["Cache-Control"] = "private, max-age=86400"
+    return resp
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from flask import Blueprint, jsonify, request, current_app
 from sqlalchemy.exc import IntegrityError
 
+from auth.entitlements import invalidate_entitlement
+from auth.quota_backend import flush_quota_counters
 from core.extensions import csrf
 from domain.models import db, Subscription, PaymentMethod, Payment
 from services.account_delete import purge_expired_accounts
+from services.visit_stats import rebuild_daily_stats
 from services.nicepay import nicepay_subscribe_pay, new_order_id
 from utils.billing_dates import next_billing_kst, to_utc_naive
 from utils.time_utils import KST
@@ -155,6 +158,7 @@ def cron_bill_due():
 
                 db.session.add(sub)
 
+            invalidate_entitlement(sub.user_id)
             charged += 1
 
         except Exception as e:
@@ -181,6 +185,7 @@ def cron_bill_due():
 
                 db.session.add(sub)
 
+            invalidate_entitlement(sub.user_id)
             failed += 1
             continue
 
@@ -212,4 +217,61 @@ def cron_purge_accounts():
 
     # 기본은 100개씩 처리 (필요 시 조정)
     result = purge_expired_accounts(limit=200)
-    return jsonify(result), 200
\ No newline at end of file
+    return jsonify(result), 200
+
+
+# Redis quota 카운터 → usage / guest_usage write-behind
+@api_internal_cron_bp.route("/internal/cron/flush-quota", methods=["POST"])
+@csrf.exempt
+def cron_flush_quota():
+    """
+    QUOTA_BACKEND=redis 일 때 dirty 카운터를 Postgres 로 반영 (1~5분 주기 권장).
+    헤더: Authorization: Bearer <CRON_SECRET>
+    """
+    auth = (request.headers.get("Authorization") or "").strip()
+    expected = os.getenv("CRON_SECRET", "")
+
+    if not expected or auth != f"Bearer {expected}":
+        return jsonify({"ok": False, "error": "unauthorized"}), 401
+
+    total = 0
+    result = {"ok": True, "flushed": 0}
+    # 한 번 호출에 최대 20 배치까지 비움
+    for _ in range(20):
+        result = flush_quota_counters(batch=500)
+        if not result.get("ok") or not result.get("flushed"):
+            break
+        total += result["flushed"]
+
+    return jsonify({**result, "flushed": total}), (200 if result.get("ok") else 503)
+
+
+# raw visits → visit_daily_stats 재집계 (도입 시 과거분 backfill / 보정)
+@api_internal_cron_bp.route("/internal/cron/rebuild-visit-stats", methods=["POST"])
+@csrf.exempt
+def cron_rebuild_visit_stats():
+    """
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD (KST, 기본: 어제 하루)
+    헤더: Authorization: Bearer <CRON_SECRET>
+    """
+    auth = (request.headers.get("Authorization") or "").strip()
+    expected = os.getenv("CRON_SECRET", "")
+
+    if not expected or auth != f"Bearer {expected}":
+        return jsonify({"ok": False, "error": "unauthorized"}), 401
+
+    yesterday = (datetime.now(KST) - timedelta(days=1)).date()
+    try:
+        d_from = date.fromisoformat(request.args.get("from") or yesterday.isoformat())
+        d_to = date.fromisoformat(request.args.get("to") or d_from.isoformat())
+    except ValueError:
+        return jsonify({"ok": False, "error": "bad_date"}), 400
+    if d_to < d_from:
+        d_from, d_to = d_to, d_from
+
+    try:
+        result = rebuild_daily_stats(d_from, d_to)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"ok": False, "error": "rebuild_failed", "message": str(e)}), 500
+    return jsonify(result), 200
@@ -5,7 +5,7 @@ from flask import Blueprint, current_app, jsonify, request, url_for, redirect
 
 from core.extensions import csrf
 from domain.models import db, Payment, PaymentMethod, Subscription
-from auth.entitlements import get_current_user
+from auth.entitlements import get_current_user, invalidate_entitlement
 from utils.idempo import _new_idempo
 from routes.api.payments_guard import require_payments_enabled
 from services.nicepay import nicepay_approve_payment, nicepay_regist_billing_key
@@ -343,4 +343,5 @@ def nicepay_subscribe_return():
     p.raw_response = issued
 
     db.session.commit()
+    invalidate_entitlement(user_id)
     return redirect(url_for("subscribe.subscribe_checkout_complete", bid=bid))
@@ -7,8 +7,11 @@ from flask import Blueprint, jsonify, g, request
 from auth.entitlements import get_current_user
 from auth.guards import require_feature, outputs_for_tier, resolve_tier
 from auth.quota import enforce_quota
+from flask_limiter.util import get_remote_address
 from core.extensions import csrf, limiter
+from core.rate_limit import rate_limit_key
 from core.http_utils import _sleep_floor
+from core.log import get_logger
 from domain.schema import api_polish_schema
 from security.security import require_safe_input
 
@@ -16,10 +19,12 @@ from services.ai.output_postprocess import _ensure_exact_count
 from services.ai.router import _get_ai_outputs
 
 api_polish_bp = Blueprint("api_polish", __name__)
+log = get_logger("polish")
 
 
 @csrf.exempt
-@limiter.limit("60/minute")
+@limiter.limit("60/minute", key_func=rate_limit_key)  # 사용자/게스트 단위
+@limiter.limit("300/minute", key_func=get_remote_address)  # IP 단위(쿠키 재발급 우회 방지)
 @api_polish_bp.route("/api/polish", methods=["POST"])
 @require_safe_input(api_polish_schema, form=False, for_llm_fields=["input_text"])
 @require_feature("rewrite.single")   # 기능 권한
@@ -55,9 +60,9 @@ def api_polish():
         context_source = (data.get("context_source") or "").strip()
         context_label = (data.get("context_label") or "").strip()
 
-        # (옵션) 로깅: 민감정보는 절대 찍지 말 것
+        # 로깅: 민감정보(입력 원문)는 절대 찍지 말 것 — 길이만
         uid = getattr(user, "user_id", None) if user else None
-        print("[POLISH] uid=", uid, "tier=", tier, "scope=rewrite", "provider=", provider)
+        log.info("polish", extra={"uid": uid, "tier": tier, "provider": provider, "input_len": len(input_text)})
 
         # 입력 검증
         if not input_text:
@@ -99,6 +104,6 @@ def api_polish():
         return jsonify({"outputs": outputs, "output_text": outputs[0]}), 200
 
     except Exception as e:
-        print("[POLISH][ERROR]", type(e).__name__, str(e))
+        log.exception("polish_failed", extra={"error_type": type(e).__name__})
         _sleep_floor(start_t)
         return jsonify({"error": "polish_failed", "message": "순화 처리 중 오류가 발생했습니다."}), 500
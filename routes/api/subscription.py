@@ -4,7 +4,7 @@ from core.extensions import csrf
 from domain.models import db
 from datetime import datetime
 
-from auth.entitlements import get_current_user
+from auth.entitlements import get_current_user, invalidate_entitlement
 from domain.models import Subscription
 
 api_subscription_bp = Blueprint("api_subscription", __name__)
@@ -34,5 +34,6 @@ def cancel_subscription_at_period_end():
         sub.cancel_at_period_end = True
         # 즉시 해지가 아니므로 status는 유지(active/past_due)
         # canceled_at은 주기 종료 시점에 찍는 것이 정합성에 맞음
+    invalidate_entitlement(user.user_id)
 
     return jsonify({"ok": True, "cancel_at_period_end": True}), 200
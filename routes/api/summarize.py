@@ -1,20 +1,25 @@
 from flask import jsonify, request, session, Blueprint, g
 
-from auth.guards import require_feature, enforce_quota
+from auth.guards import require_feature
+from auth.quota import enforce_quota
+from flask_limiter.util import get_remote_address
 from core.extensions import csrf, limiter
+from core.rate_limit import rate_limit_key
 import json, os
 
 from core.hooks import origin_allowed
-from domain.models import RewriteLog, db, User
+from auth.entitlements import get_user_by_id
+from domain.models import RewriteLog, db
 from routes.web.summerize import _call_provider_summarize
 
 api_summarize_bp = Blueprint("api_summarize", __name__)
 
 @csrf.exempt
-@limiter.limit("60/minute")
+@limiter.limit("60/minute", key_func=rate_limit_key)  # 사용자/게스트 단위
+@limiter.limit("300/minute", key_func=get_remote_address)  # IP 단위(쿠키 재발급 우회 방지)
+@api_summarize_bp.route("/api/summarize", methods=["POST"])
 @require_feature("summarize")
 @enforce_quota("summarize")
-@api_summarize_bp.route("/api/summarize", methods=["POST"])
 def api_summarize():
     # 1) Origin 검사(있다면)
     if not origin_allowed():
@@ -57,7 +62,7 @@ def api_summarize():
             request_ip=request.remote_addr,
         )
         if uid:
-            u = User.query.filter_by(user_id=uid).first()
+            u = get_user_by_id(uid)
             if u: log.user_pk = u.id
         db.session.add(log);
         db.session.commit()
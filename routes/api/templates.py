@@ -1,7 +1,9 @@
 from flask import request, Blueprint
 from auth.entitlements import get_current_user, load_current_user
 from auth.guards import resolve_tier
+from flask_limiter.util import get_remote_address
 from core.extensions import csrf, limiter
+from core.rate_limit import rate_limit_key
 from core.hooks import origin_allowed
 from core.http_utils import _json_err, _json_ok
 from domain.models import UserTemplate, db
@@ -10,7 +12,8 @@ api_user_templates_bp = Blueprint("api_user_templates", __name__)
 
 
 @csrf.exempt
-@limiter.limit("60/minute")
+@limiter.limit("60/minute", key_func=rate_limit_key)  # 사용자/게스트 단위
+@limiter.limit("300/minute", key_func=get_remote_address)  # IP 단위(쿠키 재발급 우회 방지)
 @api_user_templates_bp.route("/api/user_templates", methods=["GET", "POST"])
 def api_user_templates():
     # 제거
@@ -67,7 +70,8 @@ def api_user_templates():
 
 
 @csrf.exempt
-@limiter.limit("60/minute")
+@limiter.limit("60/minute", key_func=rate_limit_key)  # 사용자/게스트 단위
+@limiter.limit("300/minute", key_func=get_remote_address)  # IP 단위(쿠키 재발급 우회 방지)
 @api_user_templates_bp.route("/api/user_templates/<int:tpl_id>", methods=["DELETE"])
 def api_user_templates_delete(tpl_id):
     # 제거
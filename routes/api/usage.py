@@ -1,9 +1,13 @@
+import logging
+
 from flask import session, Blueprint, make_response, jsonify, request
 
+from auth.quota_backend import quota_key, quota_redis, redis_used
 from cookie.cookie import set_guest_cookie, ensure_guest_cookie
 from core.extensions import csrf
 from core.hooks import origin_allowed
 from core.http_utils import nocache
+from core.log import get_logger
 from domain.models import db, Usage, GuestUsage as GuestUsage
 from domain.policies import LIMITS
 from domain.schema import USAGE_SCOPES
@@ -15,6 +19,7 @@ from sqlalchemy import func
 from auth.guards import resolve_tier
 
 api_usage_bp = Blueprint("api_usage", __name__)
+log = get_logger("usage")
 
 
 @csrf.exempt
@@ -26,16 +31,16 @@ def api_usage_status():
     - 로그인: 월간 window + scope
     - 게스트: 일간 window + scope
     """
-    # 디버그 출력(필요하면 유지, 나중에 제거 가능)
-    print("[USAGE][HEADERS] Origin=", request.headers.get("Origin"))
-    print(
-        "[USAGE][HEADERS] Host=",
-        request.headers.get("Host"),
-        "XFH=",
-        request.headers.get("X-Forwarded-Host"),
-        "XFP=",
-        request.headers.get("X-Forwarded-Proto"),
-    )
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "usage_headers",
+            extra={
+                "origin": request.headers.get("Origin"),
+                "host": request.headers.get("Host"),
+                "xfh": request.headers.get("X-Forwarded-Host"),
+                "xfp": request.headers.get("X-Forwarded-Proto"),
+            },
+        )
 
     def _json_resp(payload, set_aid=None, status=200):
         resp = make_response(jsonify(payload), status)
@@ -74,22 +79,26 @@ def api_usage_status():
             now = _utcnow()
             month_start, month_end = _month_window(now)
 
-            used = (
-                db.session.query(func.coalesce(func.sum(Usage.count), 0))
-                .filter(
-                    Usage.user_id == uid,
-                    Usage.tier == tier,
-                    Usage.scope == scope,
-                    Usage.window_start >= month_start,
-                    Usage.window_start < month_end,
+            # Redis 백엔드면 실시간 카운터 우선 (usage 테이블은 write-behind 라 지연될 수 있음)
+            r = quota_redis()
+            used = redis_used(r, quota_key("u", tier, scope, month_start, uid)) if r is not None else None
+            if used is None:
+                used = (
+                    db.session.query(func.coalesce(func.sum(Usage.count), 0))
+                    .filter(
+                        Usage.user_id == uid,
+                        Usage.tier == tier,
+                        Usage.scope == scope,
+                        Usage.window_start >= month_start,
+                        Usage.window_start < month_end,
+                    )
+                    .scalar()
                 )
-                .scalar()
-            )
 
-            print("[USAGE] uid=", uid, "tier=", tier, "scope=", scope, "used=", int(used or 0), "limit=", int(limit))
+            log.debug("usage", extra={"uid": uid, "tier": tier, "scope": scope, "used": int(used or 0), "limit": int(limit)})
             return _json_resp({"used": int(used or 0), "limit": int(limit), "tier": tier, "scope": scope})
         except Exception as e:
-            print("[USAGE][ERROR]", repr(e))
+            log.error("usage_error", extra={"error": repr(e)})
             return _json_resp({"used": 0, "limit": LIMITS["free"]["monthly"], "tier": "free", "scope": scope})
 
     # ----- 게스트 -----
@@ -101,21 +110,24 @@ def api_usage_status():
         now = _utcnow()
         day_start, day_end = _day_window(now)
 
-        used = (
-            db.session.query(func.coalesce(func.sum(GuestUsage.count), 0))
-            .filter(
-                GuestUsage.guest_key == aid,
-                GuestUsage.scope == scope,
-                GuestUsage.window_start >= day_start,
-                GuestUsage.window_start < day_end,
+        r = quota_redis()
+        used = redis_used(r, quota_key("g", "guest", scope, day_start, aid)) if r is not None else None
+        if used is None:
+            used = (
+                db.session.query(func.coalesce(func.sum(GuestUsage.count), 0))
+                .filter(
+                    GuestUsage.guest_key == aid,
+                    GuestUsage.scope == scope,
+                    GuestUsage.window_start >= day_start,
+                    GuestUsage.window_start < day_end,
+                )
+                .scalar()
             )
-            .scalar()
-        )
 
         return _json_resp(
             {"used": int(used or 0), "limit": int(limit), "tier": tier, "scope": scope},
             set_aid=aid if need_set else None,
         )
     except Exception as e:
-        print("[USAGE][GUEST_ERROR]", repr(e))
+        log.error("usage_guest_error", extra={"error": repr(e)})
         return _json_resp({"used": 0, "limit": LIMITS["guest"]["daily"], "tier": "guest", "scope": scope})
@@ -6,13 +6,12 @@ from core.http_utils import nocache
 from datetime import datetime, timedelta, timezone
 from domain.models import Feedback, db
 from domain.schema import admin_visits_query_schema, admin_data_query_schema
-from security.security import _safe_args
+from security.security import _safe_args, schema_error
 from utils.time_utils import _utcnow, KST
 from sqlalchemy import func, and_
 
 # ===== 관리자 GET 쿼리 검증 헬퍼 =====
 import json
-from jsonschema import validate as _jsonschema_validate, ValidationError as _JsErr
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -169,10 +168,9 @@ def safe_args(schema, *, source=None):
     for k, v in list(q.items()):
         if isinstance(v, str) and v.strip() == "":
             q[k] = None
-    try:
-        _jsonschema_validate(instance=q, schema=schema)
-    except _JsErr as e:
-        abort(400, description=f"유효하지 않은 쿼리: {e.message}")
+    error = schema_error(q, schema)
+    if error is not None:
+        abort(400, description=f"유효하지 않은 쿼리: {error.message}")
     return q
 
 
@@ -50,6 +50,7 @@ def login_page():
 @auth_bp.route("/logout")
 def logout():
     session.pop("user", None)
+    session.pop("claims", None)
     return redirect("/")
 
 
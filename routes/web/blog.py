@@ -1,6 +1,8 @@
-from flask import Blueprint, render_template, abort, request
+from flask import Blueprint, abort, request
 from flask_babel import get_locale
 
+from services.page_cache import render_content_page
+
 blog_bp = Blueprint("blog", __name__)
 
 # 언어별 포스트 데이터: 총 10개 (ko 10 / en 10)
@@ -1026,18 +1028,20 @@ def _lang():
     return "en" if loc.startswith("en") else "ko"
 
 
+# 언어별 slug → post 인덱스 (import 시 1회)
+POST_INDEX = {lang: {p["slug"]: p for p in posts} for lang, posts in POSTS.items()}
+
+
 def _find_post(lang, slug):
-    for p in POSTS.get(lang, []):
-        if p["slug"] == slug:
-            return p
-    return None
+    return POST_INDEX.get(lang, {}).get(slug)
 
 
 @blog_bp.route("/blog")
 @blog_bp.route("/en/blog")
 def blog_index():
     lang = _lang()
-    return render_template(
+    return render_content_page(
+        ("blog.index",),
         "blog/index.html",
         posts=POSTS.get(lang, []),
         lang=lang,
@@ -1052,7 +1056,8 @@ def blog_post(slug):
     if not post:
         abort(404)
 
-    return render_template(
+    return render_content_page(
+        ("blog.post", slug),
         "blog/post.html",
         post=post,
         lang=lang,
@@ -1,18 +1,65 @@
-from flask import render_template, Blueprint, session, redirect, url_for
-from domain.models import RewriteLog
+from flask import render_template, Blueprint, session, redirect, url_for, request, current_app
+
+from auth.guards import feature_allowed, resolve_tier
+from core.http_utils import nocache, _json_ok, _json_err
+from services.history import history_page, decode_cursor
 
 history_bp = Blueprint("history", __name__)
 
 
+def _page_size() -> int:
+    return int(current_app.config.get("HISTORY_PAGE_SIZE", 30))
+
+
+def _search_args():
+    """(검색어, fuzzy, 검색 허용 여부) — 기록 검색은 Pro 기능(history.search)"""
+    can_search = feature_allowed(resolve_tier(), "history.search")
+    q = (request.args.get("q") or "").strip() if can_search else ""
+    return q, bool(q) and request.args.get("fuzzy") == "1", can_search
+
+
+def _item(r) -> dict:
+    return {
+        "id": r.id,
+        "created_at": r.created_at.strftime("%Y-%m-%d %H:%M") if r.created_at else "",
+        "input_text": r.input_text,
+        "output_text": r.output_text or "",
+        "categories": r.categories or [],
+        "tones": r.tones or [],
+        "honorific": bool(r.honorific),
+        "opener": bool(r.opener),
+        "emoji": bool(r.emoji),
+    }
+
+
 @history_bp.route("/history")
 def user_history():
     user = session.get("user")
     if not user:
         return redirect(url_for("auth.login_page"))
-    user_id = user.get("user_id")
-    logs = (
-        RewriteLog.query.filter_by(user_id=user_id)
-        .order_by(RewriteLog.created_at.desc())
-        .all()
+    q, fuzzy, can_search = _search_args()
+    # 첫 페이지만 서버 렌더, 이후는 static/js/history.js 가 /history/page 로 이어서 불러온다
+    logs, next_cursor = history_page(user.get("user_id"), _page_size(), search=q, fuzzy=fuzzy)
+    return render_template(
+        "history.html",
+        logs=logs,
+        next_cursor=next_cursor,
+        user=user,
+        q=q,
+        fuzzy=fuzzy,
+        can_search=can_search,
     )
-    return render_template("history.html", logs=logs, user=user)
\ No newline at end of file
+
+
+@history_bp.route("/history/page", methods=["GET"])
+@nocache
+def user_history_page():
+    user = session.get("user")
+    if not user:
+        return _json_err("login_required", status=401)
+    before = decode_cursor(request.args.get("cursor") or "")
+    if before is None:
+        return _json_err("invalid_cursor", status=400)
+    q, fuzzy, _can_search = _search_args()
+    logs, next_cursor = history_page(user.get("user_id"), _page_size(), before=before, search=q, fuzzy=fuzzy)
+    return _json_ok({"items": [_item(r) for r in logs], "next_cursor": next_cursor})
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from flask import Blueprint, render_template, abort, request
+import threading
+from types import MappingProxyType
+
+from flask import Blueprint, abort, current_app, request
+from flask_babel import LazyString, force_locale, get_locale
 from flask_babel import lazy_gettext as _
 
+from services.page_cache import render_content_page
+
 learn_bp = Blueprint("learn", __name__)
 
 # ============================================================
@@ -218,25 +224,70 @@ def _build_index():
     return nav, slug_map
 
 
-# IMPORTANT: keep these names for external imports (sitemap.py expects SLUG_MAP)
+# IMPORTANT: keep these names for external imports (lazy 문자열 그대로의 원본 인덱스)
 NAV, SLUG_MAP = _build_index()
 
+# slug 는 번역하지 않으므로 locale 과 무관 (sitemap / freeze 가 사용)
+LEARN_SLUGS = tuple(sorted(SLUG_MAP))
+
+
+# ============================================================
+#  locale 별 번역 완료 모델
+#   - 최초 사용 시 force_locale 로 lazy_gettext 를 전부 평가해 str 로 고정
+#   - dict → MappingProxyType / list → tuple (요청 간 공유하므로 읽기 전용)
+# ============================================================
+_models: dict = {}
+_models_lock = threading.Lock()
+
+
+def _freeze(value):
+    if isinstance(value, LazyString):
+        return str(value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _current_learn_locale() -> str:
+    supported = current_app.config.get("LANGUAGES", ["ko", "en"])
+    loc = str(get_locale() or "")
+    return loc if loc in supported else supported[0]
+
+
+def learn_model(locale: str | None = None):
+    """(nav, slug_map) — locale 별 번역 완료/읽기 전용 모델 (워커당 locale 마다 1회 생성)"""
+    locale = locale or _current_learn_locale()
+    model = _models.get(locale)
+    if model is None:
+        with _models_lock:
+            model = _models.get(locale)
+            if model is None:
+                with force_locale(locale):
+                    model = (_freeze(NAV), _freeze(SLUG_MAP))
+                _models[locale] = model
+    return model
+
 
 @learn_bp.route("/learn")
 def learn_index():
     section_key = request.args.get("section")
-    return render_template("learn/index.html", nav=NAV, active_section_key=section_key)
+    nav, _slug_map = learn_model()
+    return render_content_page(("learn.index",), "learn/index.html", nav=nav, active_section_key=section_key)
 
 
 @learn_bp.route("/learn/<slug>")
 def learn_page(slug: str):
-    page = SLUG_MAP.get(slug)
+    nav, slug_map = learn_model()
+    page = slug_map.get(slug)
     if not page:
         abort(404)
 
-    return render_template(
+    return render_content_page(
+        ("learn.page", slug),
         "learn/page.html",
-        nav=NAV,
+        nav=nav,
         page=page,
         active_section_key=page.get("section_key"),
     )
@@ -1,9 +1,12 @@
 from flask import session, redirect, render_template, url_for, Blueprint, request, flash
 
+from auth.entitlements import get_user_by_id
 from auth.guards import resolve_tier
+from auth.quota_backend import quota_key, quota_redis, redis_used
 from core.extensions import csrf
 from domain.models import db, User, Usage, Subscription, Visit, Payment, Feedback
 from domain.policies import LIMITS
+from domain.schema import USAGE_SCOPES
 from utils.time_utils import _month_window, _utcnow
 from sqlalchemy import func
 import re
@@ -20,7 +23,7 @@ def mypage_overview():
     if not uid:
         return redirect(url_for("auth.login_page") + "?next=/mypage")
 
-    user = User.query.filter_by(user_id=uid).first()
+    user = get_user_by_id(uid)
     session["user"]["display_name"] = user.display_name or (user.email.split("@", 1)[0] if user.email else None)
     if not user:
         return redirect(url_for("auth.login_page"))
@@ -43,6 +46,13 @@ def mypage_overview():
             .scalar()
             or 0
     )
+
+    # Redis 백엔드면 실시간 카운터로 보정 (usage 테이블은 write-behind)
+    r = quota_redis()
+    if r is not None:
+        live = [redis_used(r, quota_key("u", tier, sc, month_start, uid)) for sc in USAGE_SCOPES]
+        if all(v is not None for v in live):
+            used = sum(live)
     remaining = max(0, (limit or 0) - int(used))
 
     visits = (
@@ -94,7 +104,7 @@ def mypage_update_job():
     if not uid:
         return redirect(url_for("auth.login_page") + "?next=/mypage")
 
-    user = User.query.filter_by(user_id=uid).first()
+    user = get_user_by_id(uid)
     if not user:
         return redirect(url_for("auth.login_page"))
 
@@ -110,8 +120,6 @@ def mypage_update_job():
         flash("직업 설명은 100자 이내로 입력해주세요.", "error")
         return redirect(url_for("mypage.mypage_overview"))
 
-    print(user_job, user_job_detail)
-
     # 사용자가 입력한 직업과 직업 설명을 db 저장 시키기
     user.user_job = user_job or None
     user.user_job_detail = user_job_detail or None
@@ -130,7 +138,7 @@ def mypage_delete_job():
     if not uid:
         return redirect(url_for("auth.login_page") + "?next=/mypage")
 
-    user = User.query.filter_by(user_id=uid).first()
+    user = get_user_by_id(uid)
     if not user:
         return redirect(url_for("auth.login_page"))
 
@@ -161,7 +169,7 @@ def mypage_update_nickname():
     if not uid:
         return redirect("/login")
 
-    user = User.query.filter_by(user_id=uid).first()
+    user = get_user_by_id(uid)
     if not user:
         return redirect("/login")
 
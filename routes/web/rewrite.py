@@ -1,9 +1,12 @@
 # routes/rewrite.py
 from flask import Blueprint, request, jsonify, g, render_template, session
-from auth.guards import require_feature, enforce_quota, outputs_for_tier, resolve_tier
+from auth.guards import require_feature, outputs_for_tier, resolve_tier
+from auth.quota import enforce_quota
 from domain.schema import polish_input_schema
-from domain.models import User
+from auth.entitlements import get_user_by_id
 from security.security import require_safe_input
+from core.log import get_logger
+from services.page_cache import anonymous_page_cache
 
 import os
 
@@ -11,11 +14,13 @@ from services.ai.output_postprocess import _ensure_exact_count
 from services.ai.router import _get_ai_outputs
 
 mainpage_bp = Blueprint("rewrite", __name__)
+log = get_logger("rewrite")
 
 
 @mainpage_bp.route("/", methods=["GET", "POST"])
 @require_safe_input(polish_input_schema, form=True, for_llm_fields=["input_text"])
 @require_feature("rewrite.single")  # 비로그인: 기능 허용 검증
+@anonymous_page_cache()  # 비로그인 GET 만 (POST 는 그대로 생성)
 def polish():
     """
     메인 페이지 — 문장 다듬기 기능
@@ -30,13 +35,9 @@ def polish():
     emoji_checked = False
     provider_current = os.getenv("PROVIDER_DEFAULT")
 
-    # 로그인 사용자 직업 컨텍스트 (없으면 빈 문자열)
     sess = session.get("user") or {}
     uid = sess.get("user_id")
 
-    user = User.query.filter_by(user_id=uid).first() if uid else None
-    user_job = (user.user_job or "") if user else ""
-    user_job_detail = (user.user_job_detail or "") if user else ""
     if g.safe_input:
         data = g.safe_input
         input_text = (data.get("input_text") or "").strip()
@@ -53,7 +54,11 @@ def polish():
             provider_current = os.getenv("PROVIDER_DEFAULT")
 
         if input_text:
-            print(input_text)
+            log.info("rewrite_page", extra={"uid": uid, "provider": provider_current, "input_len": len(input_text)})
+            # 로그인 사용자 직업 컨텍스트 (없으면 빈 문자열) — 생성할 때만 User row 로드
+            user = get_user_by_id(uid)
+            user_job = (user.user_job or "") if user else ""
+            user_job_detail = (user.user_job_detail or "") if user else ""
             n_outputs = outputs_for_tier()
             outputs = _get_ai_outputs(
                 provider=provider_current,
@@ -93,7 +98,6 @@ def rewrite_single():
     if not text:
         return jsonify({"error": "empty_text"}), 400
     # === 실제 리라이트 로직 자리 ===
-    print("rewirte_single 에러")
     output = f"[single] refined: {text}"
     return jsonify({"ok": True, "output": output})
 
@@ -101,20 +105,17 @@ def rewrite_single():
 @require_feature("rewrite.multi")
 @enforce_quota("rewrite")
 def rewrite_multi():
-    print("rewrite_multi 진입")
     data = request.get_json(silent=True) or {}
     items = data.get("items") or []
     if not isinstance(items, list) or not items:
         return jsonify({"error": "empty_items"}), 400
-    print("rewrite_multi 에러")
     outputs = [f"[multi] refined: {str(x).strip()}" for x in items[:10]]  # 데모
     return jsonify({"ok": True, "outputs": outputs})
 
 @mainpage_bp.post("/api/preview/compare3")
 @require_feature("preview.compare3")
-@enforce_quota("preview")
+@enforce_quota("rewrite")  # 미리보기도 rewrite 한도에서 차감
 def preview_compare3():
-    print("preview_compare3 진입")
     data = request.get_json(silent=True) or {}
     text = data.get("text", "").strip()
     if not text:
@@ -1,12 +1,22 @@
-from datetime import datetime, timezone
-from flask import Blueprint, Response, url_for, request
+"""
+sitemap.py — sitemap.xml (배포/콘텐츠 변경 시 1회 생성, gzip 으로 메모리 보관)
 
-from routes.web.learn import SLUG_MAP
+- 생성 결과는 (base url, 콘텐츠 최종 수정 시각) 별로 캐시 → 크롤러 요청은 캐시된 bytes 만 응답
+- Accept-Encoding 이 gzip 을 허용하면(q=0 은 거부, core.compression 과 같은 협상) 미리 압축해 둔 본문을 Content-Encoding: gzip 으로 전송
+- URL 이 SITEMAP_MAX_URLS 를 넘으면 /sitemap.xml 은 sitemap index, 실제 URL 은 /sitemap-<n>.xml 로 분할
+- lastmod 는 콘텐츠/템플릿 최종 수정일 (services/page_cache.content_last_modified)
+"""
+import gzip
+import hashlib
+import threading
 
-sitemap_bp = Blueprint("sitemap", __name__)
+from flask import Blueprint, Response, abort, current_app, request, url_for
+
+from core.compression import accepted_encodings
+from routes.web.learn import LEARN_SLUGS
+from services.page_cache import content_last_modified
 
-def _today():
-    return datetime.now(timezone.utc).date().isoformat()
+sitemap_bp = Blueprint("sitemap", __name__)
 
 def _base_url():
     # 예: http://127.0.0.1:5000/
@@ -21,10 +31,8 @@ def _xml_escape(s: str) -> str:
          .replace("'", "&apos;")
     )
 
-@sitemap_bp.route("/sitemap.xml")
-def sitemap_xml():
-    today = _today()
-    base = _base_url()
+def _collect_urls(base: str, default_lastmod: str) -> list:
+    """사이트맵 URL 목록 [{loc, lastmod, alternates}] (요청 컨텍스트 필요: url_for _external)"""
 
     # 블로그 POSTS를 안전하게 로딩 (순환 import 방지)
     try:
@@ -37,7 +45,7 @@ def sitemap_xml():
 
     urls = []
 
-    def add_url(loc: str, lastmod: str = today, alternates=None):
+    def add_url(loc: str, lastmod: str = default_lastmod, alternates=None):
         """
         alternates: list of dicts: [{"hreflang":"en","href":"..."}, ...]
         """
@@ -49,16 +57,16 @@ def sitemap_xml():
 
     # 1) 홈 (있으면 추가)
     try:
-        add_url(url_for("index", _external=True), today)
+        add_url(url_for("index", _external=True), default_lastmod)
     except Exception:
         # index 엔드포인트가 없다면 스킵
         pass
 
     # 2) Learn
     try:
-        add_url(url_for("learn.learn_index", _external=True), today)
-        for slug in sorted(SLUG_MAP.keys()):
-            add_url(url_for("learn.learn_page", slug=slug, _external=True), today)
+        add_url(url_for("learn.learn_index", _external=True), default_lastmod)
+        for slug in LEARN_SLUGS:
+            add_url(url_for("learn.learn_page", slug=slug, _external=True), default_lastmod)
     except Exception:
         pass
 
@@ -67,7 +75,7 @@ def sitemap_xml():
     blog_en = f"{base}/en/blog"
     add_url(
         blog_ko,
-        today,
+        default_lastmod,
         alternates=[
             {"hreflang": "ko", "href": blog_ko},
             {"hreflang": "en", "href": blog_en},
@@ -76,7 +84,7 @@ def sitemap_xml():
     )
     add_url(
         blog_en,
-        today,
+        default_lastmod,
         alternates=[
             {"hreflang": "en", "href": blog_en},
             {"hreflang": "ko", "href": blog_ko},
@@ -91,7 +99,7 @@ def sitemap_xml():
 
         add_url(
             ko_url,
-            today,
+            default_lastmod,
             alternates=[
                 {"hreflang": "ko", "href": ko_url},
                 {"hreflang": "en", "href": en_url},
@@ -100,7 +108,7 @@ def sitemap_xml():
         )
         add_url(
             en_url,
-            today,
+            default_lastmod,
             alternates=[
                 {"hreflang": "en", "href": en_url},
                 {"hreflang": "ko", "href": ko_url},
@@ -108,6 +116,10 @@ def sitemap_xml():
             ],
         )
 
+    return urls
+
+
+def _urlset_xml(urls: list) -> str:
     # XML 생성 (xhtml namespace 포함: hreflang alternates)
     lines = ['<?xml version="1.0" encoding="UTF-8"?>']
     lines.append(
@@ -129,5 +141,91 @@ def sitemap_xml():
         lines.append("</url>")
 
     lines.append("</urlset>")
+    return "\n".join(lines)
+
+
+def _index_xml(locs: list, lastmod: str) -> str:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>']
+    lines.append('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+    for loc in locs:
+        lines.append("<sitemap>")
+        lines.append(f"<loc>{_xml_escape(loc)}</loc>")
+        lines.append(f"<lastmod>{_xml_escape(lastmod)}</lastmod>")
+        lines.append("</sitemap>")
+    lines.append("</sitemapindex>")
+    return "\n".join(lines)
+
+
+class _Doc:
+    __slots__ = ("raw", "gz", "etag")
+
+    def __init__(self, xml: str):
+        self.raw = xml.encode("utf-8")
+        self.gz = gzip.compress(self.raw, compresslevel=9, mtime=0)
+        self.etag = hashlib.sha256(self.raw).hexdigest()[:32]
+
+
+_cache = {}  # (base, lastmod) -> {"sitemap.xml": _Doc, "sitemap-1.xml": _Doc, ...}
+_lock = threading.Lock()
+
+
+def _build(base: str, lastmod: str) -> dict:
+    urls = _collect_urls(base, lastmod)
+    per_file = max(1, int(current_app.config.get("SITEMAP_MAX_URLS", 5000)))
+
+    if len(urls) <= per_file:
+        return {"sitemap.xml": _Doc(_urlset_xml(urls))}
+
+    docs = {}
+    locs = []
+    for i in range(0, len(urls), per_file):
+        name = f"sitemap-{i // per_file + 1}.xml"
+        docs[name] = _Doc(_urlset_xml(urls[i:i + per_file]))
+        locs.append(f"{base}/{name}")
+    docs["sitemap.xml"] = _Doc(_index_xml(locs, lastmod))
+    return docs
+
+
+def _docs() -> dict:
+    base = _base_url()
+    modified = content_last_modified()
+    key = (base, modified.date().isoformat())
+    docs = _cache.get(key)
+    if docs is None:
+        with _lock:
+            docs = _cache.get(key)
+            if docs is None:
+                # 콘텐츠가 바뀌면(키 변경) 이전 세대는 버린다. Host 별 키는 상한을 둔다
+                for k in [k for k in _cache if k[1] != key[1]]:
+                    del _cache[k]
+                docs = _build(base, key[1])
+                if len(_cache) < 16:
+                    _cache[key] = docs
+    return docs
+
+
+def _serve(name: str):
+    doc = _docs().get(name)
+    if doc is None:
+        abort(404)
+
+    use_gzip = "gzip" in accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    resp = Response(doc.gz if use_gzip else doc.raw, mimetype="application/xml")
+    if use_gzip:
+        resp.headers["Content-Encoding"] = "gzip"
+    resp.vary.add("Accept-Encoding")
+    # 인코딩별로 다른 표현이므로 ETag 도 구분
+    resp.set_etag(f"{doc.etag}-gz" if use_gzip else doc.etag)
+    resp.last_modified = content_last_modified()
+    resp.headers["Cache-Control"] = "public, max-age=3600"
+    return resp.make_conditional(request)
+
+
+@sitemap_bp.route("/sitemap.xml")
+def sitemap_xml():
+    return _serve("sitemap.xml")
+
 
-    return Response("\n".join(lines), mimetype="application/xml")
+@sitemap_bp.route("/sitemap-<int:n>.xml")
+def sitemap_part(n: int):
+    return _serve(f"sitemap-{n}.xml")
@@ -1,10 +1,13 @@
 # routes/web/subscribe.py
 from flask import render_template, Blueprint, request
 
+from services.page_cache import anonymous_page_cache
+
 subscribe_bp = Blueprint("subscribe", __name__)
 
 
 @subscribe_bp.route("/subscribe", methods=["GET"])
+@anonymous_page_cache(skip_session_keys=("pay_error",))  # 템플릿이 pay_error 를 pop
 def subscribe_page():
     return render_template("subscribe.html")
 
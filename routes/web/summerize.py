@@ -1,6 +1,8 @@
 from flask import render_template, Blueprint, current_app
 
+from core.extensions import release_db_connection
 from generator import claude_prompt_generator
+from services.page_cache import anonymous_page_cache
 from services.ai.claude_service import _as_text_from_claude_result
 from utils.retry import _retry
 
@@ -9,6 +11,7 @@ import os
 summarize_bp = Blueprint("summarize", __name__)
 
 @summarize_bp.route("/summarize")
+@anonymous_page_cache()
 def summarize_page():
     return render_template("summarize.html")
 
@@ -55,6 +58,9 @@ def _call_provider_summarize(text: str, provider: str = None) -> str:
     prompt = _build_summarize_prompt_korean(text)
     out_text = ""
 
+    # provider 응답 대기 중 DB 커넥션 반납 (이후 ORM 객체는 detach — 사용자는 get_current_user() 로 다시 받는다)
+    release_db_connection()
+
     if provider == "claude":
         try:
             def _do():
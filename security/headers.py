@@ -26,6 +26,10 @@ def init_security_headers(app):
             "SAMEORIGIN" if cfg.get("ADS_ENABLED") else "DENY"
         )
 
+        # 304 는 본문이 없고, 여기서 CSP(새 nonce)를 보내면 브라우저가 캐시해 둔 본문의 nonce 와 어긋난다
+        if resp.status_code == 304:
+            return resp
+
         # -----------------------------
         # CSP 구성 요소 누적
         # -----------------------------
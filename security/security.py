@@ -12,7 +12,10 @@ import re
 import html
 from functools import wraps
 from flask import request, abort, g
-from jsonschema import validate, ValidationError
+from jsonschema import validators
+from jsonschema.exceptions import best_match
+
+import domain.schema as _schema_mod
 
 # -------------------- 설정 상수 --------------------
 MAX_PAYLOAD_BYTES = 256 * 1024  # 256KB 제한
@@ -27,48 +30,115 @@ def _form_to_dict(formdata):
     return result
 
 
+# LLM 프롬프트 인젝션 금지 패턴 (소문자 기준, 입력은 .lower() 1회 후 검사)
+# 단일 정규식(alternation) 보다 C 구현 substring 검색 8회가 한국어/영어 4000자 입력 모두에서 더 빠르다
+BANNED_PATTERNS = (
+    "ignore previous instructions",
+    "system prompt",
+    "act as",
+    "inject",
+    "jailbreak",
+    "roleplay",
+    "###",
+    "```",
+)
+
+# [ ... ] 로 감싼 부분은 보호 (escape / 인젝션 검사 제외)
+_PROTECT_RE = re.compile(r"\[[^\[\]]*\]")
+_PROTECT_SPLIT_RE = re.compile(r"(\[[^\[\]]*\])")
+
+# html.escape(quote=True) + { } 치환 (순서 유지: & 가 먼저)
+# str.translate 는 다문자 치환 + 비 latin-1 문자열에서 매우 느려서 str.replace 체인을 쓴다
+_ESCAPES = (
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&#x27;"),
+    ("{", "&#123;"),
+    ("}", "&#125;"),
+)
+
+
+def _escape(s: str) -> str:
+    for ch, rep in _ESCAPES:
+        if ch in s:
+            s = s.replace(ch, rep)
+    return s
+
+
+def _has_banned(s: str) -> bool:
+    lower = s.lower()
+    for pat in BANNED_PATTERNS:
+        if pat in lower:
+            return True
+    return False
+
+
+def _reject_injection():
+    abort(400, description="LLM prompt injection detected.")
+
+
+def _sanitize_str(value: str, for_llm: bool) -> str:
+    """
+    문자열 1개 정화 — 결과는 _sanitize_str_legacy 와 동일
+    - '[' 가 없으면 (대부분의 입력) 보호 구간 정규식/치환 없이 escape + (for_llm) 패턴 검사만
+    - 보호 구간이 있으면 split 으로 보호 구간을 건너뛰며 같은 처리
+    - 입력에 치환 키("__PROT")가 이미 들어 있으면 기존 복원 동작까지 같게 하기 위해 legacy 경로
+    """
+    if "[" not in value:
+        if for_llm and _has_banned(value):
+            _reject_injection()
+        return _escape(value)
+
+    if "__PROT" in value:
+        return _sanitize_str_legacy(value, for_llm)
+
+    parts = _PROTECT_SPLIT_RE.split(value)
+    # 짝수 인덱스 = 일반 텍스트, 홀수 인덱스 = 보호 구간
+    # 기존 구현에서 보호 구간은 "__PROTn__" 키로 치환된 상태로 검사되므로 패턴이 구간을 넘어 이어질 수 없다
+    if for_llm:
+        for i in range(0, len(parts), 2):
+            if parts[i] and _has_banned(parts[i]):
+                _reject_injection()
+    for i in range(0, len(parts), 2):
+        parts[i] = _escape(parts[i])
+    return "".join(parts)
+
+
+def _sanitize_str_legacy(value: str, for_llm: bool) -> str:
+    """기존 구현 (보호 키 치환 → escape → 검사 → 복원). 입력에 "__PROT" 가 있을 때만 사용"""
+    protected = {}
+
+    def _protect(m):
+        key = f"__PROT{len(protected)}__"
+        protected[key] = m.group(0)
+        return key
+
+    temp = _PROTECT_RE.sub(_protect, value)
+
+    # HTML 인젝션 방지
+    temp = html.escape(temp, quote=True)
+    temp = temp.replace("{", "&#123;").replace("}", "&#125;")
+
+    # LLM 프롬프트 인젝션 탐지
+    if for_llm and _has_banned(temp):
+        _reject_injection()
+
+    # 보호 구간 복원
+    for key, orig in protected.items():
+        temp = temp.replace(key, orig)
+
+    return temp
+
+
 def _sanitize_payload(value, for_llm=False):
     """
     문자열/리스트/딕셔너리를 재귀적으로 정화.
     for_llm=True: prompt injection 탐지 활성화.
     """
     if isinstance(value, str):
-        protected = {}
-
-        # [ ... ] 로 감싼 부분은 보호
-        def _protect(m):
-            key = f"__PROT{len(protected)}__"
-            protected[key] = m.group(0)
-            return key
-
-        temp = re.sub(r"\[[^\[\]]*\]", _protect, value)
-
-        # HTML 인젝션 방지
-        temp = html.escape(temp, quote=True)
-        temp = temp.replace("{", "&#123;").replace("}", "&#125;")
-
-        # LLM 프롬프트 인젝션 탐지
-        if for_llm:
-            lower_temp = temp.lower()
-            banned_patterns = [
-                "ignore previous instructions",
-                "system prompt",
-                "act as",
-                "inject",
-                "jailbreak",
-                "roleplay",
-                "###",
-                "```",
-            ]
-            for pat in banned_patterns:
-                if pat in lower_temp:
-                    abort(400, description="LLM prompt injection detected.")
-
-        # 보호 구간 복원
-        for key, orig in protected.items():
-            temp = temp.replace(key, orig)
-
-        return temp
+        return _sanitize_str(value, for_llm)
 
     elif isinstance(value, list):
         return [_sanitize_payload(v, for_llm=for_llm) for v in value]
@@ -79,14 +149,36 @@ def _sanitize_payload(value, for_llm=False):
     return value
 
 
+# -------------------- 스키마 validator 캐시 --------------------
+# jsonschema.validate() 는 호출마다 check_schema(메타스키마 검증) + validator 생성을 반복한다.
+# 스키마는 모듈 상수(dict)이므로 객체 단위로 1회만 컴파일해 재사용한다.
+_VALIDATORS = {}  # id(schema) -> (schema, validator)  (schema 참조를 쥐고 있어 id 재사용 없음)
+
+
+def compiled_validator(schema):
+    """스키마 → 캐시된 Draft*Validator (최초 1회 check_schema)"""
+    entry = _VALIDATORS.get(id(schema))
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+    cls = validators.validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+    _VALIDATORS[id(schema)] = (schema, validator)
+    return validator
+
+
+def schema_error(data, schema):
+    """jsonschema.validate 와 같은 기준(best_match)의 첫 오류, 없으면 None"""
+    return best_match(compiled_validator(schema).iter_errors(data))
+
+
 def _validate_schema(data, schema):
     """JSON Schema 검증 (필수 필드, 타입 등)"""
     if not schema:
         return
-    try:
-        validate(instance=data, schema=schema)
-    except ValidationError as e:
-        abort(400, description=f"유효성 검사 실패: {e.message}")
+    error = schema_error(data, schema)
+    if error is not None:
+        abort(400, description=f"유효성 검사 실패: {error.message}")
 
 
 def _safe_args(schema=None):
@@ -110,6 +202,8 @@ def require_safe_input(json_schema=None, *, form=False, for_llm_fields=None, onl
     """
     for_llm_fields = set(for_llm_fields or [])
     only_methods = tuple(only_methods or ())
+    if json_schema:
+        compiled_validator(json_schema)  # 잘못된 스키마는 import 시점에 실패
 
     def deco(f):
         @wraps(f)
@@ -166,3 +260,9 @@ def require_safe_input(json_schema=None, *, form=False, for_llm_fields=None, onl
             return f(*args, **kwargs)
         return wrapped
     return deco
+
+
+# domain/schema 의 스키마는 import 시점에 미리 컴파일 (첫 요청 지연 없음)
+for _name, _value in vars(_schema_mod).items():
+    if _name.endswith("_schema") and isinstance(_value, dict):
+        compiled_validator(_value)
@@ -7,6 +7,10 @@ from datetime import datetime, timedelta
 
 from sqlalchemy import and_
 
+from auth.entitlements import invalidate_entitlement
+from core.log import get_logger, redact
+from services.extension_oauth import revoke_user_extension_tokens
+
 from domain.models import (
     db,
     User,
@@ -20,6 +24,8 @@ from domain.models import (
     PaymentMethod,
 )
 
+log = get_logger("account_delete")
+
 
 # -------------------------
 # Utils
@@ -86,12 +92,15 @@ def request_account_delete(user_pk: int, *, reason: str | None = None) -> dict:
     user.purge_after = purge_after
 
     db.session.commit()
+    invalidate_entitlement(uid)
+    revoke_user_extension_tokens(uid)
 
-    print("[ACCOUNT_DELETE_REQUEST]", {
+    log.info("delete_requested", extra={
         "user_pk": user_pk,
-        "user_id": uid,
+        "uid": uid,
         "purge_after": purge_after.isoformat(),
-        "reason": reason,
+        "reason": redact(reason, 200),  # 사용자 입력 자유 텍스트
+        "canceled_subscriptions": len(subs),
     })
 
     return {
@@ -117,6 +126,7 @@ def restore_account(user_pk: int) -> dict:
         return {"ok": False, "error": "not_deleted"}
 
     if user.purge_after and now > user.purge_after:
+        log.warning("restore_rejected", extra={"user_pk": user_pk, "uid": user.user_id, "error": "purge_expired"})
         return {"ok": False, "error": "purge_expired"}
 
     user.is_active = True
@@ -124,11 +134,9 @@ def restore_account(user_pk: int) -> dict:
     user.purge_after = None
 
     db.session.commit()
+    invalidate_entitlement(user.user_id)
 
-    print("[ACCOUNT_RESTORE]", {
-        "user_pk": user_pk,
-        "user_id": user.user_id,
-    })
+    log.info("restored", extra={"user_pk": user_pk, "uid": user.user_id})
 
     return {"ok": True}
 
@@ -157,8 +165,10 @@ def purge_expired_accounts(limit: int = 100) -> dict:
         purged += 1
 
     db.session.commit()
+    for user in users:
+        invalidate_entitlement(user.user_id)
 
-    print("[ACCOUNT_PURGE]", {"count": purged})
+    log.info("purged", extra={"count": purged})
     return {"ok": True, "purged": purged}
 
 
@@ -212,7 +222,4 @@ def _finalize_delete(user: User):
     user.email = _anonymized_email()
     user.password_hash = _disabled_password_hash()
 
-    print("[ACCOUNT_FINAL_DELETE]", {
-        "user_pk": user.id,
-        "user_id": uid,
-    })
+    log.info("final_delete", extra={"user_pk": user.id, "uid": uid})
@@ -1,4 +1,6 @@
-from domain.models import RewriteLog, User, db
+from auth.entitlements import get_user_by_id
+from core.log import get_logger
+from domain.models import RewriteLog, db
 from generator import claude_prompt_generator
 from prompt_management.build_prompt import build_prompt
 from utils.retry import _retry
@@ -6,6 +8,8 @@ from utils.retry import _retry
 from flask import session, request
 from flask_babel import get_locale
 
+logger = get_logger("ai.claude")
+
 
 def _normalize_lang(lang: str | None) -> str:
     """
@@ -143,14 +147,14 @@ def call_claude_and_log(
             request_ip=request_ip,
         )
         if uid:
-            u = User.query.filter_by(user_id=uid).first()
+            u = get_user_by_id(uid)
             if u:
                 log.user_pk = u.id
         db.session.add(log)
         db.session.commit()
     except Exception as log_err:
         db.session.rollback()
-        print("[rewrite log save error]", log_err)
+        logger.error("rewrite_log_save_error", extra={"error": repr(log_err)})
 
     return outputs
 
@@ -2,9 +2,13 @@ from prompt_management.build_prompt import build_prompt
 
 import time
 from flask import session, request, current_app
-from domain.models import db, RewriteLog, User
+from auth.entitlements import get_user_by_id
+from core.log import get_logger
+from domain.models import db, RewriteLog
 from utils.retry import _retry
 
+logger = get_logger("ai.openai")
+
 
 def call_openai_and_log(
         input_text,
@@ -96,7 +100,7 @@ def call_openai_and_log(
             total_tokens=total_tokens,
         )
         if uid:
-            u = User.query.filter_by(user_id=uid).first()
+            u = get_user_by_id(uid)
             if u:
                 log.user_pk = u.id
 
@@ -107,6 +111,6 @@ def call_openai_and_log(
         db.session.commit()
     except Exception as log_err:
         db.session.rollback()
-        print("[rewrite log save error]", log_err)
+        logger.error("rewrite_log_save_error", extra={"error": repr(log_err)})
 
     return outputs
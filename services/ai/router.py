@@ -1,3 +1,4 @@
+from core.extensions import release_db_connection
 from services.ai.claude_service import call_claude_and_log
 from services.ai.openai_service import call_openai_and_log
 
@@ -17,6 +18,9 @@ def _get_ai_outputs(
     context_label="",
 ):
     """Helper function to call the appropriate AI provider and log the request."""
+    # provider 응답을 기다리는 동안 DB 커넥션/트랜잭션을 잡고 있지 않도록 먼저 반납
+    # (이후 호출부의 ORM 객체는 detach 상태 — 사용자는 get_current_user()/get_user_by_id() 로 다시 받는다)
+    release_db_connection()
     outputs = []
     if provider == "openai":
         try:
@@ -3,11 +3,28 @@ from __future__ import annotations
 
 import hashlib
 import secrets
+import threading
+import time
 from datetime import timedelta, datetime
 
+from flask import current_app
+from itsdangerous import URLSafeSerializer, BadSignature
+from sqlalchemy import bindparam, or_
+
+from core.extensions import get_redis
+from core.log import get_logger
 from domain.models import db, ExtensionAuthCode, ExtensionToken
 from utils.time_utils import utcnow
 
+log = get_logger("ext_oauth")
+
+# access token 형식
+#   - v1(서명): "lx1." + itsdangerous 서명 payload {u: user_id, j: jti, x: 만료 epoch}
+#       검증은 서명/만료/폐기 집합 확인만 (DB 조회 없음). DB 행은 token_hash=sha256(jti) 로 관리용 보관
+#   - 레거시(opaque): token_urlsafe → sha256 해시로 ExtensionToken 조회 (마이그레이션 기간 동안 유지)
+SIGNED_PREFIX = "lx1."
+REVOKED_KEY = "ext:revoked"  # Redis ZSET member=token_hash, score=만료 epoch
+
 
 def _sha256_hex(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
@@ -51,7 +68,7 @@ def issue_auth_code(
     db.session.add(row)
     db.session.commit()
 
-    print("[EXT_OAUTH][issue_code]", {"user_id": user_id, "expires_at": str(row.expires_at)})
+    log.info("issue_code", extra={"uid": user_id, "expires_at": str(row.expires_at)})
     return code
 
 
@@ -90,17 +107,21 @@ def exchange_code_for_token(
     row.used_at = now
     db.session.commit()
 
-    # access token 발급(평문은 1회만 반환, DB에는 hash 저장)
-    raw_token = secrets.token_urlsafe(32)
-    token_hash = _sha256_hex(raw_token)
+    # access token 발급(서명 토큰은 1회만 반환, DB에는 jti hash 저장)
+    if token_expires_days is None:
+        token_expires_days = current_app.config.get("EXT_TOKEN_DAYS", 90)
+    expires_at = now + timedelta(days=int(token_expires_days))
 
-    expires_at = None
-    if token_expires_days is not None:
-        expires_at = now + timedelta(days=int(token_expires_days))
+    jti = secrets.token_urlsafe(16)
+    raw_token = SIGNED_PREFIX + _access_serializer().dumps({
+        "u": row.user_id,
+        "j": jti,
+        "x": int((expires_at - datetime(1970, 1, 1)).total_seconds()),
+    })
 
     t = ExtensionToken(
         user_id=row.user_id,
-        token_hash=token_hash,
+        token_hash=_sha256_hex(jti),
         created_at=now,
         expires_at=expires_at,
         note=note or "chrome-oauth",
@@ -108,21 +129,30 @@ def exchange_code_for_token(
     db.session.add(t)
     db.session.commit()
 
-    print("[EXT_OAUTH][issue_token]", {"user_id": row.user_id, "expires_at": str(expires_at)})
+    log.info("issue_token", extra={"uid": row.user_id, "expires_at": str(expires_at)})
 
     return {
         "ok": True,
         "access_token": raw_token,
         "token_type": "Bearer",
-        "expires_at": expires_at.isoformat() if expires_at else None,
+        "expires_at": expires_at.isoformat(),
         "user_id": row.user_id,
     }
 
 
+def _access_serializer() -> URLSafeSerializer:
+    cfg = current_app.config
+    return URLSafeSerializer(cfg["SECRET_KEY"], salt=cfg.get("EXT_TOKEN_SALT"))
+
+
 def find_user_id_by_bearer_token(raw_token: str) -> str | None:
     if not raw_token or len(raw_token) < 10:
         return None
 
+    if raw_token.startswith(SIGNED_PREFIX):
+        return _verify_signed_token(raw_token[len(SIGNED_PREFIX):])
+
+    # 레거시 opaque 토큰 (DB 조회는 유지, last_used_at 쓰기는 배치로)
     token_hash = _sha256_hex(raw_token)
     now = datetime.utcnow()
 
@@ -134,6 +164,218 @@ def find_user_id_by_bearer_token(raw_token: str) -> str | None:
     if row.expires_at is not None and row.expires_at <= now:
         return None
 
-    row.last_used_at = now
-    db.session.commit()
+    _touch_last_used(token_hash)
     return row.user_id
+
+
+def _verify_signed_token(signed: str) -> str | None:
+    try:
+        data = _access_serializer().loads(signed)
+    except BadSignature:
+        return None
+
+    uid = data.get("u")
+    jti = data.get("j")
+    exp = data.get("x")
+    if not uid or not jti:
+        return None
+    if exp is not None and exp <= time.time():
+        return None
+
+    token_hash = _sha256_hex(jti)
+    if token_hash in _revoked_hashes():
+        return None
+
+    _touch_last_used(token_hash)
+    return uid
+
+
+# -------------------- 폐기(revocation) 집합 --------------------
+# 서명 토큰은 DB 를 보지 않으므로 폐기된 token_hash 를 워커 메모리에 들고 있는다 (EXT_REVOCATION_REFRESH 초마다 갱신).
+#   - DB(revoked_at) 가 기준: 최초 1회 전체 적재 후, 갱신마다 revoked_at 이 최근(겹침 구간 포함)인 행만 추가로 읽는다
+#       → Redis 장애 중에 기록된 폐기도 다음 갱신에 반영됨 (인덱스 idx_extension_tokens_revoked 범위 조회)
+#   - Redis ZSET(ext:revoked) 는 워커 간 빠른 공유용. 키가 없으면(최초/flush/eviction) DB 전체 행으로 다시 채운다
+#   - 갱신 결과 = DB 집합 ∪ ZSET. Redis 가 없거나 장애면 DB 집합만
+# 토큰은 항상 만료가 있으므로 집합 크기는 "만료 전에 폐기된 토큰 수" 로 제한된다.
+_revoked: frozenset = frozenset()
+_revoked_loaded_at = 0.0
+_revoked_db: dict = {}  # token_hash -> 만료 epoch (DB 에서 읽은 폐기분)
+_revoked_db_seen = None  # DB 에서 읽은 revoked_at 최대값 (None = 아직 전체 적재 전)
+# 다른 워커/호스트의 시계 차이 + 늦게 commit 된 행을 놓치지 않도록 증분 조회 시 겹쳐 읽는 구간
+_DB_OVERLAP = timedelta(minutes=5)
+
+
+def _expires_epoch(expires_at) -> float:
+    if expires_at is None:
+        return time.time() + current_app.config.get("EXT_TOKEN_DAYS", 90) * 86400
+    return (expires_at - datetime(1970, 1, 1)).total_seconds()
+
+
+def _load_db_revoked(since=None) -> dict:
+    """미만료 폐기 행 {token_hash: 만료 epoch}. since 가 있으면 revoked_at > since 인 것만"""
+    global _revoked_db_seen
+
+    q = db.session.query(ExtensionToken.token_hash, ExtensionToken.expires_at, ExtensionToken.revoked_at).filter(
+        ExtensionToken.revoked_at.isnot(None),
+        or_(ExtensionToken.expires_at.is_(None), ExtensionToken.expires_at > datetime.utcnow()),
+    )
+    if since is not None:
+        q = q.filter(ExtensionToken.revoked_at > since)
+    rows = q.all()
+    seen = max((revoked_at for _, _, revoked_at in rows), default=None)
+    if seen is not None and (_revoked_db_seen is None or seen > _revoked_db_seen):
+        _revoked_db_seen = seen
+    elif _revoked_db_seen is None:
+        _revoked_db_seen = datetime.utcnow()
+    return {h: _expires_epoch(exp) for h, exp, _ in rows}
+
+
+def _revoked_hashes() -> frozenset:
+    global _revoked, _revoked_loaded_at, _revoked_db
+
+    now = time.monotonic()
+    if now - _revoked_loaded_at < current_app.config.get("EXT_REVOCATION_REFRESH", 30):
+        return _revoked
+    _revoked_loaded_at = now
+
+    try:
+        since = None if _revoked_db_seen is None else _revoked_db_seen - _DB_OVERLAP
+        fresh = _load_db_revoked(since)
+        cutoff = time.time()
+        _revoked_db = {h: exp for h, exp in {**_revoked_db, **fresh}.items() if exp > cutoff}
+    except Exception as e:
+        db.session.rollback()
+        log.error("revoked_refresh_db_error", extra={"error": repr(e)})
+
+    members = set()
+    r = get_redis()
+    if r is not None:
+        try:
+            if not r.exists(REVOKED_KEY) and _revoked_db:
+                # flush/eviction/최초 기동 → DB 기준으로 다시 채움
+                r.zadd(REVOKED_KEY, _revoked_db)
+                log.info("revoked_zset_seeded", extra={"count": len(_revoked_db)})
+            pipe = r.pipeline(transaction=False)
+            pipe.zremrangebyscore(REVOKED_KEY, "-inf", time.time())
+            pipe.zrange(REVOKED_KEY, 0, -1)
+            members = {m.decode() if isinstance(m, bytes) else m for m in pipe.execute()[1]}
+        except Exception as e:
+            log.warning("revoked_refresh_redis_error", extra={"error": repr(e)})
+
+    _revoked = frozenset(_revoked_db) | frozenset(members)
+    return _revoked
+
+
+def revoke_user_extension_tokens(user_id: str) -> int:
+    """사용자의 확장 토큰 전체 폐기 (DB revoked_at + 폐기 집합 반영)"""
+    global _revoked
+
+    now = datetime.utcnow()
+    rows = ExtensionToken.query.filter(
+        ExtensionToken.user_id == user_id,
+        ExtensionToken.revoked_at.is_(None),
+    ).all()
+    if not rows:
+        return 0
+
+    for row in rows:
+        row.revoked_at = now
+    db.session.commit()
+
+    members = {row.token_hash: _expires_epoch(row.expires_at) for row in rows}
+    _revoked_db.update(members)
+    _revoked = _revoked | frozenset(members)
+
+    # Redis 장애로 여기서 실패해도 다른 워커는 다음 갱신 때 DB 증분 조회로 반영한다
+    r = get_redis()
+    if r is not None:
+        try:
+            r.zadd(REVOKED_KEY, members)
+        except Exception as e:
+            log.warning("revoke_redis_error", extra={"error": repr(e)})
+
+    log.info("revoke", extra={"uid": user_id, "count": len(rows)})
+    return len(rows)
+
+
+# -------------------- last_used_at 배치 기록 --------------------
+# 토큰별로 EXT_LAST_USED_INTERVAL 초에 한 번만 기록 예약하고,
+# 백그라운드 flush 가 모아서 UPDATE executemany 1회로 반영한다 (요청 경로에서 commit 없음).
+_touch_lock = threading.Lock()
+_last_touch: dict = {}   # token_hash -> 마지막 예약 시각(monotonic)
+_pending_used: dict = {}  # token_hash -> last_used_at(naive UTC)
+_flusher_started = False
+
+
+def _touch_last_used(token_hash: str) -> None:
+    interval = current_app.config.get("EXT_LAST_USED_INTERVAL", 300)
+    now = time.monotonic()
+    last = _last_touch.get(token_hash)
+    if last is not None and now - last < interval:
+        return
+    if len(_last_touch) > 50_000:
+        _last_touch.clear()
+    _last_touch[token_hash] = now
+
+    # 다른 워커가 이미 이번 주기에 예약했으면 생략
+    r = get_redis()
+    if r is not None:
+        try:
+            if not r.set(f"ext:used:{token_hash}", 1, nx=True, ex=int(interval)):
+                return
+        except Exception:
+            pass
+
+    with _touch_lock:
+        _pending_used[token_hash] = datetime.utcnow()
+    _ensure_flusher()
+
+
+def _ensure_flusher() -> None:
+    global _flusher_started
+    if _flusher_started:
+        return
+    with _touch_lock:
+        if _flusher_started:
+            return
+        _flusher_started = True
+
+    app = current_app._get_current_object()
+    every = app.config.get("EXT_LAST_USED_FLUSH", 60)
+
+    def _loop():
+        while True:
+            time.sleep(every)
+            with app.app_context():
+                flush_last_used()
+                db.session.remove()
+
+    threading.Thread(target=_loop, name="ext-last-used-flush", daemon=True).start()
+
+
+def flush_last_used() -> int:
+    """예약된 last_used_at 을 한 번에 기록. 실패하면 다음 주기에 재시도"""
+    global _pending_used
+
+    with _touch_lock:
+        batch, _pending_used = _pending_used, {}
+    if not batch:
+        return 0
+
+    table = ExtensionToken.__table__
+    stmt = (
+        table.update()
+        .where(table.c.token_hash == bindparam("h"))
+        .values(last_used_at=bindparam("ts"))
+    )
+    try:
+        db.session.execute(stmt, [{"h": h, "ts": ts} for h, ts in batch.items()])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        with _touch_lock:
+            for h, ts in batch.items():
+                _pending_used.setdefault(h, ts)
+        log.error("last_used_flush_error", extra={"error": repr(e)})
+        return 0
+    return len(batch)
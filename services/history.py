@@ -0,0 +1,108 @@
+"""
+history.py — 사용자 보정 기록(RewriteLog) keyset 페이지네이션
+
+- 정렬: (created_at DESC, id DESC) — 같은 시각의 행도 id 로 순서가 고정돼 페이지 경계에서 중복/누락이 없다
+- 다음 페이지 조건: created_at <= c AND (created_at < c OR id < i)
+    앞의 범위 조건이 idx_rewritelog_user_created(user_id, created_at) 인덱스 범위 스캔으로 처리되므로
+    OFFSET 과 달리 몇 번째 페이지든 읽는 행 수 = limit + 1 (기록이 수만 건이어도 첫 페이지 비용 일정)
+- cursor 는 불투명 문자열(base64url "created_at|id"). 클라이언트는 그대로 돌려주기만 한다
+- 반대 방향(since): created_at >= c AND (created_at > c OR id > i) — 마지막으로 본 행 이후의 새 기록만
+- 기록은 생성 후 수정되지 않으므로(삭제는 계정 삭제 시에만) 최신 행의 (created_at, id) = 목록 버전
+
+검색 (q=, Pro)
+- 대상: SEARCH_DOC = input_text || ' ' || output_text, 부분 문자열 ILIKE (와일드카드는 escape)
+- Postgres: btree_gin + pg_trgm 복합 GIN 인덱스 idx_rewritelog_search_trgm(user_id, 같은 식) 로
+    user_id = :uid AND ILIKE '%q%' 가 한 번의 인덱스 스캔으로 처리된다 (흔한 검색어도 다른 사용자 행은 읽지 않음)
+    한국어도 글자 3-gram 으로 쪼개져 형태소 분석 없이 매칭
+    (DB LC_CTYPE 가 UTF-8 locale 이어야 한글이 trigram 에 포함됨, C locale 이면 한글이 무시됨)
+    3글자 미만 검색어는 trigram 조건이 없어 user_id 인덱스로 해당 사용자 행만 훑는다
+- fuzzy=True: 오타/띄어쓰기 차이 허용 (q <% doc, word_similarity >= pg_trgm.word_similarity_threshold), Postgres 전용
+- 정렬/페이지는 목록과 같은 keyset (created_at DESC, id DESC)
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from sqlalchemy import func, literal, literal_column, or_
+
+from domain.models import RewriteLog, db
+
+SEARCH_MAX_LEN = 100
+
+# 마이그레이션 idx_rewritelog_search_trgm 의 인덱스 식과 똑같아야 인덱스가 쓰인다
+SEARCH_DOC = (
+    func.coalesce(RewriteLog.input_text, literal_column("''"))
+    .op("||")(literal_column("' '"))
+    .op("||")(func.coalesce(RewriteLog.output_text, literal_column("''")))
+)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """(created_at, id) 또는 형식이 잘못됐으면 None"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        ts, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def search_filter(text: str, fuzzy: bool = False):
+    text = text.strip()[:SEARCH_MAX_LEN]
+    if fuzzy and db.engine.dialect.name == "postgresql":
+        return literal(text).op("<%")(SEARCH_DOC)
+    return SEARCH_DOC.icontains(text, autoescape=True)
+
+
+def history_query(user_id: str, before=None, search=None, fuzzy=False):
+    """
+    user_id 의 기록을 최신순으로
+    - before=(created_at, id) 면 그보다 오래된 것만
+    - search 가 있으면 입력/출력 본문 검색 결과만
+    """
+    q = RewriteLog.query.filter(RewriteLog.user_id == user_id)
+    if search:
+        q = q.filter(search_filter(search, fuzzy))
+    if before is not None:
+        created_at, row_id = before
+        q = q.filter(
+            RewriteLog.created_at <= created_at,
+            or_(RewriteLog.created_at < created_at, RewriteLog.id < row_id),
+        )
+    return q.order_by(RewriteLog.created_at.desc(), RewriteLog.id.desc())
+
+
+def history_since_query(user_id: str, after):
+    """after=(created_at, id) 보다 새 기록만, 최신순"""
+    created_at, row_id = after
+    q = RewriteLog.query.filter(
+        RewriteLog.user_id == user_id,
+        RewriteLog.created_at >= created_at,
+        or_(RewriteLog.created_at > created_at, RewriteLog.id > row_id),
+    )
+    return q.order_by(RewriteLog.created_at.desc(), RewriteLog.id.desc())
+
+
+def head_cursor(user_id: str):
+    """가장 최근 기록의 cursor (없으면 None) — 인덱스 한 번 조회, 본문 컬럼은 읽지 않음"""
+    row = (
+        history_query(user_id)
+        .with_entities(RewriteLog.created_at, RewriteLog.id)
+        .first()
+    )
+    return encode_cursor(row.created_at, row.id) if row else None
+
+
+def history_page(user_id: str, limit: int, before=None, search=None, fuzzy=False):
+    """(rows, next_cursor) — 더 없으면 next_cursor=None"""
+    rows = history_query(user_id, before, search, fuzzy).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
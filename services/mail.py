@@ -21,6 +21,16 @@ def _get_env(name: str, default: str | None = None) -> str:
     return v
 
 
+def _spawn(target, *args) -> None:
+    """
+    발송은 요청 스레드 밖에서 처리.
+    - sync 워커: daemon Thread
+    - gevent 워커(core/wsgi_gevent.py): threading 이 monkey patch 되어 greenlet 으로 실행됨
+    발송 함수들은 app context 없이 os.environ 만 읽으므로 두 모드 모두 안전하다.
+    """
+    Thread(target=target, args=args, daemon=True).start()
+
+
 # =========================
 # Resend sender
 # =========================
@@ -99,7 +109,7 @@ def _send_email_reset_link_sync(email: str, link: str) -> bool:
 
 
 def send_email_reset_link_async(email: str, link: str) -> None:
-    Thread(target=_send_email_reset_link_sync, args=(email, link), daemon=True).start()
+    _spawn(_send_email_reset_link_sync, email, link)
 
 
 # ---- Email verify ----
@@ -120,7 +130,7 @@ def _send_email_verify_link_sync(email: str, link: str) -> bool:
 
 
 def send_email_verify_link_async(email: str, link: str) -> None:
-    Thread(target=_send_email_verify_link_sync, args=(email, link), daemon=True).start()
+    _spawn(_send_email_verify_link_sync, email, link)
 
 
 # ---- Tokens ----
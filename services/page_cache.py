@@ -0,0 +1,228 @@
+"""
+page_cache.py — 정적 콘텐츠 페이지(블로그/Learn) 렌더 결과 캐시 + 조건부 GET
+
+- 콘텐츠는 배포 때만 바뀌므로 (엔드포인트, slug, locale, host, 광고 노출 여부) 별로 렌더 HTML 을 워커 메모리에 보관
+- 캐시 대상은 비로그인 + 쿼리스트링 없는 요청만 (헤더의 사용자 영역 / NEXT_URL 이 요청마다 달라짐)
+- CSP nonce 는 요청마다 다르므로 placeholder 로 렌더해 두고 응답 직전에 현재 nonce 로 치환
+- ETag = placeholder 상태 HTML 의 해시, Last-Modified = 콘텐츠/템플릿 파일의 최종 수정 시각
+    → If-None-Match / If-Modified-Since 가 맞으면 304 (본문 없음)
+- 로그인 사용자는 매번 렌더하지만 같은 방식으로 ETag 를 붙여 304 를 받을 수 있다 (private, no-cache)
+
+anonymous_page_cache (메인/구독/요약 등 동적 뷰용 데코레이터)
+- 비로그인 GET(쿼리스트링 없음) 응답 본문을 (경로, locale, SHOW_ADS, theme) 키로 짧은 TTL 동안 재사용
+    1차 워커 메모리, 2차 Redis(있으면) — PAGE_CACHE_TTL
+- 렌더 중에는 nonce / csrf_token() 을 placeholder 로 바꿔 두고, 응답마다 현재 nonce 와 이 세션의 CSRF 토큰으로 치환
+- 렌더 중 세션을 바꿨거나 쿠키를 심는 응답, 200 text/html 이 아닌 응답은 저장하지 않는다
+"""
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, g, make_response, render_template, request, session
+from flask_babel import get_locale
+from flask_wtf.csrf import generate_csrf
+
+from auth.guards import resolve_tier
+from core.extensions import get_redis
+
+NONCE_PLACEHOLDER = "__LEXINOA_CSP_NONCE__"
+CSRF_PLACEHOLDER = "__LEXINOA_CSRF_TOKEN__"
+
+_pages = {}  # key -> (html, etag)
+_MAX_ENTRIES = 2000  # Host 헤더 등으로 키가 무한히 늘지 않게 상한
+_last_modified = None
+
+
+def content_last_modified() -> datetime:
+    """콘텐츠 모듈 + 템플릿 중 가장 최근 mtime (워커당 1회 계산)"""
+    global _last_modified
+    if _last_modified is None:
+        root = current_app.root_path
+        paths = [
+            os.path.join(root, "routes", "web", "blog.py"),
+            os.path.join(root, "routes", "web", "learn.py"),
+        ]
+        for base, _dirs, files in os.walk(os.path.join(root, current_app.template_folder or "templates")):
+            paths.extend(os.path.join(base, f) for f in files if f.endswith(".html"))
+        mtime = max((os.path.getmtime(p) for p in paths if os.path.exists(p)), default=0)
+        _last_modified = datetime.fromtimestamp(int(mtime), tz=timezone.utc)
+    return _last_modified
+
+
+def _render_with_placeholder(template: str, ctx: dict) -> str:
+    real = g.get("csp_nonce", "")
+    g.csp_nonce = NONCE_PLACEHOLDER
+    try:
+        return render_template(template, **ctx)
+    finally:
+        g.csp_nonce = real
+
+
+def _etag(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()[:32]
+
+
+def _show_ads() -> bool:
+    cfg = current_app.config
+    return bool(cfg.get("ADS_ENABLED") and resolve_tier() in {"guest", "free"})
+
+
+def render_content_page(cache_key: tuple, template: str, **ctx):
+    """
+    정적 콘텐츠 페이지 응답
+    - cache_key: 엔드포인트/slug 등 페이지 식별자 (locale, host, 광고 노출 여부는 여기서 덧붙인다)
+    """
+    cfg = current_app.config
+    anonymous = not session.get("user") and not request.query_string
+
+    if anonymous:
+        key = (*cache_key, str(get_locale() or ""), request.host, _show_ads())
+        entry = _pages.get(key)
+        if entry is None:
+            html = _render_with_placeholder(template, ctx)
+            entry = (html, _etag(html))
+            if len(_pages) < _MAX_ENTRIES:
+                _pages[key] = entry
+        html, etag = entry
+        max_age = int(cfg.get("CONTENT_CACHE_MAX_AGE", 3600))
+        cache_control = f"public, max-age={max_age}"
+    else:
+        html = _render_with_placeholder(template, ctx)
+        etag = _etag(html)
+        cache_control = "private, no-cache"
+
+    resp = make_response(html.replace(NONCE_PLACEHOLDER, g.get("csp_nonce", "")))
+    resp.set_etag(etag)
+    resp.last_modified = content_last_modified()
+    resp.headers["Cache-Control"] = cache_control
+    resp.vary.update(("Cookie", "Accept-Language"))
+    # 304 면 본문 제거 (security.headers 는 304 에 CSP 를 붙이지 않아 캐시된 본문의 nonce 와 어긋나지 않음)
+    return resp.make_conditional(request)
+
+
+def clear_page_cache() -> None:
+    global _last_modified
+    _pages.clear()
+    _last_modified = None
+
+
+# -------------------- 비로그인 전체 페이지 캐시 --------------------
+_anon_pages = {}  # key -> (expires_at, html)
+_anon_lock = threading.Lock()
+
+
+def _anon_key(extra: tuple) -> str:
+    theme = request.cookies.get("theme") or ""
+    raw = "|".join(map(str, (request.path, str(get_locale() or ""), _show_ads(), theme, request.host, *extra)))
+    return "pc:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _anon_get(key: str):
+    now = time.time()
+    entry = _anon_pages.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    r = get_redis() if current_app.config.get("PAGE_CACHE_REDIS", True) else None
+    if r is None:
+        return None
+    try:
+        raw = r.get(key)
+    except Exception:
+        return None
+    if raw is None:
+        return None
+    html = raw.decode("utf-8")
+    _anon_put_local(key, html, now)
+    return html
+
+
+def _anon_put_local(key: str, html: str, now: float) -> None:
+    ttl = int(current_app.config.get("PAGE_CACHE_TTL", 60))
+    with _anon_lock:
+        if len(_anon_pages) >= _MAX_ENTRIES:
+            for k in [k for k, (exp, _h) in _anon_pages.items() if exp <= now]:
+                del _anon_pages[k]
+            if len(_anon_pages) >= _MAX_ENTRIES:
+                return
+        _anon_pages[key] = (now + ttl, html)
+
+
+def _anon_put(key: str, html: str) -> None:
+    _anon_put_local(key, html, time.time())
+    r = get_redis() if current_app.config.get("PAGE_CACHE_REDIS", True) else None
+    if r is not None:
+        try:
+            r.set(key, html.encode("utf-8"), ex=int(current_app.config.get("PAGE_CACHE_TTL", 60)))
+        except Exception:
+            pass
+
+
+def _fill_placeholders(html: str) -> str:
+    html = html.replace(NONCE_PLACEHOLDER, g.get("csp_nonce", ""))
+    if CSRF_PLACEHOLDER in html:
+        html = html.replace(CSRF_PLACEHOLDER, generate_csrf())
+    return html
+
+
+def anonymous_page_cache(*, skip_session_keys=()):
+    """
+    비로그인 GET 전체 페이지 캐시 데코레이터 (route 바로 아래, 가드 데코레이터보다 안쪽에 둔다)
+    - skip_session_keys: 세션에 이 키가 있으면 캐시를 쓰지 않음 (1회성 메시지를 pop 하는 템플릿 등)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cacheable = (
+                request.method == "GET"
+                and not request.query_string
+                and current_app.config.get("PAGE_CACHE_TTL", 60) > 0
+                and not session.get("user")
+                and not any(k in session for k in skip_session_keys)
+            )
+            if not cacheable:
+                return view(*args, **kwargs)
+
+            key = _anon_key(tuple(sorted(kwargs.items())))
+            html = _anon_get(key)
+            if html is not None:
+                resp = make_response(_fill_placeholders(html))
+                resp.headers["X-Page-Cache"] = "hit"
+                return resp
+
+            real_nonce = g.get("csp_nonce", "")
+            g.csp_nonce = NONCE_PLACEHOLDER
+            g._page_cache_render = True
+            session_before = dict(session)
+            try:
+                resp = make_response(view(*args, **kwargs))
+            finally:
+                g.csp_nonce = real_nonce
+                g._page_cache_render = False
+
+            html = resp.get_data(as_text=True) if resp.mimetype == "text/html" and not resp.is_streamed else None
+            if (
+                html is not None
+                and resp.status_code == 200
+                and "Set-Cookie" not in resp.headers
+                and dict(session) == session_before
+            ):
+                _anon_put(key, html)
+                resp.headers["X-Page-Cache"] = "miss"
+            if html is not None:
+                resp.set_data(_fill_placeholders(html))
+            return resp
+        return wrapper
+    return decorator
+
+
+def init_page_cache(app):
+    @app.context_processor
+    def _page_cache_placeholders():
+        # 캐시용 렌더 중에는 csrf_token() 이 세션에 토큰을 만들지 않고 placeholder 를 찍게 한다
+        if g.get("_page_cache_render"):
+            return {"csrf_token": lambda: CSRF_PLACEHOLDER}
+        return {}
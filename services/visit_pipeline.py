@@ -0,0 +1,151 @@
+"""
+visit_pipeline.py — 방문 로그 비동기 적재
+
+- before_request(core/hooks.log_visit) 에서는 enqueue_visit() 로 큐에 넣기만 한다 (DB 쓰기 없음)
+- 워커 프로세스마다 writer 스레드 1개가 큐를 모아 COPY 1회로 visits 에 적재
+    (Postgres 가 아니면 executemany INSERT 로 대체)
+- 샘플링: 비로그인 방문은 VISIT_SAMPLE_EVERY 건 중 1건만 남기고 weight=N 으로 기록
+    로그인 방문은 사용자별 조회(마이페이지/관리자 user 필터)를 위해 항상 weight=1 로 기록
+    → 집계는 count(*) 대신 sum(weight)
+- back-pressure: 큐가 가득 차면(=DB 가 느리면) 요청을 기다리게 하지 않고 버리고 dropped 카운터만 올린다
+- 배치마다 일간 집계(visit_daily_stats, services/visit_stats)를 갱신. raw 행 적재는 VISIT_RAW_ENABLED 로 선택
+    raw COPY 와 집계 upsert 는 세션의 같은 커넥션/트랜잭션에서 commit 1회 → 둘 중 하나만 반영되는 일이 없다
+"""
+import atexit
+import csv
+import io
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+
+from core.log import get_logger
+from domain.models import db, Visit
+from services.visit_stats import apply_visit_batch
+
+log = get_logger("visit")
+
+_COLUMNS = ("user_id", "ip", "user_agent", "path", "created_at", "weight")
+
+_queue = None
+_writer_pid = None
+_start_lock = threading.Lock()
+
+_stats = {"enqueued": 0, "sampled_out": 0, "dropped": 0, "written": 0, "failed": 0}
+
+
+def visit_pipeline_stats() -> dict:
+    """현재 워커 프로세스 기준 카운터 (관리자 분석 응답에 포함)"""
+    return dict(_stats, queued=_queue.qsize() if _queue is not None else 0)
+
+
+def enqueue_visit(*, user_id, ip, user_agent, path) -> None:
+    cfg = current_app.config
+
+    weight = 1
+    every = max(1, int(cfg.get("VISIT_SAMPLE_EVERY", 1)))
+    if not user_id and every > 1:
+        if random.randrange(every):
+            _stats["sampled_out"] += 1
+            return
+        weight = every
+
+    q = _ensure_writer()
+    try:
+        q.put_nowait((user_id, ip, user_agent, path, datetime.utcnow(), weight))
+        _stats["enqueued"] += 1
+    except queue.Full:
+        _stats["dropped"] += 1
+
+
+def _ensure_writer():
+    """워커 프로세스마다 1회 writer 시작 (gunicorn fork 이후 첫 요청에서)"""
+    global _queue, _writer_pid
+    pid = os.getpid()
+    if _writer_pid == pid:
+        return _queue
+
+    with _start_lock:
+        if _writer_pid == pid:
+            return _queue
+        app = current_app._get_current_object()
+        _queue = queue.Queue(maxsize=int(app.config.get("VISIT_QUEUE_MAX", 10000)))
+        threading.Thread(target=_writer_loop, args=(app, _queue), name="visit-writer", daemon=True).start()
+        atexit.register(_drain_at_exit, app, _queue)
+        _writer_pid = pid
+    return _queue
+
+
+def _take_batch(q, max_rows: int, max_wait: float) -> list:
+    batch = [q.get()]
+    deadline = time.monotonic() + max_wait
+    while len(batch) < max_rows:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(q.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _writer_loop(app, q):
+    max_rows = int(app.config.get("VISIT_BATCH_MAX", 500))
+    max_wait = float(app.config.get("VISIT_FLUSH_SECONDS", 2.0))
+    while True:
+        batch = _take_batch(q, max_rows, max_wait)
+        with app.app_context():
+            _write_batch(batch)
+
+
+def _drain_at_exit(app, q):
+    batch = []
+    while True:
+        try:
+            batch.append(q.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        with app.app_context():
+            _write_batch(batch)
+
+
+def _write_batch(rows: list) -> None:
+    try:
+        if current_app.config.get("VISIT_RAW_ENABLED", True):
+            if db.engine.dialect.name == "postgresql":
+                _copy_rows(rows)
+            else:
+                db.session.execute(Visit.__table__.insert(), [dict(zip(_COLUMNS, r)) for r in rows])
+        apply_visit_batch(rows)
+        db.session.commit()
+        _stats["written"] += len(rows)
+    except Exception as e:
+        db.session.rollback()
+        # 재시도하지 않음: 방문 로그는 유실 허용, 카운터로만 남긴다
+        _stats["failed"] += len(rows)
+        log.error("visit_write_error", extra={"rows": len(rows), "error": repr(e)})
+    finally:
+        db.session.remove()
+
+
+def _copy_rows(rows: list) -> None:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    for user_id, ip, ua, path, created_at, weight in rows:
+        # csv 의 빈 필드(unquoted) = NULL
+        w.writerow((user_id or "", ip or "", ua, path, created_at.isoformat(sep=" "), weight))
+    buf.seek(0)
+
+    # 세션 트랜잭션의 DBAPI 커넥션 — commit/rollback 은 호출자(_write_batch)의 db.session 이 한다
+    conn = db.session.connection().connection
+    with conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {Visit.__tablename__} ({', '.join(_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
@@ -0,0 +1,137 @@
+"""
+visit_stats.py — 방문 일간 집계 (visit_daily_stats)
+
+- 쓰기: visit_pipeline writer 가 배치마다 apply_visit_batch(rows) 호출
+    (KST 일자, 경로) 별로 hits += sum(weight), user_id / ip 를 HLL 스케치에 합친다
+- 읽기: 관리자 대시보드가 기간 × 경로 행만 읽음 (행 수 = 일수 × 추적 경로 수, raw 방문 수와 무관)
+- 샘플링된 비로그인 방문은 hits 에만 weight 로 보정되고, 고유 ip 는 샘플 기준 추정치다
+"""
+from datetime import datetime, timedelta, timezone, date
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from domain.models import db, Visit, VisitDailyStat
+from utils.hll import HyperLogLog
+from utils.time_utils import KST
+
+
+def kst_day(created_at_utc_naive: datetime) -> date:
+    return created_at_utc_naive.replace(tzinfo=timezone.utc).astimezone(KST).date()
+
+
+def kst_day_bounds_utc(day_from: date, day_to: date):
+    """KST [day_from, day_to] → naive UTC [start, end)"""
+    start = datetime(day_from.year, day_from.month, day_from.day, tzinfo=KST)
+    end = datetime(day_to.year, day_to.month, day_to.day, tzinfo=KST) + timedelta(days=1)
+    return (
+        start.astimezone(timezone.utc).replace(tzinfo=None),
+        end.astimezone(timezone.utc).replace(tzinfo=None),
+    )
+
+
+def _group(rows) -> dict:
+    groups = {}
+    for user_id, ip, _ua, path, created_at, weight in rows:
+        key = (kst_day(created_at), path)
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = [0, HyperLogLog(), HyperLogLog()]
+        g[0] += int(weight or 1)
+        g[1].add(user_id)
+        g[2].add(ip)
+    return groups
+
+
+def apply_visit_batch(rows) -> None:
+    """배치를 (일자, 경로) 행에 누적. 호출자가 commit / rollback 책임"""
+    groups = _group(rows)
+    table = VisitDailyStat.__table__
+    is_pg = db.engine.dialect.name == "postgresql"
+
+    # 워커 간 교착 방지를 위해 키 순서대로 잠근다
+    for (day, path) in sorted(groups):
+        hits, users, ips = groups[(day, path)]
+        if is_pg:
+            db.session.execute(
+                pg_insert(table)
+                .values(day=day, path=path, hits=0, updated_at=datetime.utcnow())
+                .on_conflict_do_nothing(constraint="uq_visit_daily_stats_day_path")
+            )
+        row = (
+            VisitDailyStat.query
+            .filter_by(day=day, path=path)
+            .with_for_update()
+            .first()
+        )
+        if row is None:
+            row = VisitDailyStat(day=day, path=path, hits=0)
+            db.session.add(row)
+
+        row.hits = int(row.hits or 0) + hits
+        row.users_hll = HyperLogLog.from_bytes(row.users_hll).merge(users).to_bytes()
+        row.ips_hll = HyperLogLog.from_bytes(row.ips_hll).merge(ips).to_bytes()
+
+
+def _stat_rows(day_from: date, day_to: date, path: str | None = None):
+    q = VisitDailyStat.query.filter(VisitDailyStat.day >= day_from, VisitDailyStat.day <= day_to)
+    if path:
+        q = q.filter(VisitDailyStat.path == path)
+    return q.all()
+
+
+def daily_hits(day_from: date, day_to: date, path: str | None = None) -> dict:
+    """{KST date: hits}"""
+    out = {}
+    for r in _stat_rows(day_from, day_to, path):
+        out[r.day] = out.get(r.day, 0) + int(r.hits or 0)
+    return out
+
+
+def summarize(day_from: date, day_to: date, path: str | None = None) -> dict:
+    """기간 합계: hits, 고유 user/ip(HLL 합집합), 경로별 hits"""
+    users, ips = HyperLogLog(), HyperLogLog()
+    hits = 0
+    by_path = {}
+    for r in _stat_rows(day_from, day_to, path):
+        hits += int(r.hits or 0)
+        by_path[r.path] = by_path.get(r.path, 0) + int(r.hits or 0)
+        users.merge(HyperLogLog.from_bytes(r.users_hll))
+        ips.merge(HyperLogLog.from_bytes(r.ips_hll))
+    return {
+        "hits": hits,
+        "unique_users": users.count(),
+        "unique_ips": ips.count(),
+        "by_path": by_path,
+    }
+
+
+def rebuild_daily_stats(day_from: date, day_to: date, chunk: int = 5000) -> dict:
+    """
+    raw visits 로부터 기간 집계를 다시 만든다 (도입 시 과거분 backfill / 보정용)
+    - 해당 일자 행을 지우고 다시 누적 → 오늘 날짜는 writer 와 겹칠 수 있으니 과거 일자에 사용
+    """
+    start, end = kst_day_bounds_utc(day_from, day_to)
+    VisitDailyStat.query.filter(
+        VisitDailyStat.day >= day_from,
+        VisitDailyStat.day <= day_to,
+    ).delete(synchronize_session=False)
+
+    q = (
+        db.session.query(Visit.user_id, Visit.ip, Visit.user_agent, Visit.path, Visit.created_at, Visit.weight)
+        .filter(Visit.created_at >= start, Visit.created_at < end)
+        .order_by(Visit.id)
+        .yield_per(chunk)
+    )
+    total = 0
+    batch = []
+    for row in q:
+        batch.append(tuple(row))
+        if len(batch) >= chunk:
+            apply_visit_batch(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        apply_visit_batch(batch)
+        total += len(batch)
+    db.session.commit()
+    return {"ok": True, "rows": total, "from": day_from.isoformat(), "to": day_to.isoformat()}
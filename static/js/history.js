@@ -1 +1,94 @@
-// This script is deprecated. Theme toggling is now handled by the global theme-toggle.js
+// static/js/history.js — /history 무한 스크롤 (keyset cursor 로 다음 페이지를 이어 붙임)
+document.addEventListener("DOMContentLoaded", () => {
+  const more = document.getElementById("historyMore");
+  const tbody = document.getElementById("historyRows");
+  const btn = document.getElementById("historyMoreBtn");
+  if (!more || !tbody) return;
+
+  let cursor = more.dataset.cursor;
+  let loading = false;
+
+  const cell = (text, className) => {
+    const td = document.createElement("td");
+    if (className) td.className = className;
+    td.textContent = text;
+    return td;
+  };
+
+  const chips = (values) => {
+    const td = document.createElement("td");
+    const box = document.createElement("div");
+    box.className = "chips";
+    (values || []).forEach((v) => {
+      const chip = document.createElement("span");
+      chip.className = "chip";
+      chip.textContent = v;
+      box.appendChild(chip);
+    });
+    td.appendChild(box);
+    return td;
+  };
+
+  const yn = (v) => (v ? "Y" : "N");
+
+  const row = (r) => {
+    const tr = document.createElement("tr");
+    tr.appendChild(cell(r.created_at, "nowrap mono"));
+    tr.appendChild(cell(r.input_text, "pre"));
+    tr.appendChild(chips(r.categories));
+    tr.appendChild(chips(r.tones));
+    tr.appendChild(cell(`존댓: ${yn(r.honorific)} | 인사: ${yn(r.opener)} | 이모지: ${yn(r.emoji)}`, "mono"));
+    tr.appendChild(cell(r.output_text, "pre"));
+    return tr;
+  };
+
+  const done = () => {
+    cursor = null;
+    if (observer) observer.disconnect();
+    more.remove();
+  };
+
+  const loadMore = async () => {
+    if (loading || !cursor) return;
+    loading = true;
+    if (btn) btn.disabled = true;
+    try {
+      const params = new URLSearchParams({ cursor });
+      if (more.dataset.q) params.set("q", more.dataset.q);
+      if (more.dataset.fuzzy) params.set("fuzzy", more.dataset.fuzzy);
+      const url = `${more.dataset.url}?${params}`;
+      const res = await fetch(url, { credentials: "same-origin", headers: { Accept: "application/json" } });
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      const data = await res.json();
+      const frag = document.createDocumentFragment();
+      (data.items || []).forEach((r) => frag.appendChild(row(r)));
+      tbody.appendChild(frag);
+      if (data.next_cursor) {
+        cursor = data.next_cursor;
+        if (observer) {
+          // 화면이 아직 안 찼으면 sentinel 이 계속 보이는 상태라 콜백이 다시 오지 않음 → 재관찰로 한 번 더 판정
+          observer.unobserve(more);
+          observer.observe(more);
+        }
+      } else {
+        done();
+      }
+    } catch (e) {
+      // 자동 로드는 멈추고 버튼으로 다시 시도할 수 있게 둔다
+      if (observer) observer.disconnect();
+      if (btn) btn.title = more.dataset.error || "";
+    } finally {
+      loading = false;
+      if (btn) btn.disabled = false;
+    }
+  };
+
+  const observer = "IntersectionObserver" in window
+    ? new IntersectionObserver((entries) => {
+        if (entries.some((e) => e.isIntersecting)) loadMore();
+      }, { rootMargin: "400px 0px" })
+    : null;
+
+  if (observer) observer.observe(more);
+  if (btn) btn.addEventListener("click", loadMore);
+});
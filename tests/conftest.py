@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("TEMPLATE_WARMUP", "0")
+
+
+# sqlite 는 INTEGER PRIMARY KEY 만 rowid(자동 증가)로 취급 → BigInteger PK 모델을 테스트 DB 에서 쓸 수 있게
+@compiles(BigInteger, "sqlite")
+def _bigint_sqlite(type_, compiler, **kw):
+    return "INTEGER"
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: TEST_DATABASE_URL(Postgres) 가 있어야 실행")
+    config.addinivalue_line("markers", "bench: 성능 측정 (결과는 -s 로 출력)")
+
+
+def _make_app(monkeypatch, url):
+    from core.config import Config
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", url)
+
+    from app import create_app
+    from core.extensions import db, limiter
+
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    limiter.enabled = False
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _teardown(app):
+    from core.extensions import db, limiter
+
+    limiter.enabled = True
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # 파일 sqlite → QueuePool (커넥션 checkout 수를 셀 수 있음)
+    app = _make_app(monkeypatch, f"sqlite:///{tmp_path / 'test.db'}")
+    yield app
+    _teardown(app)
+
+
+@pytest.fixture
+def pg_app(monkeypatch):
+    """TEST_DATABASE_URL(빈 Postgres DB) 이 있을 때만 — 테스트가 만든 테이블은 끝나고 지운다"""
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL not set")
+    app = _make_app(monkeypatch, url)
+    yield app
+    from core.extensions import db
+
+    with app.app_context():
+        db.drop_all()
+    _teardown(app)
@@ -0,0 +1,17 @@
+# gevent_load_app.py
+# test_gevent_load 전용 gunicorn 진입점 — 운영 진입점 앱에 느린 외부 API 를 흉내 내는 라우트 1개 추가
+# - LOADTEST_ENTRY=sync: core.wsgi (monkey patch 없음) / 그 외: core.wsgi_gevent
+# - LOADTEST_UPSTREAM: 테스트가 띄운 지연 응답 HTTP 서버
+import os
+
+if os.environ.get("LOADTEST_ENTRY") == "sync":
+    from core.wsgi import app
+else:
+    from core.wsgi_gevent import app  # monkey patch 가 requests import 보다 먼저
+
+import requests  # noqa: E402
+
+
+@app.get("/_loadtest/upstream")
+def _loadtest_upstream():
+    return requests.get(os.environ["LOADTEST_UPSTREAM"], timeout=5).text
@@ -0,0 +1,55 @@
+"""services/account_delete — 탈퇴 요청/복구/확정이 구조화 로그(core.log)로 남는지"""
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.extensions import db
+from core.log import get_logger
+from domain.models import User
+from services import account_delete
+
+
+@pytest.fixture
+def records():
+    seen = []
+
+    class _Collect(logging.Handler):
+        def emit(self, record):
+            seen.append(record)
+
+    logger = get_logger("account_delete")
+    handler = _Collect(level=logging.DEBUG)
+    logger.addHandler(handler)
+    yield seen
+    logger.removeHandler(handler)
+
+
+@pytest.fixture
+def user_pk(app):
+    with app.app_context():
+        u = User(email="bye@example.com", password_hash="x", user_id="u-bye")
+        db.session.add(u)
+        db.session.commit()
+        return u.id
+
+
+def test_delete_restore_purge_are_logged(app, user_pk, records, capsys):
+    with app.app_context():
+        assert account_delete.request_account_delete(user_pk, reason="안 써요")["ok"]
+        assert account_delete.restore_account(user_pk)["ok"]
+        assert account_delete.request_account_delete(user_pk, reason="x" * 500)["ok"]
+        db.session.get(User, user_pk).purge_after = datetime.utcnow() - timedelta(days=1)
+        db.session.commit()
+        assert account_delete.restore_account(user_pk) == {"ok": False, "error": "purge_expired"}
+        assert account_delete.purge_expired_accounts()["purged"] == 1
+
+    assert [r.getMessage() for r in records] == [
+        "delete_requested", "restored", "delete_requested", "restore_rejected", "final_delete", "purged",
+    ]
+    first, second = records[0], records[2]
+    assert (first.uid, first.user_pk, first.reason) == ("u-bye", user_pk, "안 써요")
+    assert second.reason == "[redacted len=500]"
+    assert records[3].levelno == logging.WARNING
+    assert records[-1].count == 1
+    assert capsys.readouterr().out == ""  # print() 없음
@@ -0,0 +1,139 @@
+"""/api/history (cursor / fields / preview / ETag) + /api/history/<id>"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.extensions import db
+from domain.models import RewriteLog, Subscription, User
+
+BASE = datetime(2026, 10, 1, 9, 0, 0)
+
+
+def _add_logs(user_id, n, start=0):
+    for i in range(start, start + n):
+        db.session.add(RewriteLog(
+            user_id=user_id, input_text=f"입력 {i} " + "가" * 200, output_text=f"출력 {i} " + "나" * 200,
+            categories=["polite"], tones=["soft"], model_name="claude", created_at=BASE + timedelta(minutes=i),
+        ))
+    db.session.commit()
+
+
+@pytest.fixture
+def pro_client(app):
+    with app.app_context():
+        db.session.add(User(email="pro@example.com", password_hash="x", user_id="u-pro"))
+        db.session.add(Subscription(user_id="u-pro", status="active", plan_name="pro", plan_amount=9900,
+                                    next_billing_at=datetime.utcnow() + timedelta(days=20)))
+        db.session.add(User(email="other@example.com", password_hash="x", user_id="u-other"))
+        db.session.commit()
+        _add_logs("u-pro", 12)
+        _add_logs("u-other", 2)
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user"] = {"user_id": "u-pro"}
+    return client
+
+
+def _ids(body):
+    return [item["id"] for item in body["items"]]
+
+
+def test_requires_login_and_pro(app):
+    client = app.test_client()
+    assert client.get("/api/history").status_code == 401
+    with app.app_context():
+        db.session.add(User(email="free@example.com", password_hash="x", user_id="u-free"))
+        db.session.commit()
+    with client.session_transaction() as sess:
+        sess["user"] = {"user_id": "u-free"}
+    resp = client.get("/api/history")
+    assert resp.status_code == 403
+    assert resp.get_json()["error"] == "pro_required"
+
+
+def test_default_shape_and_before_paging(app, pro_client):
+    first = pro_client.get("/api/history?limit=5").get_json()
+    assert set(first["items"][0]) == {"id", "created_at", "input_text", "output_text", "categories", "tones", "model"}
+    assert first["items"][0]["input_text"].startswith("입력 11 ")
+
+    seen, cursor = _ids(first), first["next_cursor"]
+    while cursor:
+        body = pro_client.get("/api/history", query_string={"limit": 5, "before": cursor}).get_json()
+        seen.extend(_ids(body))
+        cursor = body["next_cursor"]
+    with app.app_context():
+        expected = [r.id for r in RewriteLog.query.filter_by(user_id="u-pro").order_by(RewriteLog.id.desc())]
+    assert seen == expected
+
+
+def test_since_returns_only_new_rows(app, pro_client):
+    head = pro_client.get("/api/history?limit=3").get_json()["cursor"]
+    assert pro_client.get("/api/history", query_string={"since": head}).get_json()["items"] == []
+
+    with app.app_context():
+        _add_logs("u-pro", 4, start=100)
+    body = pro_client.get("/api/history", query_string={"since": head, "limit": 10}).get_json()
+    assert [i["input_text"].split(" ")[1] for i in body["items"]] == ["103", "102", "101", "100"]
+    assert body["has_more"] is False
+    assert "next_cursor" not in body
+
+    body = pro_client.get("/api/history", query_string={"since": head, "limit": 2}).get_json()
+    assert len(body["items"]) == 2 and body["has_more"] is True
+
+
+def test_fields_projection_and_preview(app, pro_client):
+    app.config["HISTORY_PREVIEW_CHARS"] = 10
+    body = pro_client.get("/api/history?limit=2&fields=output_preview,tones").get_json()
+    item = body["items"][0]
+    # cursor 계산용 id/created_at 은 항상 포함, 본문 전체는 없음
+    assert set(item) == {"id", "created_at", "output_preview", "output_preview_truncated", "tones"}
+    assert item["output_preview"] == "출력 11 나나나나"  # 10자
+    assert item["output_preview_truncated"] is True
+
+
+def test_unknown_field_and_bad_cursor_rejected(pro_client):
+    resp = pro_client.get("/api/history?fields=id,password_hash")
+    assert resp.status_code == 400
+    body = resp.get_json()
+    assert body["error"] == "invalid_fields"
+    assert "output_preview" in body["allowed"] and "password_hash" not in body["allowed"]
+
+    for param in ("before", "since"):
+        resp = pro_client.get("/api/history", query_string={param: "garbage"})
+        assert resp.status_code == 400
+        assert resp.get_json()["error"] == "invalid_cursor"
+
+
+def test_etag_304_until_new_row(app, pro_client):
+    first = pro_client.get("/api/history?limit=5&fields=output_preview")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    again = pro_client.get("/api/history?limit=5&fields=output_preview", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+    # 파라미터가 다르면 다른 표현
+    other = pro_client.get("/api/history?limit=6&fields=output_preview", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+    with app.app_context():
+        _add_logs("u-pro", 1, start=200)
+    changed = pro_client.get("/api/history?limit=5&fields=output_preview", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_detail_is_owner_only(app, pro_client):
+    with app.app_context():
+        mine = RewriteLog.query.filter_by(user_id="u-pro").first()
+        theirs = RewriteLog.query.filter_by(user_id="u-other").first()
+        mine_id, mine_text, theirs_id = mine.id, mine.input_text, theirs.id
+
+    resp = pro_client.get(f"/api/history/{mine_id}")
+    assert resp.status_code == 200
+    assert resp.get_json()["input_text"] == mine_text
+    assert resp.headers["Cache-Control"] == "private, max-age=86400"
+
+    assert pro_client.get(f"/api/history/{theirs_id}").status_code == 404
+    assert pro_client.get("/api/history/999999").status_code == 404
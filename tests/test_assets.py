@@ -0,0 +1,93 @@
+import gzip
+import hashlib
+import json
+import os
+
+import pytest
+from flask import url_for
+
+from core import assets
+
+JS = b"function hello(){return 'hi';}\n" * 40
+CSS = b"body { color: #333; }\n" * 40
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "js").mkdir()
+    (tmp_path / "css").mkdir()
+    (tmp_path / "js" / "app.js").write_bytes(JS)
+    (tmp_path / "css" / "site.css").write_bytes(CSS)
+    (tmp_path / ".hidden").write_bytes(b"x")
+    return tmp_path
+
+
+def test_build_assets_fingerprints_and_writes_manifest(static_dir):
+    manifest = assets.build_assets(str(static_dir), minify=False)
+
+    digest = hashlib.sha256(JS).hexdigest()[:8]
+    assert manifest["js/app.js"] == f"dist/js/app.{digest}.js"
+    assert set(manifest) == {"js/app.js", "css/site.css"}
+    assert json.loads((static_dir / "dist" / "manifest.json").read_text()) == manifest
+    assert assets.load_manifest(str(static_dir)) == manifest
+
+    built = static_dir / manifest["js/app.js"]
+    assert built.read_bytes() == JS
+    assert gzip.decompress((static_dir / (manifest["js/app.js"] + ".gz")).read_bytes()) == JS
+
+    # 다시 빌드해도 dist/ 자체는 소스로 취급하지 않음
+    assert assets.build_assets(str(static_dir), minify=False) == manifest
+    assert not os.path.exists(str(static_dir / "dist.tmp"))
+
+
+def test_url_for_static_uses_manifest(app, static_dir, monkeypatch):
+    manifest = assets.build_assets(str(static_dir), minify=False)
+    monkeypatch.setattr(assets, "_manifest", manifest)
+
+    with app.test_request_context("/"):
+        assert url_for("static", filename="js/app.js") == "/static/" + manifest["js/app.js"]
+        # manifest 에 없는 파일은 그대로
+        assert url_for("static", filename="img/logo.png") == "/static/img/logo.png"
+
+    monkeypatch.setattr(assets, "_manifest", {})
+    with app.test_request_context("/"):
+        assert url_for("static", filename="js/app.js") == "/static/js/app.js"
+
+
+def test_dist_responses_are_immutable(app, static_dir):
+    manifest = assets.build_assets(str(static_dir), minify=False)
+    app.static_folder = str(static_dir)
+    client = app.test_client()
+
+    resp = client.get("/static/" + manifest["css/site.css"], headers={"Accept-Encoding": "identity"})
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert resp.data == CSS
+
+    gz = client.get("/static/" + manifest["css/site.css"], headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gz.data) == CSS
+
+    # dist/ 밖의 원본은 fingerprint 가 없으므로 immutable 이 아니다
+    src = client.get("/static/css/site.css")
+    assert "immutable" not in (src.headers.get("Cache-Control") or "")
+
+
+def test_precompressed_respects_q0(app, tmp_path):
+    dist = tmp_path / "dist" / "js"
+    dist.mkdir(parents=True)
+    body = b"console.log('hi');" * 100
+    (dist / "app.abc123.js").write_bytes(body)
+    (dist / "app.abc123.js.gz").write_bytes(gzip.compress(body))
+    app.static_folder = str(tmp_path)
+    client = app.test_client()
+
+    gz = client.get("/static/dist/js/app.abc123.js", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers.get("Content-Encoding") == "gzip"
+    assert gzip.decompress(gz.data) == body
+
+    refused = client.get("/static/dist/js/app.abc123.js", headers={"Accept-Encoding": "gzip;q=0, br;q=0"})
+    assert "Content-Encoding" not in refused.headers
+    assert refused.data == body
+    assert "Accept-Encoding" in refused.headers.get("Vary", "")
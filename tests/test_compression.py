@@ -0,0 +1,137 @@
+import gzip
+import json
+import time
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify, request
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+
+from core.compression import CompressionMiddleware
+
+
+BIG = {"items": [f"문장 {i} 을 다듬어 주세요." for i in range(300)]}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.get("/big")
+    def big():
+        return jsonify(BIG)
+
+    @app.get("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.get("/etag")
+    def etag():
+        resp = jsonify(BIG)
+        resp.set_etag("v1")
+        return resp.make_conditional(request)
+
+    @app.get("/stream")
+    def stream():
+        return Response((f"line {i}\n" * 50 for i in range(20)), mimetype="text/plain")
+
+    @app.get("/sse")
+    def sse():
+        return Response((f"data: {i}\n\n" * 100 for i in range(5)), mimetype="text/event-stream")
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, min_size=1024, gzip_level=6)
+    return app.test_client()
+
+
+def test_gzip_buffered_response(client):
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert int(resp.headers["Content-Length"]) == len(resp.data)
+    assert json.loads(gzip.decompress(resp.data)) == BIG
+    assert "Accept-Encoding" in resp.headers["Vary"]
+
+
+def test_q0_refuses_compression(client):
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip;q=0, br;q=0"})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.get_json() == BIG
+    assert "Accept-Encoding" in resp.headers["Vary"]
+
+
+def test_small_body_below_cutoff_is_not_compressed(client):
+    resp = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.get_json() == {"ok": True}
+
+
+def test_event_stream_is_not_compressed(client):
+    resp = client.get("/sse", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.data.startswith(b"data: 0")
+
+
+def test_streamed_generator_is_compressed_per_chunk(client):
+    resp = client.get("/stream", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in resp.headers
+    chunks = list(resp.response)
+    resp.close()
+    assert len(chunks) > 1  # 한 번에 모으지 않고 chunk 마다 흘려보냄
+    d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # 각 chunk 는 sync flush 돼 있어 받은 만큼 바로 풀린다
+    first = d.decompress(chunks[0])
+    assert first.startswith(b"line 0\n")
+    rest = first + b"".join(d.decompress(c) for c in chunks[1:])
+    assert rest == "".join(f"line {i}\n" * 50 for i in range(20)).encode()
+
+
+def test_etag_suffix_round_trip(client):
+    first = client.get("/etag", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert first.headers["ETag"] == '"v1-gzip"'
+
+    again = client.get("/etag", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == '"v1-gzip"'
+    assert again.data == b""
+
+    # 압축하지 않는 클라이언트는 원래 ETag 그대로
+    plain = client.get("/etag", headers={"Accept-Encoding": "identity", "If-None-Match": '"v1"'})
+    assert plain.status_code == 304
+    assert plain.headers["ETag"] == '"v1"'
+
+
+def test_proxyfix_is_outermost(app):
+    assert isinstance(app.wsgi_app, ProxyFix)
+    assert isinstance(app.wsgi_app.app, CompressionMiddleware)
+
+
+def _payload_app(body: bytes):
+    def wsgi(environ, start_response):
+        return Response(body, mimetype="application/json")(environ, start_response)
+    return wsgi
+
+
+@pytest.mark.bench
+def test_bench_gzip_json_payload():
+    rows = [{"id": i, "input_text": f"문장 {i} 을 다듬어 주세요.", "output_text": f"문장 {i}을 다듬어 주세요."}
+            for i in range(2000)]
+    body = json.dumps(rows, ensure_ascii=False).encode("utf-8")
+    raw = Client(_payload_app(body))
+    compressed = Client(CompressionMiddleware(_payload_app(body), gzip_level=6))
+
+    def run(client, headers, n=50):
+        started = time.perf_counter()
+        for _ in range(n):
+            resp = client.get("/", headers=headers)
+        return resp, (time.perf_counter() - started) * 1000 / n
+
+    plain, plain_ms = run(raw, {})
+    gz, gz_ms = run(compressed, {"Accept-Encoding": "gzip"})
+    print(f"\njson {len(body)}B: identity {plain_ms:.2f}ms/req, gzip {len(gz.data)}B {gz_ms:.2f}ms/req")
+
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gz.data) == plain.data == body
+    assert len(gz.data) < len(body) / 4
@@ -0,0 +1,86 @@
+"""provider(LLM) 호출 동안 풀 커넥션을 잡고 있지 않는지 — core.extensions.release_db_connection"""
+from sqlalchemy import text
+
+from core.extensions import db
+from domain.models import User
+
+
+def _checkout_in_request():
+    # 요청 앞단(load_user 등)에서 쿼리가 한 번 나간 상태를 만든다
+    db.session.execute(text("SELECT 1"))
+    assert db.engine.pool.checkedout() == 1
+
+
+def test_summarize_provider_call_holds_no_connection(app, monkeypatch):
+    from generator import claude_prompt_generator
+    from routes.web import summerize
+
+    seen = []
+
+    def fake_call_claude(system, prompt):
+        seen.append(db.engine.pool.checkedout())
+        return "요약"
+
+    monkeypatch.setattr(claude_prompt_generator, "call_claude", fake_call_claude)
+    monkeypatch.setattr(summerize, "_as_text_from_claude_result", lambda r: r)
+
+    with app.test_request_context("/api/summarize", method="POST"):
+        _checkout_in_request()
+        out = summerize._call_provider_summarize("원문", provider="claude")
+
+    assert out == "요약"
+    assert seen == [0]
+
+
+def test_rewrite_provider_call_holds_no_connection(app, monkeypatch):
+    from services.ai import router
+
+    seen = []
+
+    def fake_call_claude_and_log(*args, **kwargs):
+        seen.append(db.engine.pool.checkedout())
+        return ["a", "b"]
+
+    monkeypatch.setattr(router, "call_claude_and_log", fake_call_claude_and_log)
+
+    with app.test_request_context("/api/rewrite/single", method="POST"):
+        _checkout_in_request()
+        outputs = router._get_ai_outputs(
+            provider="claude",
+            input_text="안녕하세요",
+            selected_categories=[],
+            selected_tones=[],
+            honorific_checked=False,
+            opener_checked=False,
+            emoji_checked=False,
+            n_outputs=2,
+            user_job="",
+            user_job_detail="",
+        )
+
+    assert outputs == ["a", "b"]
+    assert seen == [0]
+
+
+def test_current_user_is_reattached_after_release(app):
+    from flask import g
+
+    from auth.entitlements import get_current_user
+    from core.extensions import release_db_connection
+
+    with app.app_context():
+        db.session.add(User(user_id="u1", email="u1@example.com", password_hash="x"))
+        db.session.commit()
+
+    with app.test_request_context("/"):
+        g.current_user = db.session.query(User).filter_by(user_id="u1").one()
+        release_db_connection()
+        assert db.engine.pool.checkedout() == 0
+
+        user = get_current_user()
+        assert user in db.session  # 새 세션에 merge 됨 (SELECT 없이)
+        user.display_name = "바뀐 이름"
+        db.session.commit()
+
+    with app.app_context():
+        assert db.session.query(User).filter_by(user_id="u1").one().display_name == "바뀐 이름"
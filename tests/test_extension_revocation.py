@@ -0,0 +1,96 @@
+"""서명 확장 토큰(lx1.) 폐기가 Redis 장애/flush 와 무관하게 반영되는지 — services/extension_oauth"""
+import pytest
+
+from services import extension_oauth as eo
+
+fakeredis = pytest.importorskip("fakeredis")
+
+VERIFIER = "v" * 43
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    server = fakeredis.FakeServer()
+    r = fakeredis.FakeRedis(server=server)
+    monkeypatch.setattr(eo, "get_redis", lambda: r)
+    return server, r
+
+
+@pytest.fixture
+def ctx(app, monkeypatch):
+    app.config["EXT_REVOCATION_REFRESH"] = 0  # 매 검증마다 갱신
+    _fresh_worker(monkeypatch)
+    with app.app_context():
+        yield app
+
+
+def _fresh_worker(monkeypatch):
+    # 새로 뜬 워커 = 모듈 상태가 비어 있음
+    monkeypatch.setattr(eo, "_revoked", frozenset())
+    monkeypatch.setattr(eo, "_revoked_loaded_at", 0.0)
+    monkeypatch.setattr(eo, "_revoked_db", {})
+    monkeypatch.setattr(eo, "_revoked_db_seen", None)
+
+
+def _snapshot():
+    return eo._revoked, eo._revoked_db.copy(), eo._revoked_db_seen
+
+
+def _restore(monkeypatch, snap):
+    revoked, revoked_db, seen = snap
+    monkeypatch.setattr(eo, "_revoked", revoked)
+    monkeypatch.setattr(eo, "_revoked_loaded_at", 0.0)
+    monkeypatch.setattr(eo, "_revoked_db", revoked_db)
+    monkeypatch.setattr(eo, "_revoked_db_seen", seen)
+
+
+def _issue(user_id="u-ext"):
+    code = eo.issue_auth_code(
+        user_id=user_id, redirect_uri="https://ext/cb", code_challenge=eo._base64url_sha256(VERIFIER), state=None,
+    )
+    out = eo.exchange_code_for_token(code=code, code_verifier=VERIFIER, redirect_uri="https://ext/cb")
+    assert out["ok"]
+    return out["access_token"]
+
+
+def test_revoke_while_redis_down_reaches_other_workers(ctx, redis_server, monkeypatch):
+    server, r = redis_server
+    token = _issue()
+    r.zadd(eo.REVOKED_KEY, {"other-token": 9_999_999_999})  # ZSET 는 존재 (seed 경로가 아님)
+
+    # 워커 A: 이미 떠서 폐기 집합을 한 번 읽은 상태
+    assert eo.find_user_id_by_bearer_token(token) == "u-ext"
+    worker_a = _snapshot()
+
+    # 워커 B: Redis 장애 중에 폐기 → DB 만 기록됨
+    server.connected = False
+    assert eo.revoke_user_extension_tokens("u-ext") == 1
+    server.connected = True
+    assert r.zcard(eo.REVOKED_KEY) == 1  # other-token 만
+
+    # 워커 A 의 다음 갱신: ZSET 에는 없지만 DB 증분 조회로 거부
+    _restore(monkeypatch, worker_a)
+    assert eo.find_user_id_by_bearer_token(token) is None
+
+
+def test_revoke_survives_redis_flush(ctx, redis_server, monkeypatch):
+    _server, r = redis_server
+    token = _issue()
+    assert eo.revoke_user_extension_tokens("u-ext") == 1
+    r.flushall()
+
+    _fresh_worker(monkeypatch)
+    assert eo.find_user_id_by_bearer_token(token) is None
+    # 비어 있던 ZSET 은 DB 기준으로 다시 채워진다
+    assert r.zcard(eo.REVOKED_KEY) == 1
+
+
+def test_revoke_without_redis(ctx, monkeypatch):
+    monkeypatch.setattr(eo, "get_redis", lambda: None)
+    token = _issue()
+    other = _issue("u-other")
+    assert eo.revoke_user_extension_tokens("u-ext") == 1
+
+    _fresh_worker(monkeypatch)
+    assert eo.find_user_id_by_bearer_token(token) is None
+    assert eo.find_user_id_by_bearer_token(other) == "u-other"
@@ -0,0 +1,126 @@
+"""
+gevent 워커(core.wsgi_gevent) vs sync 워커 부하 테스트
+- 워커 1개에 외부 API(지연 UPSTREAM_DELAY 초) 를 기다리는 요청 N 개를 동시에 보낸다
+- sync 워커는 요청을 하나씩 처리하므로 ≈ N x 지연, gevent 는 monkey patch 로 대기가 겹쳐 ≈ 지연 몇 회분
+- 같은 부하를 두 워커에 실제로 걸어 측정한 시간 비율을 비교한다
+gunicorn / gevent / psycogreen 이 없으면 skip
+"""
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("gunicorn")
+pytest.importorskip("gevent")
+pytest.importorskip("psycogreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPSTREAM_DELAY = 0.3
+REQUESTS = 20
+
+
+class _SlowUpstream(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(UPSTREAM_DELAY)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url, timeout=10):
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        return resp.status, resp.read()
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowUpstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+
+def _start_server(worker_class, upstream, tmp_path):
+    port = _free_port()
+    env = dict(
+        os.environ,
+        SECRET_KEY="test-secret",
+        DATABASE_URL=f"sqlite:///{tmp_path / 'load.db'}",
+        TEMPLATE_WARMUP="0",
+        LOADTEST_UPSTREAM=upstream,
+        LOADTEST_ENTRY=worker_class,
+        PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "tests")]),
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-k", worker_class, "-w", "1", "--worker-connections", "100",
+         "-b", f"127.0.0.1:{port}", "gevent_load_app:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            _get(base + "/health", timeout=1)
+            break
+        except OSError:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                proc.kill()
+                pytest.fail(f"gunicorn ({worker_class}) did not start: "
+                            + proc.stderr.read().decode(errors="replace")[-2000:])
+            time.sleep(0.2)
+    return proc, base
+
+
+@pytest.fixture
+def server_factory(upstream, tmp_path):
+    procs = []
+
+    def start(worker_class):
+        (tmp_path / worker_class).mkdir()
+        proc, base = _start_server(worker_class, upstream, tmp_path / worker_class)
+        procs.append(proc)
+        return base
+
+    yield start
+    for proc in procs:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def _load(base):
+    url = base + "/_loadtest/upstream"
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=REQUESTS) as pool:
+        results = list(pool.map(lambda _: _get(url, timeout=30), range(REQUESTS)))
+    return results, time.perf_counter() - started
+
+
+@pytest.mark.bench
+def test_gevent_worker_vs_sync_worker(server_factory):
+    gevent_results, gevent_s = _load(server_factory("gevent"))
+    sync_results, sync_s = _load(server_factory("sync"))
+    print(f"\n{REQUESTS} concurrent requests x {UPSTREAM_DELAY}s upstream, 1 worker: "
+          f"sync {sync_s:.2f}s, gevent {gevent_s:.2f}s ({sync_s / gevent_s:.1f}x)")
+
+    assert gevent_results == sync_results == [(200, b"ok")] * REQUESTS
+    # sync 는 직렬 처리 → 지연 합계 이상
+    assert sync_s >= REQUESTS * UPSTREAM_DELAY * 0.9
+    assert sync_s / gevent_s >= 4
@@ -0,0 +1,91 @@
+"""services/history keyset 페이지네이션 + /history/page"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.extensions import db
+from domain.models import RewriteLog
+from services.history import decode_cursor, encode_cursor, history_page
+
+BASE = datetime(2026, 10, 1, 9, 0, 0)
+ROWS = 23
+
+
+@pytest.fixture
+def logs(app):
+    """u-h 의 기록 23건 — 5건씩 같은 created_at (tiebreak 는 id), 다른 사용자 기록도 섞음"""
+    with app.app_context():
+        for i in range(ROWS):
+            ts = BASE + timedelta(minutes=i // 5)
+            db.session.add(RewriteLog(user_id="u-h", input_text=f"in {i}", output_text=f"out {i}",
+                                      categories=[], tones=[], created_at=ts))
+            db.session.add(RewriteLog(user_id="u-other", input_text="x", output_text="y",
+                                      categories=[], tones=[], created_at=ts))
+        db.session.commit()
+        expected = [
+            r.id for r in RewriteLog.query.filter_by(user_id="u-h")
+            .order_by(RewriteLog.created_at.desc(), RewriteLog.id.desc())
+        ]
+    return expected
+
+
+@pytest.mark.parametrize("ts, row_id", [
+    (datetime(2026, 10, 1, 9, 0), 1),
+    (datetime(2026, 10, 1, 9, 0, 0, 123456), 987654321),
+])
+def test_cursor_round_trip(ts, row_id):
+    cursor = encode_cursor(ts, row_id)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor  # URL 에 그대로
+    assert decode_cursor(cursor) == (ts, row_id)
+
+
+@pytest.mark.parametrize("bad", ["", "!!!", "bm90LWEtY3Vyc29y", encode_cursor(BASE, 1)[:-3] + "@@@"])
+def test_decode_rejects_garbage(bad):
+    assert decode_cursor(bad) is None
+
+
+def test_service_pages_cover_ties_without_gaps(app, logs):
+    with app.app_context():
+        seen, before = [], None
+        for page_size in (4, 4, 4, 4, 4, 4):
+            rows, cursor = history_page("u-h", page_size, before=before)
+            seen.extend(r.id for r in rows)
+            if cursor is None:
+                break
+            before = decode_cursor(cursor)
+    assert seen == logs
+    assert len(set(seen)) == ROWS
+
+
+def test_history_page_endpoint_walks_all_rows(app, logs):
+    app.config["HISTORY_PAGE_SIZE"] = 5  # 페이지 경계가 같은 created_at 묶음과 겹치도록
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user"] = {"user_id": "u-h"}
+
+    with app.app_context():
+        first, cursor = history_page("u-h", 5)
+    seen = [r.id for r in first]
+    pages = 1
+    while cursor:
+        resp = client.get("/history/page", query_string={"cursor": cursor})
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body["ok"] is True
+        assert resp.headers["Cache-Control"].startswith("no-store")
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        pages += 1
+
+    assert seen == logs  # 순서 그대로, 중복/누락 없음, 다른 사용자 행 없음
+    assert pages == 5
+
+
+def test_history_page_errors(app, logs):
+    client = app.test_client()
+    assert client.get("/history/page?cursor=x").status_code == 401
+    with client.session_transaction() as sess:
+        sess["user"] = {"user_id": "u-h"}
+    resp = client.get("/history/page", query_string={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "invalid_cursor"
@@ -0,0 +1,83 @@
+"""
+기록 검색 지연 확인 (Postgres 전용, TEST_DATABASE_URL 필요)
+- 사용자 200명 x 500건, 모든 행에 흔한 검색어가 들어 있는 테이블에서 한 사용자 검색이
+  복합 GIN 인덱스(idx_rewritelog_search_trgm: user_id + trigram) 한 번으로 처리되고 수십 ms 안에 끝나는지
+"""
+import importlib.util
+import json
+import os
+
+import pytest
+from sqlalchemy import text
+
+from core.extensions import db
+from services.history import history_query
+
+USERS = 200
+ROWS_PER_USER = 500
+BUDGET_MS = 50
+
+_MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "migrations", "versions", "5b2e9f4c7a13_add_rewrite_logs_search_trgm_index.py",
+)
+
+
+def _search_doc_sql():
+    spec = importlib.util.spec_from_file_location("_trgm_migration", _MIGRATION)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod.SEARCH_DOC
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+@pytest.mark.postgres
+@pytest.mark.bench
+def test_search_uses_composite_index_within_budget(pg_app):
+    with pg_app.app_context():
+        db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db.session.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+        db.session.execute(text(
+            "INSERT INTO rewrite_logs (user_id, input_text, output_text, categories, tones, "
+            "honorific, opener, emoji, created_at) "
+            "SELECT 'u' || (g % :users), "
+            "       '오늘 회의 일정 공유드립니다 ' || md5(g::text), "
+            "       '오늘 회의 일정을 공유드립니다 ' || md5((g + 1)::text), "
+            "       '[]', '[]', false, false, false, now() - (g || ' seconds')::interval "
+            "FROM generate_series(1, :n) AS g"
+        ), {"users": USERS, "n": USERS * ROWS_PER_USER})
+        db.session.execute(text(
+            f"CREATE INDEX idx_rewritelog_search_trgm ON rewrite_logs "
+            f"USING gin (user_id, {_search_doc_sql()} gin_trgm_ops)"
+        ))
+        db.session.execute(text("ANALYZE rewrite_logs"))
+        db.session.commit()
+
+        # 흔한 검색어(해당 사용자 모든 행이 매칭) / 드문 검색어(그 사용자의 한 행에만 있는 md5 조각)
+        rare = db.session.execute(text(
+            "SELECT substr(md5(g::text), 1, 12) FROM generate_series(1, :n) AS g WHERE g % :users = 7 LIMIT 1"
+        ), {"users": USERS, "n": USERS * ROWS_PER_USER}).scalar()
+        plans = {q: _explain(q) for q in ("회의 일정", rare)}
+
+    for q, plan in plans.items():
+        nodes = list(_plan_nodes(plan["Plan"]))
+        indexes = {n.get("Index Name") for n in nodes} - {None}
+        print(f"\nsearch {q!r} for one user of {USERS * ROWS_PER_USER} rows: "
+              f"{plan['Execution Time']:.1f}ms, indexes={sorted(indexes)}")
+        assert not any(n["Node Type"] == "Seq Scan" for n in nodes)
+        assert plan["Execution Time"] < BUDGET_MS
+    # 드문 검색어는 복합 GIN 인덱스 한 번으로 (user_id + trigram)
+    assert "idx_rewritelog_search_trgm" in {n.get("Index Name") for n in _plan_nodes(plans[rare]["Plan"])}
+
+
+def _explain(q):
+    stmt = history_query("u7", search=q).limit(21).statement
+    sql = str(stmt.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}))
+    db.session.execute(text(sql)).all()  # 캐시 워밍
+    raw = db.session.execute(text("EXPLAIN (ANALYZE, FORMAT JSON) " + sql)).scalar()
+    return (raw if isinstance(raw, list) else json.loads(raw))[0]
@@ -0,0 +1,70 @@
+"""요청당 identity(User + 구독) 조회는 1회 — auth/entitlements.load_current_user"""
+import pytest
+from sqlalchemy import event
+
+from core.extensions import db
+from domain.models import RewriteLog, User
+
+
+@pytest.fixture
+def user(app):
+    with app.app_context():
+        u = User(email="q@example.com", password_hash="x", user_id="u-q", email_verified=True)
+        db.session.add(u)
+        db.session.commit()
+    return "u-q"
+
+
+def _count_identity_queries(app, fn):
+    seen = []
+
+    def on_execute(conn, cursor, statement, *args):
+        s = " ".join(statement.lower().split())
+        # User row 조회, 또는 엔타이틀먼트용 구독 조회(active/past_due) — 마이페이지의 구독 상세 표시는 제외
+        if "from users" in s or ("from subscriptions" in s and "status in" in s):
+            seen.append(s)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        resp = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return resp, seen
+
+
+@pytest.mark.parametrize("path", ["/", "/mypage", "/api/history"])
+def test_one_identity_query_per_request(app, user, path):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user"] = {"user_id": user}
+
+    resp, seen = _count_identity_queries(app, lambda: client.get(path))
+    assert resp.status_code < 500
+    assert len(seen) == 1, seen
+
+    # 두 번째 요청: 세션 claims 로 tier 판정 → User row 가 필요한 곳에서만 1회 (구독 재조회 없음)
+    resp, seen = _count_identity_queries(app, lambda: client.get(path))
+    assert resp.status_code < 500
+    assert len(seen) <= 1, seen
+    assert all("from users" in s for s in seen), seen
+
+
+def test_polish_one_identity_query(app, user, monkeypatch):
+    from generator import claude_prompt_generator
+
+    monkeypatch.setattr(claude_prompt_generator, "call_claude", lambda system, prompt: "1) 다듬은 문장입니다.")
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user"] = {"user_id": user}
+
+    resp, seen = _count_identity_queries(
+        app, lambda: client.post("/api/polish", json={"input_text": "이거 좀 다듬어 줘", "provider": "claude"}),
+    )
+    assert resp.status_code == 200, resp.get_json()
+    assert resp.get_json()["outputs"]
+    # require_feature / enforce_quota / view / outputs_for_tier / RewriteLog 기록(user_pk) 이 모두 같은 identity 를 재사용
+    assert len(seen) == 1, seen
+    with app.app_context():
+        assert RewriteLog.query.filter_by(user_id=user).count() == 1
@@ -0,0 +1,78 @@
+"""
+사용량 카운터 백엔드 비교 — Postgres 조건부 UPSERT vs Redis Lua (auth/quota._reserve_guest)
+TEST_DATABASE_URL(Postgres) 와 TEST_REDIS_URL 이 모두 있어야 실행. 결과는 -s 로 출력
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from auth import quota_backend
+from auth.quota import _reserve_guest
+from core.extensions import db
+from utils.time_utils import _day_window, _utcnow
+
+THREADS = 16
+PER_THREAD = 100
+GUESTS = 50  # 같은 키 경합 + 여러 키 분산을 섞는다
+
+
+def _run(app):
+    day_start, day_end = _day_window(_utcnow())
+    barrier = threading.Barrier(THREADS)
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(n):
+        mine = []
+        with app.test_request_context("/api/rewrite/single", method="POST"):
+            barrier.wait()
+            for i in range(PER_THREAD):
+                started = time.perf_counter()
+                _reserve_guest("rewrite", f"bench-{(n * PER_THREAD + i) % GUESTS}", day_start, day_end, 10 ** 6)
+                mine.append(time.perf_counter() - started)
+            db.session.remove()
+        with lock:
+            latencies.extend(mine)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(worker, range(THREADS)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+@pytest.mark.postgres
+@pytest.mark.bench
+def test_bench_postgres_vs_redis_backend(pg_app, monkeypatch):
+    redis_lib = pytest.importorskip("redis")
+    url = os.getenv("TEST_REDIS_URL")
+    if not url:
+        pytest.skip("TEST_REDIS_URL not set")
+    r = redis_lib.Redis.from_url(url)
+    monkeypatch.setattr(quota_backend, "get_redis", lambda: r)
+    monkeypatch.setattr(quota_backend, "_scripts", {})
+
+    pg_app.config["QUOTA_BACKEND"] = "postgres"
+    pg = _run(pg_app)
+    pg_app.config["QUOTA_BACKEND"] = "redis"
+    try:
+        rd = _run(pg_app)
+    finally:
+        keys = list(r.scan_iter("quota:g:guest:rewrite:*:bench-*"))
+        if keys:
+            r.delete(*keys)
+            r.srem(quota_backend.DIRTY_SET, *keys)
+
+    total = THREADS * PER_THREAD
+    for name, m in (("postgres upsert", pg), ("redis lua", rd)):
+        print(f"\n{name:16s} {total} reserves / {THREADS} threads / {GUESTS} keys: "
+              f"{m['rps']:.0f} req/s, p50 {m['p50_ms']:.2f}ms, p99 {m['p99_ms']:.2f}ms")
+    assert pg["rps"] > 0 and rd["rps"] > 0
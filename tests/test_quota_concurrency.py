@@ -0,0 +1,82 @@
+"""
+같은 guest key 로 동시에 reserve 해도 한도를 넘겨 허용하지 않는지 — auth/quota._reserve_guest
+- Postgres 경로: 조건부 UPSERT 1문장 (TEST_DATABASE_URL 필요)
+- Redis 경로: Lua check-and-increment (fakeredis)
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event
+
+from auth import quota_backend
+from auth.quota import _reserve_guest
+from core.extensions import db
+from domain.models import GuestUsage
+from utils.time_utils import _day_window, _utcnow
+
+THREADS = 32
+LIMIT = 5
+
+
+def _hammer(app, n_threads=THREADS, limit=LIMIT):
+    day_start, day_end = _day_window(_utcnow())
+    barrier = threading.Barrier(n_threads)
+
+    def one(_):
+        with app.test_request_context("/api/rewrite/single", method="POST"):
+            barrier.wait()
+            allowed, _release = _reserve_guest("rewrite", "guest-1", day_start, day_end, limit)
+            db.session.remove()
+            return allowed
+
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        results = list(pool.map(one, range(n_threads)))
+
+    with app.app_context():
+        stored = db.session.query(GuestUsage.count).filter_by(guest_key="guest-1").scalar()
+    return results, stored
+
+
+@pytest.mark.postgres
+def test_postgres_reserve_no_over_admission_one_statement(pg_app):
+    statements = []
+    with pg_app.app_context():
+        engine = db.engine
+
+    def count(conn, cursor, statement, *args):
+        if "guest_usage" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        results, stored = _hammer(pg_app)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert results.count(True) == LIMIT
+    assert stored == LIMIT
+    # 요청당 guest_usage 왕복 1회 (이전 구현: SELECT ... FOR UPDATE + UPDATE/INSERT + IntegrityError 재시도)
+    assert len(statements) == THREADS
+
+
+def test_redis_reserve_no_over_admission(app, monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    r = fakeredis.FakeRedis()
+    app.config["QUOTA_BACKEND"] = "redis"
+    monkeypatch.setattr(quota_backend, "get_redis", lambda: r)
+    # 스크립트 캐시를 이 클라이언트로 새로 등록하고 미리 SCRIPT LOAD (첫 호출의 NOSCRIPT 재시도는 세지 않음)
+    monkeypatch.setattr(quota_backend, "_scripts", {})
+    r.script_load(quota_backend._RESERVE_LUA)
+
+    evals = []
+    real_eval = r.evalsha
+    monkeypatch.setattr(r, "evalsha", lambda *a, **kw: evals.append(1) or real_eval(*a, **kw))
+
+    results, _stored = _hammer(app)
+
+    assert results.count(True) == LIMIT
+    key = quota_backend.quota_key("g", "guest", "rewrite", _day_window(_utcnow())[0], "guest-1")
+    assert int(r.hget(key, "count")) == LIMIT
+    # 요청당 Lua 1회 (+ 키가 없던 시점에 seed 후 재시도한 요청만 1회 더)
+    assert THREADS <= len(evals) < 2 * THREADS
@@ -0,0 +1,82 @@
+"""Redis 사용량 카운터 write-behind — auth/quota_backend.flush_quota_counters"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from auth import quota_backend as qb
+from core.extensions import db
+from domain.models import GuestUsage, Usage
+
+fakeredis = pytest.importorskip("fakeredis")
+
+DAY = datetime(2026, 10, 19)
+MONTH = DAY.replace(day=1)
+
+
+@pytest.fixture
+def r(app, monkeypatch):
+    r = fakeredis.FakeRedis()
+    monkeypatch.setattr(qb, "get_redis", lambda: r)
+    monkeypatch.setattr(qb, "_scripts", {})
+    with app.app_context():
+        yield r
+
+
+def _reserve(r, key, n, seed=0, limit=100):
+    for _ in range(n):
+        assert qb.redis_reserve(r, key, limit, expire_at=DAY + timedelta(days=40), seed=lambda: seed)[0]
+
+
+def test_flush_writes_redis_plus_pg_delta_and_folds_delta_back(r):
+    gkey = qb.quota_key("g", "guest", "rewrite", DAY, "guest-1")
+    ukey = qb.quota_key("u", "free", "rewrite", MONTH, "user-1")
+    # guest: seed 이후 Redis 장애 중 Postgres 로 2회 직접 예약된 상태 (count 에도 반영, pg_delta=2)
+    db.session.add(GuestUsage(guest_key="guest-1", scope="rewrite", window_start=DAY, count=3, pg_delta=2))
+    db.session.commit()
+    _reserve(r, gkey, 3, seed=1)  # Redis: 1(seed) + 3 = 4
+    _reserve(r, ukey, 5)          # user: DB 행 없음
+    qb.redis_release(r, ukey)     # 보상 차감 → 4
+    assert r.scard(qb.DIRTY_SET) == 2
+
+    out = qb.flush_quota_counters()
+    assert out == {"ok": True, "flushed": 2, "folded": 1}
+    assert r.scard(qb.DIRTY_SET) == 0  # dirty set 비움
+
+    g = GuestUsage.query.filter_by(guest_key="guest-1").one()
+    assert (g.count, g.pg_delta) == (4 + 2, 0)
+    u = Usage.query.filter_by(user_id="user-1").one()
+    assert (u.count, u.pg_delta, u.tier) == (4, 0, "free")
+    # fallback 증가분이 Redis 로 옮겨져 이후 한도 판정에 포함된다
+    assert int(r.hget(gkey, "count")) == 6
+    assert int(r.hget(ukey, "count")) == 4
+
+    # 다시 flush 해도 delta 가 두 번 더해지지 않는다
+    _reserve(r, gkey, 1)
+    assert qb.flush_quota_counters()["flushed"] == 1
+    db.session.expire_all()
+    g = GuestUsage.query.filter_by(guest_key="guest-1").one()
+    assert (g.count, g.pg_delta) == (7, 0)
+    assert int(r.hget(gkey, "count")) == 7
+
+
+def test_flush_requeues_on_db_error(r, monkeypatch):
+    gkey = qb.quota_key("g", "guest", "rewrite", DAY, "guest-2")
+    _reserve(r, gkey, 2)
+
+    def boom(*a, **kw):
+        raise RuntimeError("db down")
+
+    with monkeypatch.context() as m:
+        m.setattr(db.session, "execute", boom)
+        out = qb.flush_quota_counters()
+
+    assert out["ok"] is False and out["requeued"] == 1
+    assert r.smembers(qb.DIRTY_SET) == {gkey.encode()}
+    assert int(r.hget(gkey, "count")) == 2
+
+
+def test_flush_skips_expired_keys(r):
+    gkey = qb.quota_key("g", "guest", "rewrite", DAY, "guest-3")
+    r.sadd(qb.DIRTY_SET, gkey)  # 카운터는 이미 만료
+    assert qb.flush_quota_counters() == {"ok": True, "flushed": 0, "folded": 0}
+    assert GuestUsage.query.count() == 0
@@ -0,0 +1,113 @@
+"""core/rate_limit — LeasedRedisStorage (fakeredis) + rate_limit_key"""
+import os
+import random
+import time
+
+import pytest
+from flask import session
+
+from core.rate_limit import LeasedRedisStorage, rate_limit_key
+
+fakeredis = pytest.importorskip("fakeredis")
+import redis  # noqa: E402  (fakeredis 의존성)
+
+KEY = "LIMITER/u:1/100/1/minute"  # limits 키 형식: .../{amount}/{multiples}/{granularity} → 한도 100
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.Redis, "from_url", classmethod(lambda cls, url, **kw: fakeredis.FakeRedis(server=server)))
+    return server
+
+
+def _storage(**options):
+    s = LeasedRedisStorage("leased+redis://localhost:6379/0", **options)
+    s._reconciler_pid = os.getpid()  # 백그라운드 정산 스레드 대신 reconcile() 을 직접 호출
+    return s
+
+
+def _redis_count(s, key=KEY):
+    return int(s.redis.get(key) or 0)
+
+
+def test_lease_exhaustion_then_refill(server):
+    s = _storage(lease_divisor=10, lease_max=20)  # 한도 100 → chunk 10
+
+    assert s.incr(KEY, 60) == 1
+    assert _redis_count(s) == 10
+    counts = [s.incr(KEY, 60) for _ in range(9)]
+    assert counts == list(range(2, 11))
+    assert _redis_count(s) == 10  # lease 안에서는 Redis 왕복 없음
+    assert s.get(KEY) == 10
+
+    # lease 소진 → INCRBY chunk 1회로 다음 구간
+    assert s.incr(KEY, 60) == 11
+    assert _redis_count(s) == 20
+
+
+def test_small_limit_goes_to_redis_every_time(server):
+    s = _storage(lease_divisor=10)
+    key = "LIMITER/u:1/5/1/minute"
+    assert [s.incr(key, 60) for _ in range(3)] == [1, 2, 3]
+    assert _redis_count(s, key) == 3
+
+
+def test_two_storages_sharing_redis_never_overadmit(server):
+    a, b = _storage(lease_divisor=10, lease_max=20), _storage(lease_divisor=10, lease_max=20)
+    rng = random.Random(36)
+    counts = [rng.choice((a, b)).incr(KEY, 60) for _ in range(200)]
+
+    assert len(set(counts)) == len(counts)  # 클러스터 전체에서 유일한 순번
+    allowed = sum(1 for c in counts if c <= 100)
+    assert allowed <= 100
+    # 조기 차단은 다른 워커가 쥔 미사용 lease 1개(chunk) 이내
+    assert allowed >= 100 - 10
+
+
+def test_idle_lease_is_returned_by_reconcile(server):
+    a, b = _storage(lease_idle_return=0), _storage(lease_idle_return=0)
+    for _ in range(3):
+        a.incr(KEY, 60)
+    assert _redis_count(a) == 10
+    assert a.reconcile() == 1
+    assert _redis_count(a) == 3
+    # 반납 후 다른 워커는 반납된 번호부터 이어서 받는다
+    assert b.incr(KEY, 60) == 4
+
+
+def test_window_expiry_resets_count(server):
+    s = _storage(lease_divisor=10)
+    assert [s.incr(KEY, 1) for _ in range(3)] == [1, 2, 3]
+    assert s.get_expiry(KEY) <= time.time() + 1
+    time.sleep(1.1)
+    # lease 도 Redis 키도 윈도우와 함께 만료 → 새 윈도우는 1부터
+    assert s.get(KEY) == 0
+    assert s.incr(KEY, 1) == 1
+    assert s.reconcile() == 0
+
+
+def test_return_after_window_end_does_not_resurrect_key(server):
+    s = _storage(lease_idle_return=0)
+    s.incr(KEY, 60)
+    s.redis.delete(KEY)  # 윈도우 종료
+    s.reconcile()
+    assert s.redis.exists(KEY) == 0
+
+
+@pytest.mark.parametrize("setup, expected_prefix", [
+    (lambda c: None, "ip:203.0.113.9"),
+    (lambda c: c.update(headers={"Authorization": "Bearer lx1.abc"}), "t:"),
+    (lambda c: c.update(session={"user": {"user_id": "u-9"}}), "u:u-9"),
+    (lambda c: c.update(cookie="guest-1"), "g:"),
+])
+def test_rate_limit_key(app, setup, expected_prefix):
+    ctx = {}
+    setup(ctx)
+    headers = dict(ctx.get("headers", {}))
+    if "cookie" in ctx:
+        headers["Cookie"] = f"{app.config['AID_COOKIE']}={ctx['cookie']}"
+    with app.test_request_context("/api/polish", headers=headers, environ_base={"REMOTE_ADDR": "203.0.113.9"}):
+        if "session" in ctx:
+            session.update(ctx["session"])
+        assert rate_limit_key().startswith(expected_prefix)
@@ -0,0 +1,66 @@
+"""security._sanitize_str (fast path) 가 기존 구현(_sanitize_str_legacy)과 같은 결과/같은 거부 판정을 내는지"""
+import random
+import time
+
+import pytest
+from werkzeug.exceptions import BadRequest
+
+from security.security import _sanitize_str, _sanitize_str_legacy
+
+# 경계가 되는 문자/조각 위주 (보호 구간, escape 대상, 치환 키, 금지 패턴 조각, lower() 가 특이한 문자)
+ALPHABET = (
+    list("[]{}&<>\"'#` aZ")
+    + ["__PROT0__", "__PROT1__", "__PROT", "ignore previous instructions", "act as", "ACT AS",
+       "inj", "ect", "jailbreak", "role", "play", "##", "``", "system prompt",
+       "ſ", "İ", "K", "가", "나다", "\n"]
+)
+
+
+def _outcome(fn, value, for_llm):
+    try:
+        return fn(value, for_llm)
+    except BadRequest:
+        return BadRequest
+
+
+@pytest.mark.parametrize("for_llm", [False, True])
+def test_matches_legacy_on_random_inputs(for_llm):
+    rng = random.Random(38)
+    for _ in range(20000):
+        value = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12)))
+        assert _outcome(_sanitize_str, value, for_llm) == _outcome(_sanitize_str_legacy, value, for_llm), value
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("<b>{x}</b>", "&lt;b&gt;&#123;x&#125;&lt;/b&gt;"),
+    ("it's \"x\"", "it&#x27;s &quot;x&quot;"),
+    ("[<keep>] & [{}]", "[<keep>] &amp; [{}]"),
+])
+def test_escapes_outside_protected_segments(value, expected):
+    assert _sanitize_str(value, False) == expected == _sanitize_str_legacy(value, False)
+
+
+def test_banned_pattern_inside_protected_segment_is_allowed():
+    assert _sanitize_str("[act as admin] 안녕", True) == "[act as admin] 안녕"
+    with pytest.raises(BadRequest):
+        _sanitize_str("please act as admin [x]", True)
+
+
+def _bench(fn, value, n):
+    started = time.perf_counter()
+    for _ in range(n):
+        fn(value, True)
+    return (time.perf_counter() - started) * 1e6 / n
+
+
+@pytest.mark.bench
+@pytest.mark.parametrize("name, value", [
+    ("plain", "오늘 회의에서 논의한 내용을 정리해서 공유드립니다. " * 130),
+    ("protected", "[고객명] 님께 {일정} 안내 드립니다 & 확인 부탁드려요. " * 80),
+])
+def test_bench_sanitize(name, value):
+    n = 500
+    fast = _bench(_sanitize_str, value, n)
+    legacy = _bench(_sanitize_str_legacy, value, n)
+    print(f"\nsanitize {name} {len(value)} chars: fast {fast:.1f}us, legacy {legacy:.1f}us")
+    assert _sanitize_str(value, True) == _sanitize_str_legacy(value, True)
@@ -0,0 +1,54 @@
+"""security.compiled_validator 캐시 — jsonschema.validate() 와 같은 오류를 내는지 + 비용 비교"""
+import time
+
+import jsonschema
+import pytest
+
+from domain import schema as S
+from security.security import compiled_validator, schema_error
+
+CASES = [
+    (S.polish_input_schema, {"input_text": "안녕하세요", "selected_tones": ["polite"]}),
+    (S.polish_input_schema, {"input_text": ""}),
+    (S.api_polish_schema, {"input_text": "x", "selected_categories": ["nope"]}),
+    (S.api_polish_schema, {"selected_tones": "polite"}),
+    (S.admin_visits_query_schema, {"page": "abc"}),
+    (S.admin_data_query_schema, {}),
+]
+
+
+def _validate_message(data, schema):
+    try:
+        jsonschema.validate(data, schema)
+    except jsonschema.ValidationError as e:
+        return e.message
+    return None
+
+
+@pytest.mark.parametrize("schema, data", CASES)
+def test_same_error_as_validate(schema, data):
+    err = schema_error(data, schema)
+    assert (err.message if err is not None else None) == _validate_message(data, schema)
+
+
+def test_validator_is_compiled_once():
+    assert compiled_validator(S.api_polish_schema) is compiled_validator(S.api_polish_schema)
+    # 내용이 같아도 다른 dict 객체면 별도 항목 (id 기준)
+    copy = dict(S.api_polish_schema)
+    assert compiled_validator(copy) is not compiled_validator(S.api_polish_schema)
+
+
+@pytest.mark.bench
+@pytest.mark.parametrize("schema, data", CASES[:3])
+def test_bench_cached_vs_validate(schema, data):
+    n = 200
+    started = time.perf_counter()
+    for _ in range(n):
+        _validate_message(data, schema)
+    uncached = (time.perf_counter() - started) * 1e6 / n
+    started = time.perf_counter()
+    for _ in range(n):
+        schema_error(data, schema)
+    cached = (time.perf_counter() - started) * 1e6 / n
+    print(f"\nvalidate() {uncached:.0f}us vs cached {cached:.0f}us")
+    assert cached < uncached
@@ -0,0 +1,12 @@
+def test_sitemap_gzip_negotiation(app):
+    client = app.test_client()
+
+    gz = client.get("/sitemap.xml", headers={"Accept-Encoding": "gzip, deflate"})
+    assert gz.status_code == 200
+    assert gz.headers.get("Content-Encoding") == "gzip"
+
+    # q=0 은 명시적 거부 → 압축하지 않은 본문
+    refused = client.get("/sitemap.xml", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert refused.status_code == 200
+    assert "Content-Encoding" not in refused.headers
+    assert refused.data.lstrip().startswith(b"<?xml")
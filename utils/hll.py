@@ -0,0 +1,62 @@
+# utils/hll.py
+# HyperLogLog — 고유 방문자(user_id / ip) 근사 카운트용 스케치
+# - 레지스터 m = 2^p 바이트 (기본 p=11 → 2KB, 표준오차 약 1.04/sqrt(m) ≈ 2.3%)
+# - 합집합은 레지스터별 max → 일자/경로별 스케치를 읽을 때 합쳐서 기간 전체 고유 수를 구한다
+import hashlib
+import math
+
+DEFAULT_P = 11
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    __slots__ = ("p", "m", "registers")
+
+    def __init__(self, p: int = DEFAULT_P, registers: bytes | None = None):
+        self.p = p
+        self.m = 1 << p
+        if registers:
+            if len(registers) != self.m:
+                raise ValueError(f"register size mismatch: {len(registers)} != {self.m}")
+            self.registers = bytearray(registers)
+        else:
+            self.registers = bytearray(self.m)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | None) -> "HyperLogLog":
+        """저장된 레지스터에서 복원 (비어 있으면 빈 스케치)"""
+        if not data:
+            return cls()
+        return cls(p=len(data).bit_length() - 1, registers=data)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    def add(self, value) -> None:
+        if value is None or value == "":
+            return
+        h = _hash64(str(value))
+        idx = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.m != self.m:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # 작은 카디널리티 보정(linear counting)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
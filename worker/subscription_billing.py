@@ -4,6 +4,7 @@ import time
 from datetime import datetime, timedelta, timezone
 
 from app import create_app
+from auth.entitlements import invalidate_entitlement
 from domain.models import db
 from domain.models import Subscription, Payment, PaymentMethod, User
 
@@ -79,6 +80,8 @@ def _finalize_cancellations(now_utc: datetime, limit: int = 200):
             s.canceled_at = now_utc
             s.retry_at = None
         db.session.commit()
+        for s in subs:
+            invalidate_entitlement(s.user_id)
         return len(subs)
     except Exception:
         db.session.rollback()
@@ -194,6 +197,7 @@ def _process_one_subscription(sub: Subscription, now_utc: datetime):
         _success_rollover_period(sub2)
 
         db.session.commit()
+        invalidate_entitlement(sub.user_id)
         return
 
     except Exception as e:
@@ -213,6 +217,7 @@ def _process_one_subscription(sub: Subscription, now_utc: datetime):
                 _fail_and_schedule_retry_or_cancel(sub2, now_utc)
 
             db.session.commit()
+            invalidate_entitlement(sub.user_id)
         except Exception:
             db.session.rollback()
         return